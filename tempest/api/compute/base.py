@@ -144,13 +144,14 @@ class BaseV2ComputeTest(api_version_utils.BaseMicroversionTest,
             except Exception:
                 LOG.exception('Deleting server %s failed', server['id'])
 
-        for server in cls.servers:
-            try:
-                waiters.wait_for_server_termination(cls.servers_client,
-                                                    server['id'])
-            except Exception:
-                LOG.exception('Waiting for deletion of server %s failed',
-                              server['id'])
+        if not cls.servers:
+            return
+        try:
+            waiters.wait_for_servers_termination(
+                cls.servers_client, [server['id'] for server in cls.servers])
+        except Exception:
+            LOG.exception('Waiting for deletion of servers %s failed',
+                          ','.join(server['id'] for server in cls.servers))
 
     @classmethod
     def server_check_teardown(cls):
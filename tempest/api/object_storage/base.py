@@ -20,6 +20,7 @@ from tempest import config
 from tempest.lib.common.utils import data_utils
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions as lib_exc
+from tempest.services.object_storage import segmented_upload
 import tempest.test
 
 CONF = config.CONF
@@ -130,6 +131,20 @@ class BaseObjectTest(tempest.test.BaseTestCase):
 
         return object_name, data
 
+    @classmethod
+    def create_large_object(cls, container_name, data, object_name=None,
+                            segment_size=1024 * 1024, metadata=None):
+        # wrapper that uploads a static large object in parallel segments,
+        # and returns its name and the md5 checksum of its data
+        if object_name is None:
+            object_name = data_utils.rand_name(name='TestObject')
+        uploader = segmented_upload.SegmentedUploader(
+            cls.object_client, segment_size=segment_size)
+        _, _, checksum = uploader.upload(container_name, object_name, data,
+                                         metadata=metadata)
+
+        return object_name, checksum
+
     @classmethod
     def delete_containers(cls, container_client=None, object_client=None):
         if container_client is None:
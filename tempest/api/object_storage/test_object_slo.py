@@ -175,3 +175,23 @@ class ObjectSloTest(base.BaseObjectTest):
         resp, body = self.container_client.list_container_contents(
             self.container_name)
         self.assertEqual(int(resp['x-container-object-count']), 0)
+
+    @decorators.idempotent_id('63da12a7-781b-4e5b-923a-23a5c99c39bc')
+    @test.requires_ext(extension='slo', service='object')
+    def test_upload_large_object_in_segments(self):
+        # upload static large object from a generator, in parallel segments
+        data = (data_utils.random_bytes(MIN_SEGMENT_SIZE // 2)
+                for _ in range(5))
+        object_name, checksum = self.create_large_object(
+            self.container_name, data, segment_size=MIN_SEGMENT_SIZE)
+        self.objects.append(object_name)
+        self.objects.extend('%s/%08d' % (object_name, index)
+                            for index in range(3))
+
+        resp, body = self.object_client.get_object(
+            self.container_name, object_name, stream=True)
+        self._assertHeadersSLO(resp, 'GET')
+        for _ in body:
+            pass
+        self.assertEqual(MIN_SEGMENT_SIZE * 5 // 2, body.bytes_read)
+        self.assertEqual(checksum, body.hexdigest())
@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from oslo_log import log as logging
 
 from tempest import config
 from tempest.lib import auth
+from tempest.lib.common import polling
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services import clients
 from tempest.services import object_storage
@@ -27,7 +30,11 @@ LOG = logging.getLogger(__name__)
 
 
 class Manager(clients.ServiceClients):
-    """Top level manager for OpenStack tempest clients"""
+    """Top level manager for OpenStack tempest clients
+
+    The service clients are only built the first time they are accessed, as
+    most tests use a few of them only.
+    """
 
     default_params = config.service_client_config()
 
@@ -39,10 +46,16 @@ class Manager(clients.ServiceClients):
         :param scope: default scope for tokens produced by the auth provider
         """
         _, identity_uri = get_auth_provider_class(credentials)
+        self._lazy_clients = {}
         super(Manager, self).__init__(
             credentials=credentials, identity_uri=identity_uri, scope=scope,
             region=CONF.identity.region,
-            client_parameters=self._prepare_configuration())
+            client_parameters=self._prepare_configuration(),
+            keep_alive=CONF.service_clients.http_keep_alive,
+            pool_maxsize=CONF.service_clients.http_pool_maxsize,
+            pool_idle_timeout=CONF.service_clients.http_pool_idle_timeout,
+            token_cache=get_token_cache(),
+            polling_strategy=get_polling_strategy())
         # TODO(andreaf) When clients are initialised without the right
         # parameters available, the calls below will trigger a KeyError.
         # We should catch that and raise a better error.
@@ -53,14 +66,31 @@ class Manager(clients.ServiceClients):
         self._set_image_clients()
         self._set_network_clients()
 
-        self.orchestration_client = orchestration.OrchestrationClient(
+        self._set_client(
+            'orchestration_client', orchestration.OrchestrationClient,
             self.auth_provider,
             CONF.orchestration.catalog_type,
             CONF.orchestration.region or CONF.identity.region,
             endpoint_type=CONF.orchestration.endpoint_type,
             build_interval=CONF.orchestration.build_interval,
             build_timeout=CONF.orchestration.build_timeout,
-            **self.default_params)
+            **dict(self.default_params, **self.optional_params))
+
+    def _set_client(self, name, client_class, *args, **kwargs):
+        """Set a service client attribute, built on first access"""
+        self._lazy_clients[name] = functools.partial(
+            client_class, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only called for attributes not found otherwise, i.e. clients which
+        # are not built yet
+        client_factory = self.__dict__.get('_lazy_clients', {}).get(name)
+        if client_factory is None:
+            raise AttributeError("%r object has no attribute %r" % (
+                self.__class__.__name__, name))
+        client = self.__dict__.setdefault(name, client_factory())
+        self._lazy_clients.pop(name, None)
+        return client
 
     def _prepare_configuration(self):
         """Map values from CONF into Manager parameters
@@ -92,78 +122,106 @@ class Manager(clients.ServiceClients):
         return configuration
 
     def _set_network_clients(self):
-        self.network_agents_client = self.network.AgentsClient()
-        self.network_extensions_client = self.network.ExtensionsClient()
-        self.networks_client = self.network.NetworksClient()
-        self.subnetpools_client = self.network.SubnetpoolsClient()
-        self.subnets_client = self.network.SubnetsClient()
-        self.ports_client = self.network.PortsClient()
-        self.network_quotas_client = self.network.QuotasClient()
-        self.floating_ips_client = self.network.FloatingIPsClient()
-        self.metering_labels_client = self.network.MeteringLabelsClient()
-        self.metering_label_rules_client = (
-            self.network.MeteringLabelRulesClient())
-        self.routers_client = self.network.RoutersClient()
-        self.security_group_rules_client = (
-            self.network.SecurityGroupRulesClient())
-        self.security_groups_client = self.network.SecurityGroupsClient()
-        self.network_versions_client = self.network.NetworkVersionsClient()
-        self.service_providers_client = self.network.ServiceProvidersClient()
+        self._set_client('network_agents_client', self.network.AgentsClient)
+        self._set_client(
+            'network_extensions_client', self.network.ExtensionsClient)
+        self._set_client('networks_client', self.network.NetworksClient)
+        self._set_client('subnetpools_client', self.network.SubnetpoolsClient)
+        self._set_client('subnets_client', self.network.SubnetsClient)
+        self._set_client('ports_client', self.network.PortsClient)
+        self._set_client('network_quotas_client', self.network.QuotasClient)
+        self._set_client('floating_ips_client', self.network.FloatingIPsClient)
+        self._set_client(
+            'metering_labels_client', self.network.MeteringLabelsClient)
+        self._set_client(
+            'metering_label_rules_client',
+            self.network.MeteringLabelRulesClient)
+        self._set_client('routers_client', self.network.RoutersClient)
+        self._set_client(
+            'security_group_rules_client',
+            self.network.SecurityGroupRulesClient)
+        self._set_client(
+            'security_groups_client', self.network.SecurityGroupsClient)
+        self._set_client(
+            'network_versions_client', self.network.NetworkVersionsClient)
+        self._set_client(
+            'service_providers_client', self.network.ServiceProvidersClient)
 
     def _set_image_clients(self):
         if CONF.service_available.glance:
-            self.image_client = self.image_v1.ImagesClient()
-            self.image_member_client = self.image_v1.ImageMembersClient()
-            self.image_client_v2 = self.image_v2.ImagesClient()
-            self.image_member_client_v2 = self.image_v2.ImageMembersClient()
-            self.namespaces_client = self.image_v2.NamespacesClient()
-            self.resource_types_client = self.image_v2.ResourceTypesClient()
-            self.namespace_objects_client = \
-                self.image_v2.NamespaceObjectsClient()
-            self.schemas_client = self.image_v2.SchemasClient()
-            self.namespace_properties_client = \
-                self.image_v2.NamespacePropertiesClient()
-            self.namespace_tags_client = \
-                self.image_v2.NamespaceTagsClient()
-            self.image_versions_client = \
-                self.image_v2.VersionsClient()
+            self._set_client('image_client', self.image_v1.ImagesClient)
+            self._set_client(
+                'image_member_client', self.image_v1.ImageMembersClient)
+            self._set_client('image_client_v2', self.image_v2.ImagesClient)
+            self._set_client(
+                'image_member_client_v2', self.image_v2.ImageMembersClient)
+            self._set_client(
+                'namespaces_client', self.image_v2.NamespacesClient)
+            self._set_client(
+                'resource_types_client', self.image_v2.ResourceTypesClient)
+            self._set_client(
+                'namespace_objects_client',
+                self.image_v2.NamespaceObjectsClient)
+            self._set_client('schemas_client', self.image_v2.SchemasClient)
+            self._set_client(
+                'namespace_properties_client',
+                self.image_v2.NamespacePropertiesClient)
+            self._set_client(
+                'namespace_tags_client', self.image_v2.NamespaceTagsClient)
+            self._set_client(
+                'image_versions_client', self.image_v2.VersionsClient)
 
     def _set_compute_clients(self):
-        self.agents_client = self.compute.AgentsClient()
-        self.compute_networks_client = self.compute.NetworksClient()
-        self.migrations_client = self.compute.MigrationsClient()
-        self.security_group_default_rules_client = (
-            self.compute.SecurityGroupDefaultRulesClient())
-        self.certificates_client = self.compute.CertificatesClient()
+        self._set_client('agents_client', self.compute.AgentsClient)
+        self._set_client(
+            'compute_networks_client', self.compute.NetworksClient)
+        self._set_client('migrations_client', self.compute.MigrationsClient)
+        self._set_client(
+            'security_group_default_rules_client',
+            self.compute.SecurityGroupDefaultRulesClient)
+        self._set_client(
+            'certificates_client', self.compute.CertificatesClient)
         eip = CONF.compute_feature_enabled.enable_instance_password
-        self.servers_client = self.compute.ServersClient(
+        self._set_client(
+            'servers_client', self.compute.ServersClient,
             enable_instance_password=eip)
-        self.server_groups_client = self.compute.ServerGroupsClient()
-        self.limits_client = self.compute.LimitsClient()
-        self.compute_images_client = self.compute.ImagesClient()
-        self.keypairs_client = self.compute.KeyPairsClient()
-        self.quotas_client = self.compute.QuotasClient()
-        self.quota_classes_client = self.compute.QuotaClassesClient()
-        self.flavors_client = self.compute.FlavorsClient()
-        self.extensions_client = self.compute.ExtensionsClient()
-        self.floating_ip_pools_client = self.compute.FloatingIPPoolsClient()
-        self.floating_ips_bulk_client = self.compute.FloatingIPsBulkClient()
-        self.compute_floating_ips_client = self.compute.FloatingIPsClient()
-        self.compute_security_group_rules_client = (
-            self.compute.SecurityGroupRulesClient())
-        self.compute_security_groups_client = (
-            self.compute.SecurityGroupsClient())
-        self.interfaces_client = self.compute.InterfacesClient()
-        self.fixed_ips_client = self.compute.FixedIPsClient()
-        self.availability_zone_client = self.compute.AvailabilityZoneClient()
-        self.aggregates_client = self.compute.AggregatesClient()
-        self.services_client = self.compute.ServicesClient()
-        self.tenant_usages_client = self.compute.TenantUsagesClient()
-        self.hosts_client = self.compute.HostsClient()
-        self.hypervisor_client = self.compute.HypervisorClient()
-        self.instance_usages_audit_log_client = (
-            self.compute.InstanceUsagesAuditLogClient())
-        self.tenant_networks_client = self.compute.TenantNetworksClient()
+        self._set_client(
+            'server_groups_client', self.compute.ServerGroupsClient)
+        self._set_client('limits_client', self.compute.LimitsClient)
+        self._set_client('compute_images_client', self.compute.ImagesClient)
+        self._set_client('keypairs_client', self.compute.KeyPairsClient)
+        self._set_client('quotas_client', self.compute.QuotasClient)
+        self._set_client(
+            'quota_classes_client', self.compute.QuotaClassesClient)
+        self._set_client('flavors_client', self.compute.FlavorsClient)
+        self._set_client('extensions_client', self.compute.ExtensionsClient)
+        self._set_client(
+            'floating_ip_pools_client', self.compute.FloatingIPPoolsClient)
+        self._set_client(
+            'floating_ips_bulk_client', self.compute.FloatingIPsBulkClient)
+        self._set_client(
+            'compute_floating_ips_client', self.compute.FloatingIPsClient)
+        self._set_client(
+            'compute_security_group_rules_client',
+            self.compute.SecurityGroupRulesClient)
+        self._set_client(
+            'compute_security_groups_client',
+            self.compute.SecurityGroupsClient)
+        self._set_client('interfaces_client', self.compute.InterfacesClient)
+        self._set_client('fixed_ips_client', self.compute.FixedIPsClient)
+        self._set_client(
+            'availability_zone_client', self.compute.AvailabilityZoneClient)
+        self._set_client('aggregates_client', self.compute.AggregatesClient)
+        self._set_client('services_client', self.compute.ServicesClient)
+        self._set_client(
+            'tenant_usages_client', self.compute.TenantUsagesClient)
+        self._set_client('hosts_client', self.compute.HostsClient)
+        self._set_client('hypervisor_client', self.compute.HypervisorClient)
+        self._set_client(
+            'instance_usages_audit_log_client',
+            self.compute.InstanceUsagesAuditLogClient)
+        self._set_client(
+            'tenant_networks_client', self.compute.TenantNetworksClient)
 
         # NOTE: The following client needs special timeout values because
         # the API is a proxy for the other component.
@@ -171,82 +229,114 @@ class Manager(clients.ServiceClients):
             'build_interval': CONF.volume.build_interval,
             'build_timeout': CONF.volume.build_timeout
         }
-        self.volumes_extensions_client = self.compute.VolumesClient(
+        self._set_client(
+            'volumes_extensions_client', self.compute.VolumesClient,
             **params_volume)
-        self.compute_versions_client = self.compute.VersionsClient(
+        self._set_client(
+            'compute_versions_client', self.compute.VersionsClient,
             **params_volume)
-        self.snapshots_extensions_client = self.compute.SnapshotsClient(
+        self._set_client(
+            'snapshots_extensions_client', self.compute.SnapshotsClient,
             **params_volume)
 
     def _set_identity_clients(self):
         # Clients below use the admin endpoint type of Keystone API v2
         params_v2_admin = {
             'endpoint_type': CONF.identity.v2_admin_endpoint_type}
-        self.endpoints_client = self.identity_v2.EndpointsClient(
+        self._set_client(
+            'endpoints_client', self.identity_v2.EndpointsClient,
             **params_v2_admin)
-        self.identity_client = self.identity_v2.IdentityClient(
+        self._set_client(
+            'identity_client', self.identity_v2.IdentityClient,
             **params_v2_admin)
-        self.tenants_client = self.identity_v2.TenantsClient(
+        self._set_client(
+            'tenants_client', self.identity_v2.TenantsClient,
             **params_v2_admin)
-        self.roles_client = self.identity_v2.RolesClient(**params_v2_admin)
-        self.users_client = self.identity_v2.UsersClient(**params_v2_admin)
-        self.identity_services_client = self.identity_v2.ServicesClient(
+        self._set_client(
+            'roles_client', self.identity_v2.RolesClient, **params_v2_admin)
+        self._set_client(
+            'users_client', self.identity_v2.UsersClient, **params_v2_admin)
+        self._set_client(
+            'identity_services_client', self.identity_v2.ServicesClient,
             **params_v2_admin)
 
         # Clients below use the public endpoint type of Keystone API v2
         params_v2_public = {
             'endpoint_type': CONF.identity.v2_public_endpoint_type}
-        self.identity_public_client = self.identity_v2.IdentityClient(
+        self._set_client(
+            'identity_public_client', self.identity_v2.IdentityClient,
             **params_v2_public)
-        self.tenants_public_client = self.identity_v2.TenantsClient(
+        self._set_client(
+            'tenants_public_client', self.identity_v2.TenantsClient,
             **params_v2_public)
-        self.users_public_client = self.identity_v2.UsersClient(
+        self._set_client(
+            'users_public_client', self.identity_v2.UsersClient,
             **params_v2_public)
 
         # Clients below use the endpoint type of Keystone API v3, which is set
         # in endpoint_type
         params_v3 = {'endpoint_type': CONF.identity.v3_endpoint_type}
-        self.domains_client = self.identity_v3.DomainsClient(**params_v3)
-        self.identity_v3_client = self.identity_v3.IdentityClient(**params_v3)
-        self.trusts_client = self.identity_v3.TrustsClient(**params_v3)
-        self.users_v3_client = self.identity_v3.UsersClient(**params_v3)
-        self.endpoints_v3_client = self.identity_v3.EndPointsClient(
+        self._set_client(
+            'domains_client', self.identity_v3.DomainsClient, **params_v3)
+        self._set_client(
+            'identity_v3_client', self.identity_v3.IdentityClient, **params_v3)
+        self._set_client(
+            'trusts_client', self.identity_v3.TrustsClient, **params_v3)
+        self._set_client(
+            'users_v3_client', self.identity_v3.UsersClient, **params_v3)
+        self._set_client(
+            'endpoints_v3_client', self.identity_v3.EndPointsClient,
+            **params_v3)
+        self._set_client(
+            'roles_v3_client', self.identity_v3.RolesClient, **params_v3)
+        self._set_client(
+            'inherited_roles_client', self.identity_v3.InheritedRolesClient,
             **params_v3)
-        self.roles_v3_client = self.identity_v3.RolesClient(**params_v3)
-        self.inherited_roles_client = self.identity_v3.InheritedRolesClient(
+        self._set_client(
+            'role_assignments_client', self.identity_v3.RoleAssignmentsClient,
             **params_v3)
-        self.role_assignments_client = self.identity_v3.RoleAssignmentsClient(
+        self._set_client(
+            'identity_services_v3_client', self.identity_v3.ServicesClient,
             **params_v3)
-        self.identity_services_v3_client = self.identity_v3.ServicesClient(
+        self._set_client(
+            'policies_client', self.identity_v3.PoliciesClient, **params_v3)
+        self._set_client(
+            'projects_client', self.identity_v3.ProjectsClient, **params_v3)
+        self._set_client(
+            'regions_client', self.identity_v3.RegionsClient, **params_v3)
+        self._set_client(
+            'credentials_client', self.identity_v3.CredentialsClient,
             **params_v3)
-        self.policies_client = self.identity_v3.PoliciesClient(**params_v3)
-        self.projects_client = self.identity_v3.ProjectsClient(**params_v3)
-        self.regions_client = self.identity_v3.RegionsClient(**params_v3)
-        self.credentials_client = self.identity_v3.CredentialsClient(
+        self._set_client(
+            'groups_client', self.identity_v3.GroupsClient, **params_v3)
+        self._set_client(
+            'identity_versions_v3_client', self.identity_v3.VersionsClient,
             **params_v3)
-        self.groups_client = self.identity_v3.GroupsClient(**params_v3)
-        self.identity_versions_v3_client = self.identity_v3.VersionsClient(
+        self._set_client(
+            'oauth_consumers_client', self.identity_v3.OAUTHConsumerClient,
             **params_v3)
-        self.oauth_consumers_client = self.identity_v3.OAUTHConsumerClient(
+        self._set_client(
+            'domain_config_client', self.identity_v3.DomainConfigurationClient,
             **params_v3)
-        self.domain_config_client = self.identity_v3.DomainConfigurationClient(
+        self._set_client(
+            'endpoint_filter_client', self.identity_v3.EndPointsFilterClient,
             **params_v3)
-        self.endpoint_filter_client = \
-            self.identity_v3.EndPointsFilterClient(**params_v3)
 
         # Token clients do not use the catalog. They only need default_params.
         # They read auth_url, so they should only be set if the corresponding
         # API version is marked as enabled
         if CONF.identity_feature_enabled.api_v2:
             if CONF.identity.uri:
-                self.token_client = self.identity_v2.TokenClient(
+                self._set_client(
+                    'token_client', self.identity_v2.TokenClient,
                     auth_url=CONF.identity.uri)
             else:
                 msg = 'Identity v2 API enabled, but no identity.uri set'
                 raise lib_exc.InvalidConfiguration(msg)
         if CONF.identity_feature_enabled.api_v3:
             if CONF.identity.uri_v3:
-                self.token_v3_client = self.identity_v3.V3TokenClient(
+                self._set_client(
+                    'token_v3_client', self.identity_v3.V3TokenClient,
                     auth_url=CONF.identity.uri_v3)
             else:
                 msg = 'Identity v3 API enabled, but no identity.uri_v3 set'
@@ -254,61 +344,81 @@ class Manager(clients.ServiceClients):
 
     def _set_volume_clients(self):
 
-        self.volume_qos_client = self.volume_v1.QosSpecsClient()
-        self.volume_qos_v2_client = self.volume_v2.QosSpecsClient()
-        self.volume_services_client = self.volume_v1.ServicesClient()
-        self.volume_services_v2_client = self.volume_v2.ServicesClient()
-        self.backups_client = self.volume_v1.BackupsClient()
-        self.backups_v2_client = self.volume_v2.BackupsClient()
-        self.encryption_types_client = self.volume_v1.EncryptionTypesClient()
-        self.encryption_types_v2_client = \
-            self.volume_v2.EncryptionTypesClient()
-        self.snapshot_manage_v2_client = self.volume_v2.SnapshotManageClient()
-        self.snapshots_client = self.volume_v1.SnapshotsClient()
-        self.snapshots_v2_client = self.volume_v2.SnapshotsClient()
-        self.volume_manage_v2_client = self.volume_v2.VolumeManageClient()
-        self.volumes_client = self.volume_v1.VolumesClient()
-        self.volumes_v2_client = self.volume_v2.VolumesClient()
-        self.volumes_v3_client = self.volume_v3.VolumesClient()
-        self.volume_v3_messages_client = self.volume_v3.MessagesClient()
-        self.volume_v3_versions_client = self.volume_v3.VersionsClient()
-        self.volume_types_client = self.volume_v1.TypesClient()
-        self.volume_types_v2_client = self.volume_v2.TypesClient()
-        self.volume_hosts_client = self.volume_v1.HostsClient()
-        self.volume_hosts_v2_client = self.volume_v2.HostsClient()
-        self.volume_quotas_client = self.volume_v1.QuotasClient()
-        self.volume_quotas_v2_client = self.volume_v2.QuotasClient()
-        self.volume_quota_classes_v2_client = \
-            self.volume_v2.QuotaClassesClient()
-        self.volumes_extension_client = self.volume_v1.ExtensionsClient()
-        self.volumes_v2_extension_client = self.volume_v2.ExtensionsClient()
-        self.volume_availability_zone_client = \
-            self.volume_v1.AvailabilityZoneClient()
-        self.volume_v2_availability_zone_client = \
-            self.volume_v2.AvailabilityZoneClient()
-        self.volume_limits_client = self.volume_v1.LimitsClient()
-        self.volume_v2_limits_client = self.volume_v2.LimitsClient()
-        self.volume_capabilities_v2_client = \
-            self.volume_v2.CapabilitiesClient()
-        self.volume_scheduler_stats_v2_client = \
-            self.volume_v2.SchedulerStatsClient()
-        self.volume_transfers_v2_client = \
-            self.volume_v2.TransfersClient()
+        self._set_client('volume_qos_client', self.volume_v1.QosSpecsClient)
+        self._set_client('volume_qos_v2_client', self.volume_v2.QosSpecsClient)
+        self._set_client(
+            'volume_services_client', self.volume_v1.ServicesClient)
+        self._set_client(
+            'volume_services_v2_client', self.volume_v2.ServicesClient)
+        self._set_client('backups_client', self.volume_v1.BackupsClient)
+        self._set_client('backups_v2_client', self.volume_v2.BackupsClient)
+        self._set_client(
+            'encryption_types_client', self.volume_v1.EncryptionTypesClient)
+        self._set_client(
+            'encryption_types_v2_client', self.volume_v2.EncryptionTypesClient)
+        self._set_client(
+            'snapshot_manage_v2_client', self.volume_v2.SnapshotManageClient)
+        self._set_client('snapshots_client', self.volume_v1.SnapshotsClient)
+        self._set_client('snapshots_v2_client', self.volume_v2.SnapshotsClient)
+        self._set_client(
+            'volume_manage_v2_client', self.volume_v2.VolumeManageClient)
+        self._set_client('volumes_client', self.volume_v1.VolumesClient)
+        self._set_client('volumes_v2_client', self.volume_v2.VolumesClient)
+        self._set_client('volumes_v3_client', self.volume_v3.VolumesClient)
+        self._set_client(
+            'volume_v3_messages_client', self.volume_v3.MessagesClient)
+        self._set_client(
+            'volume_v3_versions_client', self.volume_v3.VersionsClient)
+        self._set_client('volume_types_client', self.volume_v1.TypesClient)
+        self._set_client('volume_types_v2_client', self.volume_v2.TypesClient)
+        self._set_client('volume_hosts_client', self.volume_v1.HostsClient)
+        self._set_client('volume_hosts_v2_client', self.volume_v2.HostsClient)
+        self._set_client('volume_quotas_client', self.volume_v1.QuotasClient)
+        self._set_client(
+            'volume_quotas_v2_client', self.volume_v2.QuotasClient)
+        self._set_client(
+            'volume_quota_classes_v2_client',
+            self.volume_v2.QuotaClassesClient)
+        self._set_client(
+            'volumes_extension_client', self.volume_v1.ExtensionsClient)
+        self._set_client(
+            'volumes_v2_extension_client', self.volume_v2.ExtensionsClient)
+        self._set_client(
+            'volume_availability_zone_client',
+            self.volume_v1.AvailabilityZoneClient)
+        self._set_client(
+            'volume_v2_availability_zone_client',
+            self.volume_v2.AvailabilityZoneClient)
+        self._set_client('volume_limits_client', self.volume_v1.LimitsClient)
+        self._set_client(
+            'volume_v2_limits_client', self.volume_v2.LimitsClient)
+        self._set_client(
+            'volume_capabilities_v2_client', self.volume_v2.CapabilitiesClient)
+        self._set_client(
+            'volume_scheduler_stats_v2_client',
+            self.volume_v2.SchedulerStatsClient)
+        self._set_client(
+            'volume_transfers_v2_client', self.volume_v2.TransfersClient)
 
     def _set_object_storage_clients(self):
         # Mandatory parameters (always defined)
         params = self.parameters['object-storage']
 
-        self.account_client = object_storage.AccountClient(self.auth_provider,
-                                                           **params)
-        self.bulk_client = object_storage.BulkMiddlewareClient(
+        self._set_client(
+            'account_client', object_storage.AccountClient, self.auth_provider,
+            **params)
+        self._set_client(
+            'bulk_client', object_storage.BulkMiddlewareClient,
             self.auth_provider, **params)
-        self.capabilities_client = object_storage.CapabilitiesClient(
+        self._set_client(
+            'capabilities_client', object_storage.CapabilitiesClient,
             self.auth_provider, **params)
-        self.container_client = object_storage.ContainerClient(
+        self._set_client(
+            'container_client', object_storage.ContainerClient,
             self.auth_provider, **params)
-        self.object_client = object_storage.ObjectClient(self.auth_provider,
-                                                         **params)
+        self._set_client(
+            'object_client', object_storage.ObjectClient, self.auth_provider,
+            **params)
 
 
 def get_auth_provider_class(credentials):
@@ -318,6 +428,22 @@ def get_auth_provider_class(credentials):
         return auth.KeystoneV2AuthProvider, CONF.identity.uri
 
 
+def get_token_cache():
+    """Token cache configured for the auth providers, if any"""
+    if CONF.auth.token_cache:
+        return auth.get_shared_token_cache(CONF.auth.token_cache_dir)
+    return None
+
+
+def get_polling_strategy():
+    """Polling strategy configured for the service clients, if any"""
+    if CONF.service_clients.polling_backoff:
+        return polling.ExponentialBackoff(
+            initial_interval=CONF.service_clients.polling_initial_interval,
+            max_interval=CONF.service_clients.polling_max_interval)
+    return None
+
+
 def get_auth_provider(credentials, pre_auth=False, scope='project'):
     # kwargs for auth provider match the common ones used by service clients
     default_params = config.service_client_config()
@@ -328,6 +454,7 @@ def get_auth_provider(credentials, pre_auth=False, scope='project'):
         credentials)
     _auth_provider = auth_provider_class(credentials, auth_url,
                                          scope=scope,
+                                         token_cache=get_token_cache(),
                                          **default_params)
     if pre_auth:
         _auth_provider.set_auth()
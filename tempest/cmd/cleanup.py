@@ -59,6 +59,12 @@ objects that will be removed (domains, flavors, images, roles, projects,
 and users). Once the cleanup command is executed (e.g. run without
 parameters), running it again with **--dry-run** should yield an empty report.
 
+**--workers**: Number of resources deleted concurrently. By default resources
+are deleted one at a time. With more than one worker, projects are cleaned up
+concurrently, and so are the services of each project, with dependent
+resources deleted first: for instance servers before volumes and ports, ports
+before subnets and networks, router interfaces before routers.
+
 **--help**: Print the help text for the command and parameters.
 
 .. [1] The ``_tenants_to_clean`` dictionary in ``dry_run.json`` lists the
@@ -70,7 +76,9 @@ parameters), running it again with **--dry-run** should yield an empty report.
     force their deletion.
 
 """
+from multiprocessing import pool
 import sys
+import threading
 import traceback
 
 from cliff import command
@@ -114,6 +122,8 @@ class TempestCleanup(command.Command):
         self._init_admin_ids()
 
         self.admin_role_added = []
+        # Limits the number of concurrent deletions across projects
+        self.limiter = None
 
         # available services
         self.tenant_services = cleanup_service.get_tenant_cleanup_services()
@@ -146,16 +156,31 @@ class TempestCleanup(command.Command):
         tenants = tenant_service.list()
         print("Process %s tenants" % len(tenants))
 
-        # Loop through list of tenants and clean them up.
-        for tenant in tenants:
-            self._add_admin(tenant['id'])
-            self._clean_tenant(tenant)
+        workers = self.options.workers
+        if workers > 1:
+            # The limiter bounds the total number of deletions in flight,
+            # across the tenants and the services cleaned up concurrently
+            self.limiter = threading.BoundedSemaphore(workers)
+        if workers > 1 and len(tenants) > 1:
+            # Clean tenants up concurrently
+            thread_pool = pool.ThreadPool(min(workers, len(tenants)))
+            try:
+                thread_pool.map(self._add_admin_and_clean_tenant, tenants)
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            # Loop through list of tenants and clean them up.
+            for tenant in tenants:
+                self._add_admin_and_clean_tenant(tenant)
 
         kwargs = {'data': self.dry_run_data,
                   'is_dry_run': is_dry_run,
                   'saved_state_json': self.json_data,
                   'is_preserve': is_preserve,
-                  'is_save_state': is_save_state}
+                  'is_save_state': is_save_state,
+                  'workers': workers,
+                  'limiter': self.limiter}
         for service in self.global_services:
             svc = service(admin_mgr, **kwargs)
             svc.run()
@@ -174,6 +199,10 @@ class TempestCleanup(command.Command):
         for tenant_id in tenant_ids:
             self._remove_admin_role(tenant_id)
 
+    def _add_admin_and_clean_tenant(self, tenant):
+        self._add_admin(tenant['id'])
+        self._clean_tenant(tenant)
+
     def _clean_tenant(self, tenant):
         print("Cleaning tenant:  %s " % tenant['name'])
         is_dry_run = self.options.dry_run
@@ -196,10 +225,11 @@ class TempestCleanup(command.Command):
                   'saved_state_json': None,
                   'is_preserve': is_preserve,
                   'is_save_state': False,
-                  'tenant_id': tenant_id}
-        for service in self.tenant_services:
-            svc = service(mgr, **kwargs)
-            svc.run()
+                  'tenant_id': tenant_id,
+                  'workers': self.options.workers,
+                  'limiter': self.limiter}
+        services = [service(mgr, **kwargs) for service in self.tenant_services]
+        cleanup_service.run_services(services, workers=self.options.workers)
 
     def _init_admin_ids(self):
         tn_cl = self.admin_mgr.tenants_client
@@ -241,6 +271,12 @@ class TempestCleanup(command.Command):
                             help="Generate JSON file:" + DRY_RUN_JSON +
                             ", that reports the objects that would have "
                             "been deleted had a full cleanup been run.")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Number of resources to delete "
+                            "concurrently. With more than one worker, "
+                            "projects and services are cleaned up "
+                            "concurrently, honouring the dependencies "
+                            "between resources.")
         return parser
 
     def get_description(self):
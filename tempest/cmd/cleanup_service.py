@@ -14,12 +14,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from multiprocessing import pool
+import threading
+
 from oslo_log import log as logging
 
 from tempest.common import credentials_factory as credentials
 from tempest.common import identity
 from tempest.common.utils import net_info
 from tempest import config
+from tempest.lib.common.utils import test_utils
 from tempest import test
 
 LOG = logging.getLogger(__name__)
@@ -94,6 +98,16 @@ def _get_network_id(net_name, project_name):
 
 
 class BaseService(object):
+    # Maximum number of concurrent deletions for this service
+    max_concurrency = None
+    # Wait for the resources to be gone before running the services which
+    # depend on this one, when cleaning up with several workers
+    wait_for_deletion = False
+    # Number of concurrent deletions, and optional semaphore which limits
+    # the number of concurrent deletions across services
+    workers = 1
+    limiter = None
+
     def __init__(self, kwargs):
         self.client = None
         for key, value in kwargs.items():
@@ -114,6 +128,42 @@ class BaseService(object):
         return [item for item in item_list
                 if item['tenant_id'] == self.tenant_id]
 
+    def _delete_items(self, items, delete_item, error_message):
+        def _delete(item):
+            try:
+                if self.limiter is None:
+                    delete_item(item)
+                else:
+                    with self.limiter:
+                        delete_item(item)
+            except Exception:
+                LOG.exception(error_message)
+
+        workers = min(self.workers, self.max_concurrency or self.workers)
+        if workers > 1 and len(items) > 1:
+            thread_pool = pool.ThreadPool(min(workers, len(items)))
+            try:
+                thread_pool.map(_delete, items)
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            for item in items:
+                _delete(item)
+        if self.wait_for_deletion and self.workers > 1 and items:
+            self._wait_for_deletion(items)
+
+    def _wait_for_deletion(self, items):
+        ids = set(item['id'] for item in items)
+
+        def _deleted():
+            return not ids & set(item['id'] for item in self.list())
+        if not test_utils.call_until_true(_deleted,
+                                          CONF.compute.build_timeout,
+                                          CONF.compute.build_interval):
+            LOG.warning("%s resources still present after %s seconds",
+                        self.__class__.__name__, CONF.compute.build_timeout)
+
     def list(self):
         pass
 
@@ -136,6 +186,7 @@ class BaseService(object):
 
 
 class SnapshotService(BaseService):
+    wait_for_deletion = True
 
     def __init__(self, manager, **kwargs):
         super(SnapshotService, self).__init__(kwargs)
@@ -150,11 +201,10 @@ class SnapshotService(BaseService):
     def delete(self):
         snaps = self.list()
         client = self.client
-        for snap in snaps:
-            try:
-                client.delete_snapshot(snap['id'])
-            except Exception:
-                LOG.exception("Delete Snapshot exception.")
+
+        def _delete(snap):
+            client.delete_snapshot(snap['id'])
+        self._delete_items(snaps, _delete, "Delete Snapshot exception.")
 
     def dry_run(self):
         snaps = self.list()
@@ -162,6 +212,8 @@ class SnapshotService(BaseService):
 
 
 class ServerService(BaseService):
+    wait_for_deletion = True
+
     def __init__(self, manager, **kwargs):
         super(ServerService, self).__init__(kwargs)
         self.client = manager.servers_client
@@ -177,11 +229,10 @@ class ServerService(BaseService):
     def delete(self):
         client = self.client
         servers = self.list()
-        for server in servers:
-            try:
-                client.delete_server(server['id'])
-            except Exception:
-                LOG.exception("Delete Server exception.")
+
+        def _delete(server):
+            client.delete_server(server['id'])
+        self._delete_items(servers, _delete, "Delete Server exception.")
 
     def dry_run(self):
         servers = self.list()
@@ -189,6 +240,7 @@ class ServerService(BaseService):
 
 
 class ServerGroupService(ServerService):
+    wait_for_deletion = False
 
     def list(self):
         client = self.server_groups_client
@@ -199,11 +251,10 @@ class ServerGroupService(ServerService):
     def delete(self):
         client = self.client
         sgs = self.list()
-        for sg in sgs:
-            try:
-                client.delete_server_group(sg['id'])
-            except Exception:
-                LOG.exception("Delete Server Group exception.")
+
+        def _delete(sg):
+            client.delete_server_group(sg['id'])
+        self._delete_items(sgs, _delete, "Delete Server Group exception.")
 
     def dry_run(self):
         sgs = self.list()
@@ -211,6 +262,10 @@ class ServerGroupService(ServerService):
 
 
 class StackService(BaseService):
+    # Deleting a stack deletes all its resources, do not flood Heat
+    max_concurrency = 2
+    wait_for_deletion = True
+
     def __init__(self, manager, **kwargs):
         super(StackService, self).__init__(kwargs)
         self.client = manager.orchestration_client
@@ -224,11 +279,10 @@ class StackService(BaseService):
     def delete(self):
         client = self.client
         stacks = self.list()
-        for stack in stacks:
-            try:
-                client.delete_stack(stack['id'])
-            except Exception:
-                LOG.exception("Delete Stack exception.")
+
+        def _delete(stack):
+            client.delete_stack(stack['id'])
+        self._delete_items(stacks, _delete, "Delete Stack exception.")
 
     def dry_run(self):
         stacks = self.list()
@@ -249,12 +303,11 @@ class KeyPairService(BaseService):
     def delete(self):
         client = self.client
         keypairs = self.list()
-        for k in keypairs:
-            try:
-                name = k['keypair']['name']
-                client.delete_keypair(name)
-            except Exception:
-                LOG.exception("Delete Keypairs exception.")
+
+        def _delete(k):
+            name = k['keypair']['name']
+            client.delete_keypair(name)
+        self._delete_items(keypairs, _delete, "Delete Keypairs exception.")
 
     def dry_run(self):
         keypairs = self.list()
@@ -276,11 +329,11 @@ class SecurityGroupService(BaseService):
     def delete(self):
         client = self.client
         secgrp_del = self.list()
-        for g in secgrp_del:
-            try:
-                client.delete_security_group(g['id'])
-            except Exception:
-                LOG.exception("Delete Security Groups exception.")
+
+        def _delete(g):
+            client.delete_security_group(g['id'])
+        self._delete_items(secgrp_del, _delete,
+                           "Delete Security Groups exception.")
 
     def dry_run(self):
         secgrp_del = self.list()
@@ -301,11 +354,11 @@ class FloatingIpService(BaseService):
     def delete(self):
         client = self.client
         floating_ips = self.list()
-        for f in floating_ips:
-            try:
-                client.delete_floating_ip(f['id'])
-            except Exception:
-                LOG.exception("Delete Floating IPs exception.")
+
+        def _delete(f):
+            client.delete_floating_ip(f['id'])
+        self._delete_items(floating_ips, _delete,
+                           "Delete Floating IPs exception.")
 
     def dry_run(self):
         floating_ips = self.list()
@@ -326,11 +379,10 @@ class VolumeService(BaseService):
     def delete(self):
         client = self.client
         vols = self.list()
-        for v in vols:
-            try:
-                client.delete_volume(v['id'])
-            except Exception:
-                LOG.exception("Delete Volume exception.")
+
+        def _delete(v):
+            client.delete_volume(v['id'])
+        self._delete_items(vols, _delete, "Delete Volume exception.")
 
     def dry_run(self):
         vols = self.list()
@@ -408,11 +460,10 @@ class NetworkService(BaseService):
     def delete(self):
         client = self.networks_client
         networks = self.list()
-        for n in networks:
-            try:
-                client.delete_network(n['id'])
-            except Exception:
-                LOG.exception("Delete Network exception.")
+
+        def _delete(n):
+            client.delete_network(n['id'])
+        self._delete_items(networks, _delete, "Delete Network exception.")
 
     def dry_run(self):
         networks = self.list()
@@ -431,11 +482,11 @@ class NetworkFloatingIpService(NetworkService):
     def delete(self):
         client = self.client
         flips = self.list()
-        for flip in flips:
-            try:
-                client.delete_floatingip(flip['id'])
-            except Exception:
-                LOG.exception("Delete Network Floating IP exception.")
+
+        def _delete(flip):
+            client.delete_floatingip(flip['id'])
+        self._delete_items(flips, _delete,
+                           "Delete Network Floating IP exception.")
 
     def dry_run(self):
         flips = self.list()
@@ -459,17 +510,16 @@ class NetworkRouterService(NetworkService):
         client = self.routers_client
         ports_client = self.ports_client
         routers = self.list()
-        for router in routers:
-            try:
-                rid = router['id']
-                ports = [port for port
-                         in ports_client.list_ports(device_id=rid)['ports']
-                         if net_info.is_router_interface_port(port)]
-                for port in ports:
-                    client.remove_router_interface(rid, port_id=port['id'])
-                client.delete_router(rid)
-            except Exception:
-                LOG.exception("Delete Router exception.")
+
+        def _delete(router):
+            rid = router['id']
+            ports = [port for port
+                     in ports_client.list_ports(device_id=rid)['ports']
+                     if net_info.is_router_interface_port(port)]
+            for port in ports:
+                client.remove_router_interface(rid, port_id=port['id'])
+            client.delete_router(rid)
+        self._delete_items(routers, _delete, "Delete Router exception.")
 
     def dry_run(self):
         routers = self.list()
@@ -489,11 +539,10 @@ class NetworkHealthMonitorService(NetworkService):
     def delete(self):
         client = self.client
         hms = self.list()
-        for hm in hms:
-            try:
-                client.delete_health_monitor(hm['id'])
-            except Exception:
-                LOG.exception("Delete Health Monitor exception.")
+
+        def _delete(hm):
+            client.delete_health_monitor(hm['id'])
+        self._delete_items(hms, _delete, "Delete Health Monitor exception.")
 
     def dry_run(self):
         hms = self.list()
@@ -513,11 +562,10 @@ class NetworkMemberService(NetworkService):
     def delete(self):
         client = self.client
         members = self.list()
-        for member in members:
-            try:
-                client.delete_member(member['id'])
-            except Exception:
-                LOG.exception("Delete Member exception.")
+
+        def _delete(member):
+            client.delete_member(member['id'])
+        self._delete_items(members, _delete, "Delete Member exception.")
 
     def dry_run(self):
         members = self.list()
@@ -537,11 +585,10 @@ class NetworkVipService(NetworkService):
     def delete(self):
         client = self.client
         vips = self.list()
-        for vip in vips:
-            try:
-                client.delete_vip(vip['id'])
-            except Exception:
-                LOG.exception("Delete VIP exception.")
+
+        def _delete(vip):
+            client.delete_vip(vip['id'])
+        self._delete_items(vips, _delete, "Delete VIP exception.")
 
     def dry_run(self):
         vips = self.list()
@@ -561,11 +608,10 @@ class NetworkPoolService(NetworkService):
     def delete(self):
         client = self.client
         pools = self.list()
-        for pool in pools:
-            try:
-                client.delete_pool(pool['id'])
-            except Exception:
-                LOG.exception("Delete Pool exception.")
+
+        def _delete(lb_pool):
+            client.delete_pool(lb_pool['id'])
+        self._delete_items(pools, _delete, "Delete Pool exception.")
 
     def dry_run(self):
         pools = self.list()
@@ -585,11 +631,11 @@ class NetworkMeteringLabelRuleService(NetworkService):
     def delete(self):
         client = self.metering_label_rules_client
         rules = self.list()
-        for rule in rules:
-            try:
-                client.delete_metering_label_rule(rule['id'])
-            except Exception:
-                LOG.exception("Delete Metering Label Rule exception.")
+
+        def _delete(rule):
+            client.delete_metering_label_rule(rule['id'])
+        self._delete_items(rules, _delete,
+                           "Delete Metering Label Rule exception.")
 
     def dry_run(self):
         rules = self.list()
@@ -609,11 +655,10 @@ class NetworkMeteringLabelService(NetworkService):
     def delete(self):
         client = self.metering_labels_client
         labels = self.list()
-        for label in labels:
-            try:
-                client.delete_metering_label(label['id'])
-            except Exception:
-                LOG.exception("Delete Metering Label exception.")
+
+        def _delete(label):
+            client.delete_metering_label(label['id'])
+        self._delete_items(labels, _delete, "Delete Metering Label exception.")
 
     def dry_run(self):
         labels = self.list()
@@ -638,11 +683,10 @@ class NetworkPortService(NetworkService):
     def delete(self):
         client = self.ports_client
         ports = self.list()
-        for port in ports:
-            try:
-                client.delete_port(port['id'])
-            except Exception:
-                LOG.exception("Delete Port exception.")
+
+        def _delete(port):
+            client.delete_port(port['id'])
+        self._delete_items(ports, _delete, "Delete Port exception.")
 
     def dry_run(self):
         ports = self.list()
@@ -666,11 +710,11 @@ class NetworkSecGroupService(NetworkService):
     def delete(self):
         client = self.client
         secgroups = self.list()
-        for secgroup in secgroups:
-            try:
-                client.delete_secgroup(secgroup['id'])
-            except Exception:
-                LOG.exception("Delete security_group exception.")
+
+        def _delete(secgroup):
+            client.delete_secgroup(secgroup['id'])
+        self._delete_items(secgroups, _delete,
+                           "Delete security_group exception.")
 
     def dry_run(self):
         secgroups = self.list()
@@ -691,11 +735,10 @@ class NetworkSubnetService(NetworkService):
     def delete(self):
         client = self.subnets_client
         subnets = self.list()
-        for subnet in subnets:
-            try:
-                client.delete_subnet(subnet['id'])
-            except Exception:
-                LOG.exception("Delete Subnet exception.")
+
+        def _delete(subnet):
+            client.delete_subnet(subnet['id'])
+        self._delete_items(subnets, _delete, "Delete Subnet exception.")
 
     def dry_run(self):
         subnets = self.list()
@@ -725,11 +768,10 @@ class FlavorService(BaseService):
     def delete(self):
         client = self.client
         flavors = self.list()
-        for flavor in flavors:
-            try:
-                client.delete_flavor(flavor['id'])
-            except Exception:
-                LOG.exception("Delete Flavor exception.")
+
+        def _delete(flavor):
+            client.delete_flavor(flavor['id'])
+        self._delete_items(flavors, _delete, "Delete Flavor exception.")
 
     def dry_run(self):
         flavors = self.list()
@@ -762,11 +804,10 @@ class ImageService(BaseService):
     def delete(self):
         client = self.client
         images = self.list()
-        for image in images:
-            try:
-                client.delete_image(image['id'])
-            except Exception:
-                LOG.exception("Delete Image exception.")
+
+        def _delete(image):
+            client.delete_image(image['id'])
+        self._delete_items(images, _delete, "Delete Image exception.")
 
     def dry_run(self):
         images = self.list()
@@ -811,11 +852,10 @@ class UserService(BaseService):
 
     def delete(self):
         users = self.list()
-        for user in users:
-            try:
-                self.client.delete_user(user['id'])
-            except Exception:
-                LOG.exception("Delete User exception.")
+
+        def _delete(user):
+            self.client.delete_user(user['id'])
+        self._delete_items(users, _delete, "Delete User exception.")
 
     def dry_run(self):
         users = self.list()
@@ -851,11 +891,10 @@ class RoleService(BaseService):
 
     def delete(self):
         roles = self.list()
-        for role in roles:
-            try:
-                self.client.delete_role(role['id'])
-            except Exception:
-                LOG.exception("Delete Role exception.")
+
+        def _delete(role):
+            self.client.delete_role(role['id'])
+        self._delete_items(roles, _delete, "Delete Role exception.")
 
     def dry_run(self):
         roles = self.list()
@@ -890,11 +929,10 @@ class TenantService(BaseService):
 
     def delete(self):
         tenants = self.list()
-        for tenant in tenants:
-            try:
-                self.client.delete_tenant(tenant['id'])
-            except Exception:
-                LOG.exception("Delete Tenant exception.")
+
+        def _delete(tenant):
+            self.client.delete_tenant(tenant['id'])
+        self._delete_items(tenants, _delete, "Delete Tenant exception.")
 
     def dry_run(self):
         tenants = self.list()
@@ -926,12 +964,11 @@ class DomainService(BaseService):
     def delete(self):
         client = self.client
         domains = self.list()
-        for domain in domains:
-            try:
-                client.update_domain(domain['id'], enabled=False)
-                client.delete_domain(domain['id'])
-            except Exception:
-                LOG.exception("Delete Domain exception.")
+
+        def _delete(domain):
+            client.update_domain(domain['id'], enabled=False)
+            client.delete_domain(domain['id'])
+        self._delete_items(domains, _delete, "Delete Domain exception.")
 
     def dry_run(self):
         domains = self.list()
@@ -944,6 +981,67 @@ class DomainService(BaseService):
             self.data['domains'][domain['id']] = domain['name']
 
 
+# Services whose resources must be deleted before the ones of a service,
+# when cleaning up with several workers
+CLEANUP_DEPENDENCIES = {
+    ServerService: (StackService,),
+    SecurityGroupService: (ServerService,),
+    ServerGroupService: (ServerService,),
+    FloatingIpService: (ServerService,),
+    NetworkMeteringLabelService: (NetworkMeteringLabelRuleService,),
+    NetworkRouterService: (NetworkFloatingIpService,),
+    NetworkPortService: (ServerService, NetworkRouterService),
+    NetworkSubnetService: (NetworkPortService, NetworkRouterService),
+    NetworkService: (NetworkSubnetService,),
+    NetworkSecGroupService: (ServerService, NetworkPortService),
+    VolumeService: (ServerService, SnapshotService),
+    VolumeQuotaService: (VolumeService,),
+    NovaQuotaService: (ServerService,),
+}
+
+
+def run_services(services, workers=1):
+    """Run cleanup services
+
+    With a single worker, services are run one after the other, in order.
+    With more workers, services are run concurrently. A service only starts
+    once the services it depends on, according to CLEANUP_DEPENDENCIES,
+    are done, and deletions from services flagged with wait_for_deletion
+    are complete.
+
+    :param services: List of cleanup service instances
+    :param workers: Number of workers used for the cleanup
+    """
+    if workers <= 1:
+        for svc in services:
+            svc.run()
+        return
+
+    done = dict((type(svc), threading.Event()) for svc in services)
+    errors = []
+
+    def _run(svc):
+        try:
+            for dependency in CLEANUP_DEPENDENCIES.get(type(svc), ()):
+                if dependency in done:
+                    done[dependency].wait()
+            svc.run()
+        except Exception as e:
+            LOG.exception("%s cleanup failed", type(svc).__name__)
+            errors.append(e)
+        finally:
+            done[type(svc)].set()
+
+    threads = [threading.Thread(target=_run, args=(svc,))
+               for svc in services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
 def get_tenant_cleanup_services():
     tenant_services = []
     # TODO(gmann): Tempest should provide some plugin hook for cleanup
@@ -0,0 +1,193 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Run the tests in workers forked from the tempest run process
+
+testr starts a new python process for each worker, which parses the
+configuration, loads the plugins and imports the tests again. The executor
+does all of this once in the tempest run process, then forks the workers,
+which share its memory until they write to it. Each worker sends its results
+as a subunit v2 stream over a pipe, and the streams are merged as they come.
+"""
+
+import collections
+import os
+import sys
+import threading
+import traceback
+import unittest
+
+import subunit
+import testtools
+
+from tempest.cmd import scheduler
+from tempest.cmd import selection
+from tempest.test_discover import index
+
+
+class _LockedStreamResult(testtools.StreamResult):
+    """Forward the events of several threads to a single StreamResult"""
+
+    def __init__(self, target):
+        super(_LockedStreamResult, self).__init__()
+        self.target = target
+        self._lock = threading.Lock()
+
+    def startTestRun(self):
+        self.target.startTestRun()
+
+    def stopTestRun(self):
+        self.target.stopTestRun()
+
+    def status(self, *args, **kwargs):
+        with self._lock:
+            self.target.status(*args, **kwargs)
+
+
+def load_tests(test_ids=None, selector=None):
+    """Import the tests to run
+
+    :param test_ids: The ids of the tests to run, as listed by the discovery
+                     index. Only the modules of these tests are imported.
+    :param selector: When `test_ids` is None, the tests of tempest and its
+                     plugins are discovered and the ones selected by this
+                     `tempest.cmd.selection.TestSelector` are run.
+    :return: An OrderedDict of the tests by id
+    """
+    loader = unittest.TestLoader()
+    if test_ids is None:
+        suite = unittest.TestSuite()
+        for test_dir, top_path in index.get_test_dirs():
+            suite.addTests(loader.discover(test_dir, top_level_dir=top_path))
+        selector = selector or selection.TestSelector()
+    else:
+        class_ids = collections.OrderedDict(
+            (scheduler.get_class_id(x), None) for x in test_ids)
+        suite = loader.loadTestsFromNames(list(class_ids))
+        test_ids = set(test_ids)
+    # Import errors are reported as tests, which always run
+    failed_test = getattr(unittest.loader, '_FailedTest', ())
+    tests = collections.OrderedDict()
+    for test in testtools.iterate_tests(suite):
+        test_id = test.id()
+        if test_ids is None:
+            selected = selector.matches(test_id)
+        else:
+            selected = test_id in test_ids
+        if selected or isinstance(test, failed_test):
+            tests[test_id] = test
+    return tests
+
+
+def _run_worker(worker, tests, stream):
+    output = subunit.StreamResultToBytes(stream)
+    tagger = testtools.StreamTagger(
+        [output], add=['%s%d' % (scheduler.WORKER_TAG_PREFIX, worker)])
+    result = testtools.ExtendedToStreamDecorator(tagger)
+    result.startTestRun()
+    try:
+        # The suite sets up and tears down the class fixtures between the
+        # tests of different classes
+        unittest.TestSuite(tests).run(result)
+    finally:
+        result.stopTestRun()
+
+
+def _fork_worker(worker, tests):
+    read_fd, write_fd = os.pipe()
+    # Otherwise the buffered output would be written by every process
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        returncode = 1
+        try:
+            os.close(read_fd)
+            with os.fdopen(write_fd, 'wb') as stream:
+                _run_worker(worker, tests, stream)
+            returncode = 0
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Skips the exit handlers of the tempest run process
+            os._exit(returncode)
+    os.close(write_fd)
+    return pid, os.fdopen(read_fd, 'rb')
+
+
+def _read_worker(stream, result, errors):
+    try:
+        # The pipe is closed even if reading it fails, so that the worker
+        # fails writing to it rather than blocking forever
+        with stream:
+            case = subunit.ByteStreamToStreamResult(
+                stream, non_subunit_name='stdout')
+            case.run(result)
+    except Exception:
+        errors.append(traceback.format_exc())
+
+
+def run_tests(tests, concurrency, outputs, durations=None):
+    """Run tests in forked worker processes
+
+    :param tests: An OrderedDict of the tests by id, as returned by
+                  `load_tests`
+    :param concurrency: The number of workers
+    :param outputs: Binary file objects the merged subunit v2 stream of the
+                    workers is written to
+    :param durations: A dict of the durations in seconds by class id, used
+                      to assign the test classes to the workers. See
+                      `tempest.cmd.scheduler.schedule`.
+    :return: True if all the tests passed, and no worker crashed and the
+             streams of all the workers were read
+    """
+    summary = testtools.StreamSummary()
+    result = _LockedStreamResult(testtools.CopyStreamResult(
+        [summary] + [subunit.StreamResultToBytes(x) for x in outputs]))
+    result.startTestRun()
+    partitions = scheduler.schedule(list(tests), concurrency,
+                                    durations or {})
+    # All the workers are forked before starting the reader threads, since
+    # a worker forked while a reader holds the lock would never get it
+    workers = {}
+    errors = []
+    try:
+        for worker, partition in enumerate(partitions):
+            if partition:
+                workers[worker] = _fork_worker(
+                    worker, [tests[x] for x in partition])
+        threads = []
+        for pid, stream in workers.values():
+            thread = threading.Thread(target=_read_worker,
+                                      args=(stream, result, errors))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+    finally:
+        crashed = False
+        for worker, (pid, stream) in sorted(workers.items()):
+            _, status = os.waitpid(pid, 0)
+            if status:
+                crashed = True
+                sys.stderr.write('Worker %d exited with status %d\n' %
+                                 (worker, status))
+        for error in errors:
+            sys.stderr.write('Reading the output of a worker failed:\n%s' %
+                             error)
+        result.stopTestRun()
+    return summary.wasSuccessful() and not crashed and not errors
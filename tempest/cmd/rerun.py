@@ -0,0 +1,148 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Rerun the tests which failed in the last run of the testr repository
+
+The failed tests are selected by id from the list of the tests to run, rather
+than with a regex. The results of the rerun replace the ones of the same
+tests in the last run, and the merged stream is loaded in the repository as a
+new run, so the repository always has a complete last run.
+"""
+
+import io
+
+import subunit
+import testtools
+from testrepository import repository
+from testrepository.repository import file as file_repository
+
+from tempest.cmd import scheduler
+
+FAILING_STATUSES = ('fail', 'uxsuccess')
+
+
+class _ExcludingStreamResult(testtools.StreamResult):
+    """Forward the events of the tests which aren't excluded"""
+
+    def __init__(self, target, excluded):
+        super(_ExcludingStreamResult, self).__init__()
+        self.target = target
+        self.excluded = excluded
+
+    def status(self, test_id=None, **kwargs):
+        if not self.excluded(test_id):
+            self.target.status(test_id=test_id, **kwargs)
+
+
+def _read_results(stream):
+    results = []
+    result = testtools.StreamToDict(results.append)
+    result.startTestRun()
+    try:
+        subunit.ByteStreamToStreamResult(
+            stream, non_subunit_name='stdout').run(result)
+    finally:
+        result.stopTestRun()
+    # Tests are also reported when they are enumerated, before the run
+    return [x for x in results if x['status'] != 'exists']
+
+
+def get_latest_id(path='.'):
+    """Id of the last run of a testr repository
+
+    :param path: The directory containing the .testrepository directory
+    :return: The run id, or None if there is no repository or no run
+    """
+    try:
+        return file_repository.RepositoryFactory().open(path).latest_id()
+    except (repository.RepositoryNotFound, KeyError, ValueError):
+        return None
+
+
+def get_run_stream(run_id, path='.'):
+    """Subunit v2 stream of a run of a testr repository
+
+    :return: A binary file object
+    """
+    repo = file_repository.RepositoryFactory().open(path)
+    return repo.get_test_run(run_id).get_subunit_stream()
+
+
+def get_failing_ids(stream):
+    """Ids of the tests which failed in a subunit v2 stream
+
+    :return: A set of test ids. The failures of class fixtures are reported
+             with ids like ``setUpClass (tempest.api.compute.test_x.TestX)``.
+    """
+    return set(x['id'] for x in _read_results(stream)
+               if x['status'] in FAILING_STATUSES)
+
+
+def split_failing(test_ids, failing):
+    """Split tests between the ones to rerun and the others
+
+    :param test_ids: The ids of the tests to run
+    :param failing: The ids of the failed tests, as returned by
+                    `get_failing_ids`. All the tests of a class are rerun
+                    when its class fixtures failed.
+    :return: A tuple with the list of the ids of the tests which failed and
+             the list of the others, in the order of `test_ids`
+    """
+    classes = set(scheduler.get_class_id(x) for x in failing
+                  if scheduler.is_class_fixture(x))
+    failed = []
+    others = []
+    for test_id in test_ids:
+        if test_id in failing or scheduler.get_class_id(test_id) in classes:
+            failed.append(test_id)
+        else:
+            others.append(test_id)
+    return failed, others
+
+
+def merge_runs(output, previous_id, run_ids, path='.'):
+    """Merge the runs of a rerun into the run they rerun tests of
+
+    :param output: A binary file object the merged subunit v2 stream is
+                   written to
+    :param previous_id: The id of the run the tests were rerun from. Its
+                        results are kept for the tests which weren't rerun.
+    :param run_ids: The ids of the runs of the rerun
+    :param path: The directory containing the .testrepository directory
+    """
+    repo = file_repository.RepositoryFactory().open(path)
+    streams = [repo.get_test_run(x).get_subunit_stream().read()
+               for x in run_ids]
+    rerun_ids = set()
+    for stream in streams:
+        rerun_ids.update(x['id'] for x in _read_results(io.BytesIO(stream)))
+    rerun_classes = set(scheduler.get_class_id(x) for x in rerun_ids)
+
+    def excluded(test_id):
+        if test_id is None:
+            return False
+        # The class fixtures ran again with the tests of the class
+        return test_id in rerun_ids or (
+            scheduler.is_class_fixture(test_id) and
+            scheduler.get_class_id(test_id) in rerun_classes)
+
+    result = subunit.StreamResultToBytes(output)
+    previous = repo.get_test_run(previous_id).get_subunit_stream()
+    subunit.ByteStreamToStreamResult(
+        previous, non_subunit_name='stdout').run(
+            _ExcludingStreamResult(result, excluded))
+    for stream in streams:
+        subunit.ByteStreamToStreamResult(
+            io.BytesIO(stream), non_subunit_name='stdout').run(result)
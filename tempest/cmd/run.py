@@ -47,6 +47,18 @@ regexes will be ORed.
 You can also use the **--list-tests** option in conjunction with selection
 arguments to list which tests will be run.
 
+Finding the tests to run requires importing all the test modules, which takes
+a while. Tempest run rather finds the tests by parsing the test modules, and
+caches them in a ``.tempest_discovery_index`` file. The selected tests are then
+passed to testr, so that it does not need to list the tests itself. The index
+is not used when some of the tests are generated when the test modules are
+imported, or when the **--no-discovery-index** option is given.
+
+The tests found with the index are selected without building the regex above:
+the lines of the whitelist and blacklist files which are test ids or prefixes
+of them are matched as strings, with their dots only matching the dots of the
+test ids, and only the other lines are used as regexes.
+
 Test Execution
 ==============
 There are several options to control how the tests are executed. By default
@@ -54,6 +66,27 @@ tempest will run in parallel with a worker for each CPU present on the machine.
 If you want to adjust the number of workers use the **--concurrency** option
 and if you want to run tests serially use **--serial/-t**
 
+When running in parallel, the tests of a class always run on the same worker.
+The classes are assigned to the workers from the longest to the shortest, using
+their durations in the last runs stored in the .testrepository, so that all
+the workers finish at about the same time. Use the **--schedule-from** option
+to take the durations from a subunit v2 stream file instead.
+
+By default the tests run in the worker processes started by testr, which all
+parse the configuration and import the tests again. With the
+**--fork-workers** option, tempest run does this once and then forks the
+workers from its own process. The results are stored in the .testrepository as
+for a testr run, so the **--subunit** and **--combine** options work the same.
+This option can only be used to run the tempest and plugin tests.
+
+Rerunning Failed Tests
+----------------------
+The **--failing** option only runs the tests which failed in the last run
+stored in the .testrepository, and the **--failures-first** option runs them
+before the other tests. The results are then merged with the ones of the last
+run for the other tests, and stored as a new run in the .testrepository. These
+options can only be used to run the tempest and plugin tests.
+
 Running with Workspaces
 -----------------------
 Tempest run enables you to run your tempest tests from any setup tempest
@@ -88,7 +121,9 @@ as a single run you can leverage the **--combine** option which will append
 the current run's results with the previous runs.
 """
 
+import functools
 import io
+import multiprocessing
 import os
 import sys
 import tempfile
@@ -98,11 +133,17 @@ from cliff import command
 from os_testr import regex_builder
 from os_testr import subunit_trace
 import six
+from six import moves
 from testrepository.commands import run_argv
 
+from tempest.cmd import executor
 from tempest.cmd import init
+from tempest.cmd import rerun
+from tempest.cmd import scheduler
+from tempest.cmd import selection
 from tempest.cmd import workspace
 from tempest import config
+from tempest.test_discover import index
 
 
 CONF = config.CONF
@@ -142,6 +183,13 @@ class TempestRun(command.Command):
 
     def take_action(self, parsed_args):
         returncode = 0
+        if parsed_args.schedule_from:
+            if not os.path.isfile(parsed_args.schedule_from):
+                sys.exit("The subunit file %r doesn't exist" %
+                         parsed_args.schedule_from)
+            # The file is read after moving to the workspace
+            parsed_args.schedule_from = os.path.abspath(
+                parsed_args.schedule_from)
         if parsed_args.config_file:
             self._set_env(parsed_args.config_file)
         else:
@@ -182,12 +230,58 @@ class TempestRun(command.Command):
                 sys.exit(return_code)
 
         regex = self._build_regex(parsed_args)
+        selector = self._build_selector(parsed_args)
+        test_ids = None
+        if parsed_args.discovery_index and self._uses_tempest_discovery():
+            test_ids = self._list_tests(selector)
+        rerun_from = None
+        if parsed_args.failing or parsed_args.failures_first:
+            if not self._uses_tempest_discovery():
+                sys.exit("The --failing and --failures-first options can only "
+                         "be used to run the tests found by "
+                         "tempest/test_discover")
+            rerun_from = rerun.get_latest_id()
+            if rerun_from is None:
+                sys.exit("There is no previous run in the testr repository")
+            if test_ids is None:
+                test_ids = list(executor.load_tests(selector=selector))
+            with rerun.get_run_stream(rerun_from) as stream:
+                failing = rerun.get_failing_ids(stream)
+            failed, others = rerun.split_failing(test_ids, failing)
+            phases = [failed]
+            if parsed_args.failures_first:
+                phases.append(others)
+            phases = [x for x in phases if x]
+            test_ids = [x for phase in phases for x in phase]
         if parsed_args.list_tests:
-            argv = ['tempest', 'list-tests', regex]
-            returncode = run_argv(argv, sys.stdin, sys.stdout, sys.stderr)
+            if test_ids is not None:
+                for test_id in test_ids:
+                    print(test_id)
+            else:
+                argv = ['tempest', 'list-tests', regex]
+                returncode = run_argv(argv, sys.stdin, sys.stdout, sys.stderr)
         else:
+            if (parsed_args.fork_workers and
+                    not self._uses_tempest_discovery()):
+                sys.exit("The --fork-workers option can only be used to run "
+                         "the tests found by tempest/test_discover")
             options = self._build_options(parsed_args)
-            returncode = self._run(regex, options)
+            durations = None
+            if parsed_args.parallel:
+                durations = self._get_class_durations(
+                    parsed_args.schedule_from)
+            if rerun_from is None:
+                returncode = self._run_tests(regex, parsed_args, options,
+                                             test_ids, durations)
+            elif not phases:
+                print("No tests failed in the last run")
+            else:
+                # The failed tests run first, as a separate run
+                for phase in phases:
+                    returncode = self._run_tests(
+                        regex, parsed_args, options, phase,
+                        durations) or returncode
+                self._merge_runs(rerun_from)
             if returncode > 0:
                 sys.exit(returncode)
 
@@ -241,6 +335,10 @@ class TempestRun(command.Command):
         parser.add_argument('--list-tests', '-l', action='store_true',
                             help='List tests',
                             default=False)
+        parser.add_argument('--no-discovery-index', dest='discovery_index',
+                            action='store_false',
+                            help='Find the tests to run by importing them, '
+                                 'rather than with the discovery index')
         # execution args
         parser.add_argument('--concurrency', '-w',
                             help="The number of workers to use, defaults to "
@@ -253,13 +351,34 @@ class TempestRun(command.Command):
         parallel.add_argument('--serial', '-t', dest='parallel',
                               action='store_false',
                               help='Run tests serially')
+        parser.add_argument('--schedule-from', dest='schedule_from',
+                            metavar='SUBUNIT_FILE', default=None,
+                            help='Assign the test classes to the workers '
+                                 'using their durations in this subunit v2 '
+                                 'stream, rather than in the last runs of '
+                                 'the testr repository')
+        parser.add_argument('--fork-workers', dest='fork_workers',
+                            action='store_true',
+                            help='Import the tests once and run them in '
+                                 'workers forked from this process, rather '
+                                 'than in testr subprocesses')
         # output args
         parser.add_argument("--subunit", action='store_true',
                             help='Enable subunit v2 output')
-        parser.add_argument("--combine", action='store_true',
-                            help='Combine the output of this run with the '
-                                 "previous run's as a combined stream in the "
-                                 "testr repository after it finish")
+        rerun_mode = parser.add_mutually_exclusive_group()
+        rerun_mode.add_argument("--combine", action='store_true',
+                                help='Combine the output of this run with the '
+                                     "previous run's as a combined stream in "
+                                     "the testr repository after it finish")
+        rerun_mode.add_argument('--failing', action='store_true',
+                                help='Only run the tests which failed in the '
+                                     'last run, and merge their results in '
+                                     'it')
+        rerun_mode.add_argument('--failures-first', dest='failures_first',
+                                action='store_true',
+                                help='Run the tests which failed in the last '
+                                     'run before the other ones, and merge '
+                                     'the results in it')
 
         parser.set_defaults(parallel=True)
         return parser
@@ -276,6 +395,51 @@ class TempestRun(command.Command):
                                                   regex, False)
         return regex
 
+    def _uses_tempest_discovery(self):
+        # The discovery index only knows about the tempest and plugin tests
+        # which are found via tempest/test_discover
+        if 'test_discover' not in os.environ.get('OS_TEST_PATH',
+                                                 'test_discover'):
+            return False
+        parser = moves.configparser.ConfigParser()
+        try:
+            parser.read('.testr.conf')
+            test_command = parser.get('DEFAULT', 'test_command')
+        except moves.configparser.Error:
+            return False
+        return 'test_discover' in test_command
+
+    def _build_selector(self, parsed_args):
+        regex = ''
+        if parsed_args.smoke:
+            regex = 'smoke'
+        elif parsed_args.regex:
+            regex = parsed_args.regex
+        whitelist = []
+        if parsed_args.whitelist_file:
+            whitelist = selection.read_list_file(parsed_args.whitelist_file)
+        blacklist = []
+        if parsed_args.blacklist_file:
+            blacklist = selection.read_list_file(parsed_args.blacklist_file)
+        return selection.TestSelector(regex, whitelist, blacklist)
+
+    def _list_tests(self, selector):
+        """List the tests selected with the discovery index
+
+        :return: The list of test ids, or None if the index cannot be used
+        """
+        test_ids = index.DiscoveryIndex().list_tests()
+        if test_ids is not None:
+            test_ids = selector.select(test_ids)
+        return test_ids
+
+    def _get_class_durations(self, schedule_from=None):
+        if schedule_from:
+            with open(schedule_from, 'rb') as stream:
+                return scheduler.get_class_durations([stream])
+        return scheduler.get_class_durations(
+            scheduler.get_repository_streams())
+
     def _build_options(self, parsed_args):
         options = []
         if parsed_args.subunit:
@@ -286,33 +450,123 @@ class TempestRun(command.Command):
             options.append("--concurrency=%s" % parsed_args.concurrency)
         return options
 
-    def _run(self, regex, options):
+    def _run_tests(self, regex, parsed_args, options, test_ids=None,
+                   durations=None):
+        if parsed_args.fork_workers:
+            return self._run_forked(regex, parsed_args, test_ids, durations)
+        return self._run(regex, options, test_ids, durations)
+
+    def _merge_runs(self, rerun_from):
+        latest_id = rerun.get_latest_id()
+        if latest_id == rerun_from:
+            return
+        stream = tempfile.NamedTemporaryFile(suffix='.subunit', delete=False)
+        try:
+            with stream:
+                rerun.merge_runs(stream, rerun_from,
+                                 range(rerun_from + 1, latest_id + 1))
+            with open(os.devnull, 'w') as devnull:
+                run_argv(['tempest', 'load', stream.name], sys.stdin, devnull,
+                         sys.stderr)
+        finally:
+            os.remove(stream.name)
+
+    def _run(self, regex, options, test_ids=None, durations=None):
         returncode = 0
-        argv = ['tempest', 'run', regex] + options
-        if '--subunit' in options:
-            returncode = run_argv(argv, sys.stdin, sys.stdout, sys.stderr)
+        if durations:
+            run_testr = functools.partial(scheduler.run_argv,
+                                          durations=durations)
         else:
-            argv.append('--subunit')
-            stdin = io.StringIO()
-            stdout_r, stdout_w = os.pipe()
-            subunit_w = os.fdopen(stdout_w, 'wt')
-            subunit_r = os.fdopen(stdout_r)
-            returncodes = {}
-
-            def run_argv_thread():
-                returncodes['testr'] = run_argv(argv, stdin, subunit_w,
-                                                sys.stderr)
-                subunit_w.close()
-
-            run_thread = threading.Thread(target=run_argv_thread)
-            run_thread.start()
-            returncodes['subunit-trace'] = subunit_trace.trace(
-                subunit_r, sys.stdout, post_fails=True, print_failures=True)
-            run_thread.join()
-            subunit_r.close()
-            # python version of pipefail
-            if returncodes['testr']:
-                returncode = returncodes['testr']
-            elif returncodes['subunit-trace']:
-                returncode = returncodes['subunit-trace']
+            run_testr = run_argv
+        if test_ids:
+            # Saves testr from listing the tests to partition them
+            load_list = tempfile.NamedTemporaryFile(mode='w', delete=False)
+            with load_list:
+                load_list.write('\n'.join(test_ids) + '\n')
+            argv = ['tempest', 'run', '--load-list', load_list.name] + options
+        else:
+            argv = ['tempest', 'run', regex] + options
+        try:
+            if '--subunit' in options:
+                returncode = run_testr(argv, sys.stdin, sys.stdout, sys.stderr)
+            else:
+                argv.append('--subunit')
+                stdin = io.StringIO()
+                stdout_r, stdout_w = os.pipe()
+                subunit_w = os.fdopen(stdout_w, 'wt')
+                subunit_r = os.fdopen(stdout_r)
+                returncodes = {}
+
+                def run_argv_thread():
+                    returncodes['testr'] = run_testr(argv, stdin, subunit_w,
+                                                     sys.stderr)
+                    subunit_w.close()
+
+                run_thread = threading.Thread(target=run_argv_thread)
+                run_thread.start()
+                returncodes['subunit-trace'] = subunit_trace.trace(
+                    subunit_r, sys.stdout, post_fails=True,
+                    print_failures=True)
+                run_thread.join()
+                subunit_r.close()
+                # python version of pipefail
+                if returncodes['testr']:
+                    returncode = returncodes['testr']
+                elif returncodes['subunit-trace']:
+                    returncode = returncodes['subunit-trace']
+        finally:
+            if test_ids:
+                os.remove(load_list.name)
         return returncode
+
+    def _run_forked(self, regex, parsed_args, test_ids=None, durations=None):
+        # Same defaults as the test command of the .testr.conf
+        os.environ.setdefault('OS_STDOUT_CAPTURE', '1')
+        os.environ.setdefault('OS_STDERR_CAPTURE', '1')
+        os.environ.setdefault('OS_TEST_TIMEOUT', '500')
+        # Parse the configuration before forking, so the workers inherit it
+        # along with the imported tests
+        CONF.load()
+        tests = executor.load_tests(test_ids,
+                                    self._build_selector(parsed_args))
+        concurrency = 1
+        if parsed_args.parallel:
+            concurrency = int(parsed_args.concurrency or
+                              multiprocessing.cpu_count())
+        # The stream is loaded in the testr repository, like a testr run
+        stream = tempfile.NamedTemporaryFile(suffix='.subunit', delete=False)
+        try:
+            with stream:
+                if parsed_args.subunit:
+                    stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+                    passed = executor.run_tests(tests, concurrency,
+                                                [stream, stdout], durations)
+                    returncode = 0 if passed else 1
+                else:
+                    trace_r, trace_w = os.pipe()
+                    subunit_r = os.fdopen(trace_r, 'rb')
+                    returncodes = {}
+
+                    def trace_thread():
+                        returncodes['subunit-trace'] = subunit_trace.trace(
+                            subunit_r, sys.stdout, post_fails=True,
+                            print_failures=True)
+
+                    run_thread = threading.Thread(target=trace_thread)
+                    run_thread.start()
+                    with os.fdopen(trace_w, 'wb') as subunit_w:
+                        passed = executor.run_tests(tests, concurrency,
+                                                    [stream, subunit_w],
+                                                    durations)
+                    run_thread.join()
+                    subunit_r.close()
+                    # python version of pipefail
+                    returncode = 0 if passed else 1
+                    if not returncode:
+                        returncode = returncodes['subunit-trace']
+            with open(os.devnull, 'w') as devnull:
+                load_returncode = run_argv(['tempest', 'load', stream.name],
+                                           sys.stdin, devnull, sys.stderr)
+        finally:
+            os.remove(stream.name)
+        return returncode or load_returncode
@@ -0,0 +1,196 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Schedule the test classes of a parallel run across the workers
+
+testr partitions the tests using the duration of each test in the last run,
+which leaves out the time spent in the class fixtures. For the scenario tests
+the class fixtures take most of the time, so the longest classes often end
+up on the same worker and the whole run waits for it. The scheduler uses the
+duration of whole test classes in previous runs instead, and assigns the
+longest classes first, each to the worker which has the least work so far.
+"""
+
+import collections
+import functools
+import heapq
+import re
+
+import subunit
+import testtools
+from testrepository.commands import run as testr_run
+from testrepository import repository
+from testrepository.repository import file as file_repository
+from testrepository import testcommand
+from testrepository.ui import cli
+
+# Number of previous runs of the testr repository the durations are read from
+MAX_RUNS = 5
+WORKER_TAG_PREFIX = 'worker-'
+_FIXTURE_ID = re.compile(r'^\w+ \((.+)\)$')
+
+
+def get_class_id(test_id):
+    """Return the id of the class of a test
+
+    The failures of the class fixtures, reported as for instance
+    ``setUpClass (tempest.api.compute.test_x.TestX)``, belong to the class.
+    """
+    match = _FIXTURE_ID.match(test_id)
+    if match:
+        return match.group(1)
+    return test_id.split('[', 1)[0].rpartition('.')[0]
+
+
+def is_class_fixture(test_id):
+    """Whether a test id is the one of the class fixtures of a class"""
+    return bool(_FIXTURE_ID.match(test_id))
+
+
+def read_class_durations(stream):
+    """Duration of each test class in a subunit v2 stream
+
+    The time elapsed on a worker between the end of a test and the end of
+    the next one is counted in the class of the latter. This includes the
+    class fixtures, which run between the tests of two classes.
+
+    :param stream: A binary file object with a subunit v2 stream
+    :return: A dict of the durations in seconds by class id
+    """
+    tests = []
+    case = subunit.ByteStreamToStreamResult(stream, non_subunit_name='stdout')
+    result = testtools.StreamToDict(tests.append)
+    result.startTestRun()
+    try:
+        case.run(result)
+    finally:
+        result.stopTestRun()
+    workers = collections.defaultdict(list)
+    for test in tests:
+        start, stop = test['timestamps']
+        # Tests are also reported when they are enumerated, before the run
+        if test['status'] == 'exists' or start is None or stop is None:
+            continue
+        worker = [tag for tag in test['tags']
+                  if tag.startswith(WORKER_TAG_PREFIX)]
+        workers[tuple(worker)].append((start, stop, test['id']))
+    durations = collections.defaultdict(float)
+    for worker_tests in workers.values():
+        previous_stop = None
+        for start, stop, test_id in sorted(worker_tests):
+            elapsed = stop - (previous_stop or start)
+            durations[get_class_id(test_id)] += max(
+                elapsed.total_seconds(), 0)
+            previous_stop = stop
+    return dict(durations)
+
+
+def get_class_durations(streams):
+    """Duration of each test class in several subunit v2 streams
+
+    :param streams: The binary file objects of the streams, the most recent
+                    first. The duration of a class is the one of the first
+                    stream it is in.
+    :return: A dict of the durations in seconds by class id
+    """
+    durations = {}
+    for stream in streams:
+        for class_id, duration in read_class_durations(stream).items():
+            durations.setdefault(class_id, duration)
+    return durations
+
+
+def get_repository_streams(path='.', max_runs=MAX_RUNS):
+    """Subunit v2 streams of the last runs of a testr repository
+
+    :param path: The directory containing the .testrepository directory
+    :param max_runs: The maximum number of runs to return
+    :return: A generator of binary file objects, the most recent run first.
+             Nothing is generated if there is no repository.
+    """
+    try:
+        repo = file_repository.RepositoryFactory().open(path)
+        latest_id = repo.latest_id()
+    except (repository.RepositoryNotFound, KeyError, ValueError):
+        return
+    for run_id in range(latest_id, max(latest_id - max_runs, -1), -1):
+        try:
+            yield repo.get_test_run(run_id).get_subunit_stream()
+        except KeyError:
+            continue
+
+
+def schedule(test_ids, concurrency, durations):
+    """Partition tests across workers, longest test classes first
+
+    The tests of a class always run on the same worker, so that the class
+    fixtures are only set up once. Classes which are not in `durations` are
+    assumed to take the average duration of the known ones.
+
+    :param test_ids: The ids of the tests to run
+    :param concurrency: The number of workers
+    :param durations: A dict of the durations in seconds by class id, as
+                      returned by `get_class_durations`
+    :return: A list with the list of test ids of each worker
+    """
+    classes = collections.OrderedDict()
+    for test_id in test_ids:
+        classes.setdefault(get_class_id(test_id), []).append(test_id)
+    known = [durations[c] for c in classes if c in durations]
+    default = sum(known) / len(known) if known else 1.0
+    partitions = [[] for _ in range(concurrency)]
+    # Scheduled work of each worker, in seconds and in number of tests
+    workers = [(0.0, 0, i) for i in range(concurrency)]
+    for class_id in sorted(classes,
+                           key=lambda c: (-durations.get(c, default), c)):
+        work, count, index = heapq.heappop(workers)
+        partitions[index].extend(classes[class_id])
+        heapq.heappush(workers, (work + durations.get(class_id, default),
+                                 count + len(classes[class_id]), index))
+    return partitions
+
+
+class _ScheduledListingFixture(testcommand.TestListingFixture):
+
+    def __init__(self, *args, **kwargs):
+        self.durations = kwargs.pop('durations')
+        super(_ScheduledListingFixture, self).__init__(*args, **kwargs)
+
+    def partition_tests(self, test_ids, concurrency):
+        return schedule(test_ids, concurrency, self.durations)
+
+
+def run_argv(argv, stdin, stdout, stderr, durations):
+    """Run testr run, with the tests partitioned by `schedule`
+
+    This is the same as `testrepository.commands.run_argv` for the run
+    command, which gets the test command of the .testr.conf run with the
+    partitions of the scheduler instead of the testr ones.
+
+    :param argv: The argv of the command, for instance
+                 ``['tempest', 'run', '--parallel']``
+    :param durations: A dict of the durations in seconds by class id
+    :return: The exit code of the command
+    """
+    def command_factory(ui, repo):
+        test_command = testcommand.TestCommand(ui, repo)
+        test_command.run_factory = functools.partial(
+            _ScheduledListingFixture, durations=durations)
+        return test_command
+
+    ui = cli.UI(argv[2:], stdin, stdout, stderr)
+    cmd = testr_run.run(ui)
+    cmd.command_factory = command_factory
+    return cmd.execute() or 0
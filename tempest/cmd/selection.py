@@ -0,0 +1,213 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Select the tests to run with the whitelist and blacklist files
+
+``os_testr.regex_builder.construct_regex`` joins all the entries of the
+files in one regex, like ``^(?!b1|b2|...).*(w1|w2|...).*$``, which tries
+every entry at every position of every test id. The selector matches the
+entries which are test ids or prefixes of them with tries instead, in a time
+proportional to the length of the test id, and only uses regexes for the
+other entries.
+
+The tests selected are the same as with the regex, except that the dots of
+the literal entries only match the dots separating the names of the test ids.
+"""
+
+import collections
+import re
+
+# Characters with a special meaning in a regex, apart from dots
+_SPECIAL_CHARS = frozenset('^$*+?{}[]|()\\')
+
+
+def read_list_file(path):
+    """Entries of a whitelist or blacklist file
+
+    Each line of the file has a regex, optionally followed by a comment
+    starting with ``#``.
+
+    :return: The list of the regexes of the file
+    """
+    entries = []
+    with open(path) as list_file:
+        for line in list_file:
+            entry = line.split('#')[0].strip()
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def parse_literal(entry):
+    """Literal string matched by a regex, if it only matches one
+
+    :return: A tuple of whether the regex is anchored to the start of the
+             test id and of the literal string, or None if the regex isn't
+             a literal
+    """
+    anchored = entry.startswith('^')
+    if anchored:
+        entry = entry[1:]
+    # A trailing .* doesn't change the tests matched
+    if entry.endswith('.*') and not entry.endswith('\\.*'):
+        entry = entry[:-2]
+    literal = []
+    chars = iter(entry)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, None)
+            # Escape sequences like \d match classes of characters
+            if char is None or char.isalnum():
+                return None
+        elif char in _SPECIAL_CHARS:
+            return None
+        literal.append(char)
+    if not literal:
+        return None
+    return anchored, ''.join(literal)
+
+
+class _Trie(object):
+    """Find strings in test ids with an Aho-Corasick automaton"""
+
+    def __init__(self, strings):
+        # The nodes are indexes in these lists
+        self._goto = [{}]
+        self._fail = [0]
+        # Whether the string of a node is in the trie
+        self._terminal = [False]
+        # Whether a suffix of the string of a node is in the trie
+        self._end = [False]
+        for string in strings:
+            node = 0
+            for char in string:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(False)
+                    self._end.append(False)
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._terminal[node] = True
+            self._end[node] = True
+        # The fail link of a node is the longest suffix of its string which
+        # is in the trie
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._end[child] = self._end[child] or self._end[fail]
+
+    def __bool__(self):
+        return len(self._goto) > 1
+
+    __nonzero__ = __bool__
+
+    def match(self, string):
+        """Whether a string of the trie is a prefix of string"""
+        node = 0
+        for char in string:
+            if self._terminal[node]:
+                return True
+            node = self._goto[node].get(char)
+            if node is None:
+                return False
+        return self._terminal[node]
+
+    def search(self, string):
+        """Whether a string of the trie is in string"""
+        node = 0
+        for char in string:
+            if self._end[node]:
+                return True
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+        return self._end[node]
+
+
+class _Matcher(object):
+    """Match test ids against regexes, as re.match or re.search would"""
+
+    def __init__(self, entries, anchored):
+        prefixes = []
+        strings = []
+        regexes = []
+        for entry in entries:
+            literal = parse_literal(entry)
+            if literal is None:
+                regexes.append(entry)
+            elif anchored or literal[0]:
+                prefixes.append(literal[1])
+            else:
+                strings.append(literal[1])
+        self._prefixes = _Trie(prefixes)
+        self._strings = _Trie(strings)
+        self._regex = None
+        if regexes:
+            regex = '|'.join('(?:%s)' % x for x in regexes)
+            if anchored:
+                regex = '^(?:%s)' % regex
+            self._regex = re.compile(regex)
+
+    def __call__(self, test_id):
+        return bool(
+            (self._prefixes and self._prefixes.match(test_id)) or
+            (self._strings and self._strings.search(test_id)) or
+            (self._regex and self._regex.search(test_id)))
+
+
+class TestSelector(object):
+    """Select test ids with a regex and whitelist and blacklist entries
+
+    A test is selected if no blacklist entry matches the start of its id,
+    and the regex or a whitelist entry matches a part of its id. All the
+    tests which aren't blacklisted are selected when there is no regex and
+    no whitelist entry.
+
+    :param regex: A regex, as given to testr
+    :param whitelist: A list of regexes, as returned by `read_list_file`
+    :param blacklist: A list of regexes, as returned by `read_list_file`
+    """
+
+    def __init__(self, regex='', whitelist=(), blacklist=()):
+        whitelist = list(whitelist)
+        if regex:
+            whitelist.append(regex)
+        self._whitelist = None
+        if whitelist:
+            self._whitelist = _Matcher(whitelist, anchored=False)
+        self._blacklist = _Matcher(blacklist, anchored=True)
+
+    def matches(self, test_id):
+        """Whether a test is selected"""
+        if self._blacklist(test_id):
+            return False
+        return self._whitelist is None or self._whitelist(test_id)
+
+    def select(self, test_ids):
+        """Selected tests
+
+        :param test_ids: An iterable of test ids
+        :return: The list of the test ids which are selected, in the same
+                 order
+        """
+        return [x for x in test_ids if self.matches(x)]
@@ -11,6 +11,10 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import atexit
+import os
+import threading
+
 from oslo_concurrency import lockutils
 
 from tempest import clients
@@ -22,6 +26,9 @@ from tempest.lib import exceptions
 
 CONF = config.CONF
 
+_DYNAMIC_CREDENTIALS_POOLS = {}
+_DYNAMIC_CREDENTIALS_POOLS_LOCK = threading.Lock()
+
 
 """This module provides factories of credential and credential providers
 
@@ -61,6 +68,44 @@ def get_preprov_provider_params():
     ]))
 
 
+def _get_dynamic_credentials_pool(identity_version, admin_creds):
+    """Process-wide pool of dynamic credentials, if configured"""
+    if CONF.auth.dynamic_credentials_pool_size <= 0:
+        return None
+    key = (os.getpid(), identity_version)
+    with _DYNAMIC_CREDENTIALS_POOLS_LOCK:
+        if key not in _DYNAMIC_CREDENTIALS_POOLS:
+            provider = _get_dynamic_provider(
+                'tempest-pool', None, identity_version, admin_creds)
+            credentials_pool = dynamic_creds.DynamicCredentialPool(
+                provider, CONF.auth.dynamic_credentials_pool_size,
+                recycle=CONF.auth.dynamic_credentials_pool_recycle)
+            atexit.register(credentials_pool.close)
+            _DYNAMIC_CREDENTIALS_POOLS[key] = credentials_pool
+        return _DYNAMIC_CREDENTIALS_POOLS[key]
+
+
+def _get_dynamic_provider(name, network_resources, identity_version,
+                          admin_creds, credentials_pool=None):
+    return dynamic_creds.DynamicCredentialProvider(
+        name=name,
+        network_resources=network_resources,
+        identity_version=identity_version,
+        admin_creds=admin_creds,
+        identity_admin_domain_scope=CONF.identity.admin_domain_scope,
+        identity_admin_role=CONF.identity.admin_role,
+        extra_roles=CONF.auth.tempest_roles,
+        neutron_available=CONF.service_available.neutron,
+        project_network_cidr=CONF.network.project_network_cidr,
+        project_network_mask_bits=CONF.network.project_network_mask_bits,
+        public_network_id=CONF.network.public_network_id,
+        create_networks=(CONF.auth.create_isolated_networks and not
+                         CONF.network.shared_physical_network),
+        resource_prefix=CONF.resources_prefix,
+        credentials_pool=credentials_pool,
+        **get_dynamic_provider_params())
+
+
 # Return the right implementation of CredentialProvider based on config
 # Dropping interface and password, as they are never used anyways
 # TODO(andreaf) Drop them from the CredentialsProvider interface completely
@@ -75,22 +120,10 @@ def get_credentials_provider(name, network_resources=None,
     if CONF.auth.use_dynamic_credentials or force_tenant_isolation:
         admin_creds = get_configured_admin_credentials(
             fill_in=True, identity_version=identity_version)
-        return dynamic_creds.DynamicCredentialProvider(
-            name=name,
-            network_resources=network_resources,
-            identity_version=identity_version,
-            admin_creds=admin_creds,
-            identity_admin_domain_scope=CONF.identity.admin_domain_scope,
-            identity_admin_role=CONF.identity.admin_role,
-            extra_roles=CONF.auth.tempest_roles,
-            neutron_available=CONF.service_available.neutron,
-            project_network_cidr=CONF.network.project_network_cidr,
-            project_network_mask_bits=CONF.network.project_network_mask_bits,
-            public_network_id=CONF.network.public_network_id,
-            create_networks=(CONF.auth.create_isolated_networks and not
-                             CONF.network.shared_physical_network),
-            resource_prefix=CONF.resources_prefix,
-            **get_dynamic_provider_params())
+        return _get_dynamic_provider(
+            name, network_resources, identity_version, admin_creds,
+            credentials_pool=_get_dynamic_credentials_pool(
+                identity_version, admin_creds))
     else:
         if CONF.auth.test_accounts_file:
             # Most params are not relevant for pre-created accounts
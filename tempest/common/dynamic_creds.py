@@ -12,6 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from multiprocessing import pool
+import threading
+
 import netaddr
 from oslo_log import log as logging
 import six
@@ -33,7 +36,8 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
                  identity_admin_role='admin', extra_roles=None,
                  neutron_available=False, create_networks=True,
                  project_network_cidr=None, project_network_mask_bits=None,
-                 public_network_id=None, resource_prefix=None):
+                 public_network_id=None, resource_prefix=None,
+                 credentials_pool=None):
         """Creates credentials dynamically for tests
 
         A credential provider that, based on an initial set of
@@ -67,6 +71,9 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
         :param project_network_mask_bits: The network mask bits to use for
                                           created project networks
         :param public_network_id: The id for the public network to use
+        :param credentials_pool: An optional `DynamicCredentialPool`, from
+                                 which primary and alt credentials are taken
+                                 when the default network resources are used
         """
         super(DynamicCredentialProvider, self).__init__(
             identity_version=identity_version, admin_role=admin_role,
@@ -74,6 +81,9 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
             network_resources=network_resources)
         self.network_resources = network_resources
         self._creds = {}
+        self.credentials_pool = credentials_pool
+        # Credentials taken from the pool, given back on clear_creds
+        self._pooled_creds = {}
         self.ports = []
         self.resource_prefix = resource_prefix or ''
         self.neutron_available = neutron_available
@@ -305,10 +315,27 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
         self.routers_admin_client.add_router_interface(router_id,
                                                        subnet_id=subnet_id)
 
+    def _get_pooled_creds(self, credential_type):
+        # Pooled credentials have default network resources and no roles
+        # other than the configured ones.
+        if (self.credentials_pool is None or self.network_resources or
+                credential_type not in ['primary', 'alt']):
+            return None
+        credentials = self.credentials_pool.acquire()
+        if credentials is not None:
+            self._pooled_creds[credential_type] = credentials
+            LOG.info("Acquired pooled dynamic creds:\n credentials: %s",
+                     credentials)
+        return credentials
+
     def get_credentials(self, credential_type):
         if self._creds.get(str(credential_type)):
             credentials = self._creds[str(credential_type)]
         else:
+            credentials = self._get_pooled_creds(credential_type)
+            if credentials is not None:
+                self._creds[str(credential_type)] = credentials
+                return credentials
             if credential_type in ['primary', 'alt', 'admin']:
                 is_admin = (credential_type == 'admin')
                 credentials = self._create_creds(admin=is_admin)
@@ -418,6 +445,11 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
                                              creds.network['name'])
 
     def clear_creds(self):
+        # Pooled credentials are deleted or recycled by the pool
+        for credential_type, creds in six.iteritems(self._pooled_creds):
+            self._creds.pop(credential_type, None)
+            self.credentials_pool.release(creds)
+        self._pooled_creds = {}
         if not self._creds:
             return
         self._clear_isolated_net_resources()
@@ -453,3 +485,109 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
 
     def is_role_available(self, role):
         return True
+
+
+class DynamicCredentialPool(object):
+    """Pool of credentials created ahead of time
+
+    Creating credentials with their network resources takes several calls
+    to Keystone and Neutron. The pool creates a number of them in the
+    background, concurrently, so that dynamic credential providers can hand
+    them out to test classes right away. Each credential set taken from the
+    pool is replaced in the background.
+
+    Credential sets are given back to the pool when the credential provider
+    is cleared. They are then either reused, if recycle is True, or deleted
+    together with the unused ones when the pool is closed.
+
+    :param provider: A `DynamicCredentialProvider` used to create and delete
+                     the credentials
+    :param size: Number of credential sets to keep ready
+    :param recycle: Reuse the credential sets given back to the pool
+    """
+
+    def __init__(self, provider, size, recycle=False):
+        self.provider = provider
+        self.size = size
+        self.recycle = recycle
+        self._free = []
+        self._released = []
+        self._pending = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._workers = pool.ThreadPool(max(size, 1))
+        self._fill(size)
+
+    def _fill(self, count):
+        with self._cond:
+            if self._closed:
+                return
+            self._pending += count
+        for _ in range(count):
+            self._workers.apply_async(self._create)
+
+    def _create(self):
+        created = credentials = None
+        provider = self.provider
+        try:
+            created = provider._create_creds()
+            if provider.neutron_available and provider.create_networks:
+                network, subnet, router = provider._create_network_resources(
+                    created.tenant_id)
+                created.set_resources(network=network, subnet=subnet,
+                                      router=router)
+            credentials = created
+        except Exception:
+            LOG.exception("Failed to create pooled credentials")
+        with self._cond:
+            self._pending -= 1
+            if credentials is not None:
+                self._free.append(credentials)
+            elif created is not None:
+                # Deleted when the pool is closed
+                self._released.append(created)
+            self._cond.notify_all()
+
+    def acquire(self):
+        """Take a credential set from the pool
+
+        If the pool is empty but credentials are being created, this waits
+        for them.
+
+        :return: A `TestResources`, or None if the pool is exhausted
+        """
+        with self._cond:
+            while not self._free and self._pending and not self._closed:
+                self._cond.wait()
+            if not self._free or self._closed:
+                return None
+            credentials = self._free.pop(0)
+        if not self.recycle:
+            # Keep the pool warm
+            self._fill(1)
+        return credentials
+
+    def release(self, credentials):
+        """Give a credential set taken from the pool back"""
+        with self._cond:
+            if self.recycle and not self._closed:
+                self._free.append(credentials)
+                self._cond.notify_all()
+            else:
+                self._released.append(credentials)
+
+    def close(self):
+        """Stop creating credentials and delete all the pooled ones"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._workers.close()
+        self._workers.join()
+        with self._cond:
+            to_delete = self._free + self._released
+            self._free = []
+            self._released = []
+        if to_delete:
+            self.provider._creds = dict(
+                ('pool-%d' % i, creds) for i, creds in enumerate(to_delete))
+            self.provider.clear_creds()
@@ -12,23 +12,29 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import errno
 import hashlib
 import os
 
-from oslo_concurrency import lockutils
 from oslo_log import log as logging
 import six
 import yaml
 
 from tempest import clients
 from tempest.common import fixed_network
+from tempest import config
 from tempest import exceptions
 from tempest.lib import auth
 from tempest.lib.common import cred_provider
 from tempest.lib import exceptions as lib_exc
+from tempest.lib.services import compute
 
 LOG = logging.getLogger(__name__)
 
+# Networks of the pre-provisioned accounts, by (project, network name). They
+# do not change while tests run, so they are looked up once per process.
+_NETWORKS = {}
+
 
 def read_accounts_yaml(path):
     try:
@@ -56,9 +62,10 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
 
         This credentials provider loads the details of pre-provisioned
         accounts from a YAML file, in the format specified by
-        `etc/accounts.yaml.sample`. It locks accounts while in use, using the
-        external locking mechanism, allowing for multiple python processes
-        to share a single account file, and thus running tests in parallel.
+        `etc/accounts.yaml.sample`. It locks accounts while in use, by
+        atomically creating a lock file per account, allowing for multiple
+        python processes to share a single account file, and thus running
+        tests in parallel.
 
         The accounts_lock_dir must be generated using `lockutils.get_lock_path`
         from the oslo.concurrency library. For instance:
@@ -93,6 +100,7 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
             object_storage_reseller_admin_role)
         self.accounts_dir = accounts_lock_dir
         self._creds = {}
+        self._build_role_index()
 
     @classmethod
     def _append_role(cls, role, account_hash, hash_dict):
@@ -170,68 +178,99 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
     def is_multi_tenant(self):
         return self.is_multi_user()
 
+    def _create_accounts_dir(self):
+        try:
+            os.mkdir(self.accounts_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
     def _create_hash_file(self, hash_string):
-        path = os.path.join(os.path.join(self.accounts_dir, hash_string))
-        if not os.path.isfile(path):
-            with open(path, 'w') as fd:
-                fd.write(self.name)
-            return True
-        return False
+        # Creating the file with O_EXCL is atomic, so at most one process
+        # can lock a given account, without any other lock
+        path = os.path.join(self.accounts_dir, hash_string)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+        try:
+            try:
+                fd = os.open(path, flags, 0o644)
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+                # The lock dir was removed when the last account in use was
+                # released, create it again
+                self._create_accounts_dir()
+                fd = os.open(path, flags, 0o644)
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+        with os.fdopen(fd, 'w') as hash_file:
+            hash_file.write(self.name)
+        return True
 
-    @lockutils.synchronized('test_accounts_io', external=True)
     def _get_free_hash(self, hashes):
         # Cast as a list because in some edge cases a set will be passed in
         hashes = list(hashes)
         if not os.path.isdir(self.accounts_dir):
-            os.mkdir(self.accounts_dir)
-            # Create File from first hash (since none are in use)
-            self._create_hash_file(hashes[0])
-            return hashes[0]
-        names = []
+            self._create_accounts_dir()
         for _hash in hashes:
-            res = self._create_hash_file(_hash)
-            if res:
+            if self._create_hash_file(_hash):
                 return _hash
-            else:
-                path = os.path.join(os.path.join(self.accounts_dir,
-                                                 _hash))
+        names = []
+        for _hash in hashes:
+            path = os.path.join(self.accounts_dir, _hash)
+            try:
                 with open(path, 'r') as fd:
                     names.append(fd.read())
+            except IOError:
+                # The account was released in the meantime
+                pass
         msg = ('Insufficient number of users provided. %s have allocated all '
                'the credentials for this allocation request' % ','.join(names))
         raise lib_exc.InvalidCredentials(msg)
 
+    def _build_role_index(self):
+        # Index the accounts by role once, so that allocations only have to
+        # look up the accounts matching the requested roles
+        self._role_index = dict(
+            (role, frozenset(hashes))
+            for role, hashes in self.hash_dict['roles'].items())
+        # NOTE(mtreinish): admin is a special case because of the increased
+        # privilege set which could potentially cause issues on tests where
+        # that is not expected. So unless the admin role isn't specified do
+        # not allocate admin.
+        self._admin_hashes = self._role_index.get(self.admin_role,
+                                                  frozenset())
+        self._match_hashes = {}
+        self._get_match_hash_list()
+        for role in self._role_index:
+            self._get_match_hash_list([role])
+
     def _get_match_hash_list(self, roles=None):
-        hashes = []
+        roles = frozenset(roles or [])
+        if roles in self._match_hashes:
+            return self._match_hashes[roles]
         if roles:
-            # Loop over all the creds for each role in the subdict and generate
-            # a list of cred lists for each role
+            hashes = None
             for role in roles:
-                temp_hashes = self.hash_dict['roles'].get(role, None)
-                if not temp_hashes:
+                role_hashes = self._role_index.get(role)
+                if not role_hashes:
                     raise lib_exc.InvalidCredentials(
                         "No credentials with role: %s specified in the "
                         "accounts ""file" % role)
-                hashes.append(temp_hashes)
-            # Take the list of lists and do a boolean and between each list to
-            # find the creds which fall under all the specified roles
-            temp_list = set(hashes[0])
-            for hash_list in hashes[1:]:
-                temp_list = temp_list & set(hash_list)
-            hashes = temp_list
-        else:
-            hashes = self.hash_dict['creds'].keys()
-        # NOTE(mtreinish): admin is a special case because of the increased
-        # privilege set which could potentially cause issues on tests where
-        # that is not expected. So unless the admin role isn't specified do
-        # not allocate admin.
-        admin_hashes = self.hash_dict['roles'].get(self.admin_role,
-                                                   None)
-        if ((not roles or self.admin_role not in roles) and
-                admin_hashes):
-            useable_hashes = [x for x in hashes if x not in admin_hashes]
+                # Find the creds which fall under all the specified roles
+                if hashes is None:
+                    hashes = role_hashes
+                else:
+                    hashes = hashes & role_hashes
         else:
-            useable_hashes = hashes
+            hashes = frozenset(self.hash_dict['creds'])
+        if self.admin_role not in roles:
+            hashes = hashes - self._admin_hashes
+        # Keep the order of the accounts file
+        useable_hashes = tuple(x for x in self.hash_dict['creds']
+                               if x in hashes)
+        self._match_hashes[roles] = useable_hashes
         return useable_hashes
 
     def _sanitize_creds(self, creds):
@@ -250,16 +289,22 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
         LOG.info('%s allocated creds:\n%s', self.name, clean_creds)
         return self._wrap_creds_with_network(free_hash)
 
-    @lockutils.synchronized('test_accounts_io', external=True)
     def remove_hash(self, hash_string):
         hash_path = os.path.join(self.accounts_dir, hash_string)
-        if not os.path.isfile(hash_path):
+        try:
+            os.remove(hash_path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
             LOG.warning('Expected an account lock file %s to remove, but '
                         'one did not exist', hash_path)
-        else:
-            os.remove(hash_path)
-            if not os.listdir(self.accounts_dir):
+            return
+        if not os.listdir(self.accounts_dir):
+            try:
                 os.rmdir(self.accounts_dir)
+            except OSError:
+                # Another account was locked in the meantime
+                pass
 
     def get_hash(self, creds):
         for _hash in self.hash_dict['creds']:
@@ -341,17 +386,28 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
             auth_url=None, fill_in=False,
             identity_version=self.identity_version, **creds_dict)
         net_creds = cred_provider.TestResources(credential)
-        net_clients = clients.Manager(credentials=credential)
-        compute_network_client = net_clients.compute_networks_client
         net_name = self.hash_dict['networks'].get(hash, None)
-        try:
-            network = fixed_network.get_network_from_name(
-                net_name, compute_network_client)
-        except exceptions.InvalidTestResource:
-            network = {}
-        net_creds.set_resources(network=network)
+        net_creds.set_resources(
+            network=self._get_network(credential, net_name))
         return net_creds
 
+    @staticmethod
+    def _get_network(credential, net_name):
+        if not net_name:
+            return {}
+        key = (credential.project_id or credential.project_name, net_name)
+        if key not in _NETWORKS:
+            # Only the compute networks client is needed to find the network
+            compute_network_client = compute.NetworksClient(
+                clients.get_auth_provider(credential),
+                **config.service_client_config('compute'))
+            try:
+                _NETWORKS[key] = fixed_network.get_network_from_name(
+                    net_name, compute_network_client)
+            except exceptions.InvalidTestResource:
+                _NETWORKS[key] = {}
+        return _NETWORKS[key]
+
     def _extend_credentials(self, creds_dict):
         # Add or remove credential domain fields to fit the identity version
         domain_fields = set(x for x in auth.KeystoneV3Credentials.ATTRIBUTES
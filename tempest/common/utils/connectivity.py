@@ -0,0 +1,196 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Check the connectivity between many sources and destinations at once
+
+Each round of checks pings all the destinations of a source concurrently:
+the local destinations with one ping process each, and the destinations of
+a guest with a single ssh command. The sources are checked in parallel.
+Rounds are repeated until every pair has the expected result, or until
+the timeout expires, so that checking N servers takes about as long as
+checking one.
+
+Servers are waited for ssh the same way, all at once, with a cheap probe
+of their ssh port before the ssh handshake.
+"""
+
+import collections
+from multiprocessing import pool
+import socket
+import subprocess
+import time
+
+import netaddr
+from oslo_log import log as logging
+
+from tempest.common.utils import net_utils
+from tempest.lib import exceptions as lib_exc
+
+LOG = logging.getLogger(__name__)
+
+
+def get_ping_command(address, mtu=None):
+    """Command pinging an address once from the local host
+
+    :param mtu: The MTU of the network, to ping with frames of that size
+                which mustn't be fragmented
+    """
+    cmd = ['ping', '-c1', '-w1']
+    if mtu:
+        cmd += [
+            # don't fragment
+            '-M', 'do',
+            # ping receives just the size of ICMP payload
+            '-s', str(net_utils.get_ping_payload_size(
+                mtu, netaddr.IPAddress(address).version))
+        ]
+    cmd.append(address)
+    return cmd
+
+
+def ping_local(addresses, mtu=None):
+    """Ping addresses concurrently from the local host
+
+    :returns: The set of the addresses which answered
+    """
+    procs = [(address, subprocess.Popen(get_ping_command(address, mtu),
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE))
+             for address in addresses]
+    reachable = set()
+    for address, proc in procs:
+        proc.communicate()
+        if proc.returncode == 0:
+            reachable.add(address)
+    return reachable
+
+
+def _ping(source, destinations, mtu, nic):
+    if source is None:
+        return ping_local(destinations, mtu)
+    try:
+        return source.ping_hosts(destinations, nic=nic)
+    except lib_exc.SSHExecCommandFailed:
+        LOG.warning('Failed to ping IPs: %s via a ssh connection from: %s.',
+                    destinations, source.ssh_client.host)
+        return set()
+
+
+def check_connectivity(pairs, timeout, should_succeed=True, mtu=None,
+                       nic=None, interval=1):
+    """Check whether destinations are reachable from sources
+
+    :param pairs: An iterable of (source, destination) tuples. The source
+                  is a RemoteClient connected to the guest to ping from, or
+                  None to ping from the local host, and the destination an
+                  IP address.
+    :param timeout: Time in seconds to wait for the expected results
+    :param should_succeed: Whether the destinations are expected to be
+                           reachable
+    :param mtu: The MTU of the network, for the pings from the local host
+    :param nic: The network interface to ping from in the guests
+    :param interval: Minimum time in seconds between two rounds of pings
+    :returns: A dict mapping each pair to whether the destination was
+              reachable from the source when it was last pinged. The pairs
+              which don't have the expected result timed out.
+    """
+    pending = collections.OrderedDict((pair, None) for pair in pairs)
+    results = dict.fromkeys(pending, not should_succeed)
+    if not pending:
+        return results
+    start_time = time.time()
+    thread_pool = pool.ThreadPool(len(set(x[0] for x in pending)))
+    try:
+        while True:
+            round_start = time.time()
+            destinations = collections.OrderedDict()
+            for source, destination in pending:
+                destinations.setdefault(source, []).append(destination)
+            jobs = list(destinations.items())
+            reachable = thread_pool.map(
+                lambda job: _ping(job[0], job[1], mtu, nic), jobs)
+            for (source, dests), answered in zip(jobs, reachable):
+                for destination in dests:
+                    result = destination in answered
+                    results[(source, destination)] = result
+                    if result == should_succeed:
+                        del pending[(source, destination)]
+            if not pending or time.time() - start_time >= timeout:
+                break
+            time.sleep(max(0, interval - (time.time() - round_start)))
+    finally:
+        thread_pool.close()
+        thread_pool.join()
+    return results
+
+
+def is_port_open(host, port, timeout=1):
+    """Whether a TCP connection to a port of a host can be opened"""
+    try:
+        sock = socket.create_connection((host, port), timeout)
+    except socket.error:
+        return False
+    sock.close()
+    return True
+
+
+def wait_for_port(host, port, timeout, interval=1):
+    """Wait for a TCP port of a host to accept connections
+
+    :raises: TimeoutException if the port isn't open before the timeout
+    """
+    start_time = time.time()
+    while True:
+        attempt_start = time.time()
+        if is_port_open(host, port, timeout=interval):
+            return
+        if time.time() - start_time >= timeout:
+            raise lib_exc.TimeoutException(
+                "Port %s of %s not open after %s seconds" % (port, host,
+                                                             timeout))
+        time.sleep(max(0, interval - (time.time() - attempt_start)))
+
+
+def wait_for_ssh(ip_addresses, get_client, timeout, port=22, interval=1):
+    """Wait for ssh on several servers concurrently
+
+    The ssh port of each server is probed every `interval` seconds, and
+    the ssh connection is only opened once the port accepts connections,
+    which avoids waiting in the backoff of the ssh client.
+
+    :param ip_addresses: An iterable of the IP addresses of the servers
+    :param get_client: A function taking an IP address, and returning a
+                       client connected to it
+    :param timeout: Time in seconds to wait for the ssh port of a server
+    :returns: A generator of (ip_address, client) tuples, in the order the
+              servers become ready
+    :raises: TimeoutException if the ssh port of a server isn't open
+             before the timeout, and the exceptions of `get_client`
+    """
+    ip_addresses = list(ip_addresses)
+    if not ip_addresses:
+        return
+
+    def connect(ip_address):
+        wait_for_port(ip_address, port, timeout, interval)
+        return ip_address, get_client(ip_address)
+
+    thread_pool = pool.ThreadPool(len(ip_addresses))
+    try:
+        for result in thread_pool.imap_unordered(connect, ip_addresses):
+            yield result
+    finally:
+        thread_pool.close()
+        thread_pool.join()
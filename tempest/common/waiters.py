@@ -18,6 +18,7 @@ from oslo_log import log as logging
 from tempest.common import image as common_image
 from tempest import config
 from tempest import exceptions
+from tempest.lib.common import polling
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services.image.v1 import images_client as images_v1_client
@@ -37,11 +38,13 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
 
     # NOTE(afazekas): UNKNOWN status possible on ERROR
     # or in a very early stage.
-    body = client.show_server(server_id)['server']
+    resp = client.show_server(server_id)
+    body = resp['server']
     old_status = server_status = body['status']
     old_task_state = task_state = _get_task_state(body)
     start_time = int(time.time())
     timeout = client.build_timeout + extra_timeout
+    intervals = polling.get_intervals(client)
     while True:
         # NOTE(afazekas): Now the BUILD status only reached
         # between the UNKNOWN->ACTIVE transition.
@@ -61,8 +64,9 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
             else:
                 return
 
-        time.sleep(client.build_interval)
-        body = client.show_server(server_id)['server']
+        polling.sleep(intervals, resp)
+        resp = client.show_server(server_id)
+        body = resp['server']
         server_status = body['status']
         task_state = _get_task_state(body)
         if (server_status != old_status) or (task_state != old_task_state):
@@ -101,18 +105,21 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
 def wait_for_server_termination(client, server_id, ignore_error=False):
     """Waits for server to reach termination."""
     try:
-        body = client.show_server(server_id)['server']
+        resp = client.show_server(server_id)
     except lib_exc.NotFound:
         return
+    body = resp['server']
     old_status = server_status = body['status']
     old_task_state = task_state = _get_task_state(body)
     start_time = int(time.time())
+    intervals = polling.get_intervals(client)
     while True:
-        time.sleep(client.build_interval)
+        polling.sleep(intervals, resp)
         try:
-            body = client.show_server(server_id)['server']
+            resp = client.show_server(server_id)
         except lib_exc.NotFound:
             return
+        body = resp['server']
         server_status = body['status']
         task_state = _get_task_state(body)
         if (server_status != old_status) or (task_state != old_task_state):
@@ -129,6 +136,109 @@ def wait_for_server_termination(client, server_id, ignore_error=False):
         old_task_state = task_state
 
 
+def _batch_timeout_message(resource_type, pending, status, current,
+                           timeout):
+    message = ('%s %s failed to reach %s status within the required time '
+               '(%s s). Current status: %s.' %
+               (resource_type, ', '.join(sorted(pending)), status, timeout,
+                ', '.join('%s: %s' % (resource_id, current.get(resource_id))
+                          for resource_id in sorted(pending))))
+    caller = test_utils.find_test_caller()
+    if caller:
+        message = '(%s) %s' % (caller, message)
+    return message
+
+
+def wait_for_servers_status(client, server_ids, status, ready_wait=True,
+                            raise_on_error=True, name=None):
+    """Waits for several servers to reach a given status.
+
+    The servers are checked all at once with one list_servers call per
+    poll, rather than one show_server call per server. This returns as soon
+    as all the servers reached the status, and fails as soon as one of them
+    is in ERROR.
+
+    :param client: The servers client
+    :param server_ids: The IDs of the servers to wait for
+    :param status: The status the servers should reach
+    :param ready_wait: Also wait for the servers to have no task state
+    :param raise_on_error: Raise if a server goes to ERROR status
+    :param name: Optional name filter for the list call, to list less
+                 servers when they share a name prefix
+    """
+    pending = set(server_ids)
+    params = {'name': name} if name else {}
+    current = {}
+    start_time = int(time.time())
+    intervals = polling.get_intervals(client)
+    while True:
+        resp = client.list_servers(detail=True, **params)
+        servers = dict((server['id'], server) for server in resp['servers'])
+        for server_id in sorted(pending):
+            if server_id not in servers:
+                # The listing may be paginated, show_server raises NotFound
+                # if the server doesn't exist
+                servers[server_id] = client.show_server(server_id)['server']
+            body = servers[server_id]
+            task_state = _get_task_state(body)
+            current[server_id] = '/'.join((body['status'], str(task_state)))
+            if body['status'] == status and (
+                    not ready_wait or status == 'BUILD' or task_state is None):
+                pending.discard(server_id)
+            elif body['status'] == 'ERROR' and raise_on_error:
+                if 'fault' in body:
+                    raise exceptions.BuildErrorException(body['fault'],
+                                                         server_id=server_id)
+                raise exceptions.BuildErrorException(server_id=server_id)
+        if not pending:
+            if ready_wait and status != 'BUILD':
+                time.sleep(CONF.compute.ready_wait)
+            return
+        if int(time.time()) - start_time >= client.build_timeout:
+            raise lib_exc.TimeoutException(_batch_timeout_message(
+                'Servers', pending, status, current, client.build_timeout))
+        polling.sleep(intervals, resp)
+
+
+def wait_for_servers_termination(client, server_ids, ignore_error=False):
+    """Waits for several servers to be deleted.
+
+    The servers are checked all at once with one list_servers call per poll.
+    The servers which go to ERROR don't stop the wait for the others, they
+    are reported once all the others are deleted.
+    """
+    pending = set(server_ids)
+    errors = []
+    start_time = int(time.time())
+    intervals = polling.get_intervals(client)
+    while True:
+        resp = client.list_servers(detail=True)
+        servers = dict((server['id'], server) for server in resp['servers'])
+        for server_id in sorted(pending - set(servers)):
+            # The listing may be paginated, so a server missing from it
+            # isn't necessarily deleted
+            try:
+                servers[server_id] = client.show_server(server_id)['server']
+            except lib_exc.NotFound:
+                pass
+        pending &= set(servers)
+        if not ignore_error:
+            for server_id in sorted(pending):
+                if servers[server_id]['status'] == 'ERROR':
+                    pending.remove(server_id)
+                    errors.append(server_id)
+        if not pending:
+            break
+        if int(time.time()) - start_time >= client.build_timeout:
+            raise lib_exc.TimeoutException(_batch_timeout_message(
+                'Servers', pending, 'DELETED',
+                dict((i, servers[i]['status']) for i in pending),
+                client.build_timeout))
+        polling.sleep(intervals, resp)
+    if errors:
+        raise lib_exc.DeleteErrorException(resource_id=','.join(errors))
+
+
 def wait_for_image_status(client, image_id, status):
     """Waits for an image to reach a given status.
 
@@ -149,8 +259,9 @@ def wait_for_image_status(client, image_id, status):
 
     current_status = 'An unknown status'
     start = int(time.time())
+    intervals = polling.get_intervals(client)
     while int(time.time()) - start < client.build_timeout:
-        image = show_image(image_id)
+        resp = image = show_image(image_id)
         # Compute image client returns response wrapped in 'image' element
         # which is not the case with Glance image client.
         if 'image' in image:
@@ -165,7 +276,7 @@ def wait_for_image_status(client, image_id, status):
         if current_status.lower() == 'error':
             raise exceptions.AddImageException(image_id=image_id)
 
-        time.sleep(client.build_interval)
+        polling.sleep(intervals, resp)
 
     message = ('Image %(image_id)s failed to reach %(status)s state '
                '(current state %(current_status)s) within the required '
@@ -189,13 +300,15 @@ def wait_for_volume_resource_status(client, resource_id, status):
     resource_name = re.findall(r'(Volume|Snapshot|Backup)',
                                client.__class__.__name__)[0].lower()
     show_resource = getattr(client, 'show_' + resource_name)
-    resource_status = show_resource(resource_id)[resource_name]['status']
+    resp = show_resource(resource_id)
+    resource_status = resp[resource_name]['status']
     start = int(time.time())
+    intervals = polling.get_intervals(client)
 
     while resource_status != status:
-        time.sleep(client.build_interval)
-        resource_status = show_resource(resource_id)[
-            '{}'.format(resource_name)]['status']
+        polling.sleep(intervals, resp)
+        resp = show_resource(resource_id)
+        resource_status = resp['{}'.format(resource_name)]['status']
         if resource_status == 'error' and resource_status != status:
             raise exceptions.VolumeResourceBuildErrorException(
                 resource_name=resource_name, resource_id=resource_id)
@@ -210,16 +323,60 @@ def wait_for_volume_resource_status(client, resource_id, status):
             raise lib_exc.TimeoutException(message)
 
 
+def wait_for_volumes_status(client, volume_ids, status, name=None):
+    """Waits for several volumes to reach a given status.
+
+    The volumes are checked all at once with one list_volumes call per
+    poll, rather than one show_volume call per volume. This returns as soon
+    as all the volumes reached the status, and fails as soon as one of them
+    is in error.
+
+    :param client: The volumes client
+    :param volume_ids: The IDs of the volumes to wait for
+    :param status: The status the volumes should reach
+    :param name: Optional name filter for the list call
+    """
+    pending = set(volume_ids)
+    params = {'name': name} if name else None
+    current = {}
+    start = int(time.time())
+    intervals = polling.get_intervals(client)
+    while True:
+        resp = client.list_volumes(detail=True, params=params)
+        volumes = dict((volume['id'], volume) for volume in resp['volumes'])
+        for volume_id in sorted(pending):
+            if volume_id not in volumes:
+                # The listing may be paginated, show_volume raises NotFound
+                # if the volume doesn't exist
+                volumes[volume_id] = client.show_volume(volume_id)['volume']
+            volume_status = current[volume_id] = volumes[volume_id]['status']
+            if volume_status == status:
+                pending.discard(volume_id)
+            elif volume_status == 'error':
+                raise exceptions.VolumeResourceBuildErrorException(
+                    resource_name='volume', resource_id=volume_id)
+            elif volume_status == 'error_restoring':
+                raise exceptions.VolumeRestoreErrorException(
+                    volume_id=volume_id)
+        if not pending:
+            return
+        if int(time.time()) - start >= client.build_timeout:
+            raise lib_exc.TimeoutException(_batch_timeout_message(
+                'Volumes', pending, status, current, client.build_timeout))
+        polling.sleep(intervals, resp)
+
+
 def wait_for_volume_retype(client, volume_id, new_volume_type):
     """Waits for a Volume to have a new volume type."""
-    body = client.show_volume(volume_id)['volume']
-    current_volume_type = body['volume_type']
+    resp = client.show_volume(volume_id)
+    current_volume_type = resp['volume']['volume_type']
     start = int(time.time())
+    intervals = polling.get_intervals(client)
 
     while current_volume_type != new_volume_type:
-        time.sleep(client.build_interval)
-        body = client.show_volume(volume_id)['volume']
-        current_volume_type = body['volume_type']
+        polling.sleep(intervals, resp)
+        resp = client.show_volume(volume_id)
+        current_volume_type = resp['volume']['volume_type']
 
         if int(time.time()) - start >= client.build_timeout:
             message = ('Volume %s failed to reach %s volume type (current %s) '
@@ -239,6 +396,7 @@ def wait_for_qos_operations(client, qos_id, operation, args=None):
     args = None when operation = 'disassociate-all'
     """
     start_time = int(time.time())
+    intervals = polling.get_intervals(client)
     while True:
         if operation == 'qos-key-unset':
             body = client.show_qos(qos_id)['qos_specs']
@@ -258,20 +416,21 @@ def wait_for_qos_operations(client, qos_id, operation, args=None):
 
         if int(time.time()) - start_time >= client.build_timeout:
             raise lib_exc.TimeoutException
-        time.sleep(client.build_interval)
+        polling.sleep(intervals)
 
 
 def wait_for_interface_status(client, server_id, port_id, status):
     """Waits for an interface to reach a given status."""
-    body = (client.show_interface(server_id, port_id)
-            ['interfaceAttachment'])
+    resp = client.show_interface(server_id, port_id)
+    body = resp['interfaceAttachment']
     interface_status = body['port_state']
     start = int(time.time())
+    intervals = polling.get_intervals(client)
 
     while(interface_status != status):
-        time.sleep(client.build_interval)
-        body = (client.show_interface(server_id, port_id)
-                ['interfaceAttachment'])
+        polling.sleep(intervals, resp)
+        resp = client.show_interface(server_id, port_id)
+        body = resp['interfaceAttachment']
         interface_status = body['port_state']
 
         timed_out = int(time.time()) - start >= client.build_timeout
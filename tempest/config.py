@@ -112,6 +112,32 @@ AuthGroup = [
                help="Admin domain name for authentication (Keystone V3)."
                     "The same domain applies to user and project",
                deprecated_group='identity'),
+    cfg.IntOpt('dynamic_credentials_pool_size',
+               default=0,
+               help="Number of project, user and network sets created ahead "
+                    "of time, in the background, by each test process when "
+                    "use_dynamic_credentials is True. Primary and alt "
+                    "credentials are then taken from this pool instead of "
+                    "being created when a test class starts. 0 disables the "
+                    "pool."),
+    cfg.BoolOpt('dynamic_credentials_pool_recycle',
+                default=False,
+                help="Reuse the credential sets of the pool once a test "
+                     "class is done with them, instead of deleting them "
+                     "when the test process ends. Resources leaked by a "
+                     "test class are then visible to later test classes."),
+    cfg.BoolOpt('token_cache',
+                default=False,
+                help="Share tokens between the auth providers of a test "
+                     "process which use the same credentials and scope, "
+                     "instead of requesting a new token for each of them. "
+                     "Tokens are used until they are about to expire."),
+    cfg.StrOpt('token_cache_dir',
+               help="Directory where cached tokens are stored, so that they "
+                    "are also shared between test processes. Only used "
+                    "when token_cache is True. The directory should only be "
+                    "accessible to the user running Tempest. If not set, "
+                    "tokens are only shared within each process."),
 ]
 
 identity_group = cfg.OptGroup(name='identity',
@@ -197,6 +223,36 @@ ServiceClientsGroup = [
                default=60,
                help='Timeout in seconds to wait for the http request to '
                     'return'),
+    cfg.BoolOpt('http_keep_alive',
+                default=False,
+                help='Reuse HTTP connections across requests. When enabled, '
+                     'all service clients in a process share one keep-alive '
+                     'connection pool per endpoint, instead of opening a '
+                     'new connection (and TLS session) for every request.'),
+    cfg.IntOpt('http_pool_maxsize',
+               default=10,
+               help='Maximum number of connections kept open per endpoint '
+                    'when http_keep_alive is enabled.'),
+    cfg.IntOpt('http_pool_idle_timeout',
+               default=60,
+               help='Time in seconds after which the connections to an '
+                    'endpoint which has not been used are closed, when '
+                    'http_keep_alive is enabled. 0 disables idle eviction.'),
+    cfg.BoolOpt('polling_backoff',
+                default=False,
+                help='When waiting for resources, check their status often '
+                     'at first and then less and less often, with '
+                     'exponential backoff, instead of checking every '
+                     'build_interval seconds. A Retry-After header sent by '
+                     'the service is always honoured.'),
+    cfg.FloatOpt('polling_initial_interval',
+                 default=0.2,
+                 help='Time in seconds before the first status check when '
+                      'polling_backoff is enabled.'),
+    cfg.FloatOpt('polling_max_interval',
+                 default=10,
+                 help='Maximum time in seconds between two status checks '
+                      'when polling_backoff is enabled.'),
 ]
 
 identity_feature_group = cfg.OptGroup(name='identity-feature-enabled',
@@ -1230,6 +1286,15 @@ class TempestConfigProxy(object):
             logging.getLogger(name).logger.setLevel(level)
 
     def __getattr__(self, attr):
+        self.load()
+        return getattr(self._config, attr)
+
+    def load(self):
+        """Parse the configuration, if it isn't parsed yet
+
+        The configuration is otherwise parsed the first time one of its
+        options is accessed.
+        """
         if not self._config:
             self._fix_log_levels()
             lock_dir = os.path.join(tempfile.gettempdir(), 'tempest-lock')
@@ -1251,8 +1316,6 @@ class TempestConfigProxy(object):
             # discover tests from plugins.
             plugins.TempestTestPluginManager()._register_service_clients()
 
-        return getattr(self._config, attr)
-
     def set_config_path(self, path):
         self._path = path
 
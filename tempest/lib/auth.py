@@ -15,9 +15,14 @@
 #    under the License.
 
 import abc
-import copy
 import datetime
+import functools
+import hashlib
+import json
+import os
 import re
+import tempfile
+import threading
 
 from oslo_log import log as logging
 import six
@@ -31,6 +36,11 @@ ISO8601_FLOAT_SECONDS = '%Y-%m-%dT%H:%M:%S.%fZ'
 ISO8601_INT_SECONDS = '%Y-%m-%dT%H:%M:%SZ'
 LOG = logging.getLogger(__name__)
 
+_MULTIPLE_SLASHES = re.compile("/{2,}")
+
+_SHARED_TOKEN_CACHES = {}
+_SHARED_TOKEN_CACHES_LOCK = threading.Lock()
+
 
 def replace_version(url, new_version):
     parts = urlparse.urlparse(url)
@@ -65,6 +75,36 @@ def apply_url_filters(url, filters):
     return url
 
 
+def cached_base_url(base_url):
+    """Memoize the base URLs of a KeystoneAuthProvider
+
+    Decorates the `base_url` method of a provider, so that the base URLs for
+    the auth data cached by the provider are looked up in the catalog once
+    per set of filters, and reused until the token is rotated. The lookups
+    for other auth data, e.g. from set_alt_auth_data, are not memoized.
+    """
+    @functools.wraps(base_url)
+    def wrapper(self, filters, auth_data=None):
+        if auth_data is None:
+            auth_data = self.get_auth()
+        if auth_data is not self.cache:
+            return base_url(self, filters, auth_data)
+        if self._base_urls_auth_data is not auth_data:
+            self._base_urls = {}
+            self._base_urls_auth_data = auth_data
+        try:
+            key = tuple(sorted(filters.items()))
+            url = self._base_urls.get(key)
+        except TypeError:
+            # Filters with unhashable values are not memoized
+            return base_url(self, filters, auth_data)
+        if url is None:
+            url = base_url(self, filters, auth_data)
+            self._base_urls[key] = url
+        return url
+    return wrapper
+
+
 @six.add_metaclass(abc.ABCMeta)
 class AuthProvider(object):
     """Provide authentication"""
@@ -258,10 +298,19 @@ class KeystoneAuthProvider(AuthProvider):
 
     token_expiry_threshold = datetime.timedelta(seconds=60)
 
+    # Last parsed token expiry, as (expiry string, datetime)
+    _parsed_expiry = (None, None)
+    # Base URLs found in the catalog of the cached auth data, by filters,
+    # see cached_base_url
+    _base_urls = None
+    _base_urls_auth_data = None
+
     def __init__(self, credentials, auth_url,
                  disable_ssl_certificate_validation=None,
                  ca_certs=None, trace_requests=None, scope='project',
-                 http_timeout=None):
+                 http_timeout=None, token_cache=None):
+        self.token_cache = token_cache
+        self._token_cache_key = None
         super(KeystoneAuthProvider, self).__init__(credentials, scope)
         self.dscv = disable_ssl_certificate_validation
         self.ca_certs = ca_certs
@@ -270,6 +319,43 @@ class KeystoneAuthProvider(AuthProvider):
         self.auth_url = auth_url
         self.auth_client = self._auth_client(auth_url)
 
+    def set_auth(self):
+        """Forces setting auth.
+
+        Ignores the auth provider cache. If a token cache is used, a token
+        obtained for the same credentials and scope by another auth provider
+        is reused, unless it is expired.
+        """
+        if self.token_cache is None:
+            return super(KeystoneAuthProvider, self).set_auth()
+        if self._token_cache_key is None:
+            # NOTE: the key is computed from the credentials as provided,
+            # before they are filled in with the details from the token.
+            self._token_cache_key = self._get_token_cache_key()
+        auth_data = self.token_cache.get(self._token_cache_key)
+        if auth_data is None or self.is_expired(auth_data):
+            auth_data = self._get_auth()
+            self.token_cache.set(self._token_cache_key, auth_data)
+        self.cache = auth_data
+        self._fill_credentials(self.cache[1])
+
+    def clear_auth(self):
+        """Clear access cache
+
+        The token of the auth provider is removed from the token cache too,
+        if one is used.
+        """
+        if self.token_cache is not None and self._token_cache_key:
+            self.token_cache.delete(self._token_cache_key)
+            self._token_cache_key = None
+        super(KeystoneAuthProvider, self).clear_auth()
+
+    def _get_token_cache_key(self):
+        key = dict(self._auth_params(), auth_class=type(self).__name__,
+                   auth_url=self.auth_url, scope=self.scope)
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
     def _decorate_request(self, filters, method, url, headers=None, body=None,
                           auth_data=None):
         if auth_data is None:
@@ -278,16 +364,18 @@ class KeystoneAuthProvider(AuthProvider):
         base_url = self.base_url(filters=filters, auth_data=auth_data)
         # build authenticated request
         # returns new request, it does not touch the original values
-        _headers = copy.deepcopy(headers) if headers is not None else {}
+        # NOTE: header values are strings, so a shallow copy is enough
+        _headers = dict(headers) if headers is not None else {}
         _headers['X-Auth-Token'] = str(token)
         if url is None or url == "":
             _url = base_url
         else:
             # Join base URL and url, and remove multiple contiguous slashes
             _url = "/".join([base_url, url])
-            parts = [x for x in urlparse.urlparse(_url)]
-            parts[2] = re.sub("/{2,}", "/", parts[2])
-            _url = urlparse.urlunparse(parts)
+            if '//' in _url.partition('://')[2]:
+                parts = [x for x in urlparse.urlparse(_url)]
+                parts[2] = _MULTIPLE_SLASHES.sub("/", parts[2])
+                _url = urlparse.urlunparse(parts)
         # no change to method or body
         return str(_url), _headers, body
 
@@ -314,6 +402,9 @@ class KeystoneAuthProvider(AuthProvider):
         return token, auth_data
 
     def _parse_expiry_time(self, expiry_string):
+        # The same token is checked for expiry on every request
+        if self._parsed_expiry[0] == expiry_string:
+            return self._parsed_expiry[1]
         expiry = None
         for date_format in self.EXPIRY_DATE_FORMATS:
             try:
@@ -326,6 +417,7 @@ class KeystoneAuthProvider(AuthProvider):
                 "time data '{data}' does not match any of the"
                 "expected formats: {formats}".format(
                     data=expiry_string, formats=self.EXPIRY_DATE_FORMATS))
+        self._parsed_expiry = (expiry_string, expiry)
         return expiry
 
     def get_token(self):
@@ -370,6 +462,7 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_id is None:
             self.credentials.user_id = user['id']
 
+    @cached_base_url
     def base_url(self, filters, auth_data=None):
         """Base URL from catalog
 
@@ -499,6 +592,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_domain_name is None:
             self.credentials.user_domain_name = user['domain']['name']
 
+    @cached_base_url
     def base_url(self, filters, auth_data=None):
         """Base URL from catalog
 
@@ -593,6 +687,90 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
                 datetime.datetime.utcnow())
 
 
+class TokenCache(object):
+    """Cache of auth data, shared by auth providers
+
+    Auth data is stored by key, as computed by the auth providers from their
+    credentials and scope. Expiry is checked by the auth providers when
+    reading from the cache.
+
+    If a directory is provided, auth data is also stored in that directory,
+    one file per key, so that it can be shared by several processes.
+
+    :param directory: optional directory to store auth data into. It is
+                      created if it does not exist.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._auth_data = {}
+        self._lock = threading.Lock()
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory, 0o700)
+            except OSError:
+                # Created by a concurrent process
+                if not os.path.isdir(directory):
+                    raise
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Return the auth data stored for key, or None"""
+        with self._lock:
+            auth_data = self._auth_data.get(key)
+        if auth_data is None and self.directory:
+            try:
+                with open(self._path(key)) as f:
+                    token, body = json.load(f)
+            except (IOError, OSError, ValueError, TypeError):
+                return None
+            auth_data = (token, body)
+            with self._lock:
+                self._auth_data[key] = auth_data
+        return auth_data
+
+    def set(self, key, auth_data):
+        """Store auth data, a (token, auth_data body) tuple, for key"""
+        with self._lock:
+            self._auth_data[key] = auth_data
+        if self.directory:
+            # Write to a temporary file and rename it, so that other
+            # processes never read a partial file
+            fd, path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(list(auth_data), f)
+                os.rename(path, self._path(key))
+            except Exception:
+                os.remove(path)
+                raise
+
+    def delete(self, key):
+        """Remove the auth data stored for key, if any"""
+        with self._lock:
+            self._auth_data.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+def get_shared_token_cache(directory=None):
+    """Return the process-wide token cache for a directory
+
+    All callers in a process asking for the same directory, or for no
+    directory, get the same `TokenCache` instance.
+    """
+    key = (os.getpid(), directory)
+    with _SHARED_TOKEN_CACHES_LOCK:
+        if key not in _SHARED_TOKEN_CACHES:
+            _SHARED_TOKEN_CACHES[key] = TokenCache(directory=directory)
+        return _SHARED_TOKEN_CACHES[key]
+
+
 def is_identity_version_supported(identity_version):
     return identity_version in IDENTITY_VERSION
 
@@ -0,0 +1,116 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""asyncio access to the service clients
+
+This module is only available on Python 3.
+"""
+
+import asyncio
+from concurrent import futures
+import functools
+
+from tempest.lib.common.utils import test_utils
+
+
+class AsyncServiceClient(object):
+    """Wraps a service client so that its API calls can be awaited
+
+    Each public method of the wrapped client returns an asyncio future
+    rather than blocking. The calls are run by the wrapped client itself, in
+    a thread pool which bounds the number of requests in flight, so the auth
+    provider, error checking and response validation are the ones of the
+    synchronous client. Other attributes are returned unchanged.
+
+    Several wrapped clients can share the same concurrency limit by sharing
+    the executor.
+
+    Example::
+
+        servers = AsyncServiceClient(os_primary.servers_client,
+                                     max_concurrency=10)
+        bodies = loop.run_until_complete(asyncio.gather(
+            *[servers.show_server(i) for i in ids]))
+
+    :param client: A `RestClient` based service client
+    :param max_concurrency: Maximum number of concurrent API calls. Ignored
+        if an executor is provided.
+    :param executor: An optional `concurrent.futures.Executor` to run the
+        calls in.
+    :param loop: The asyncio event loop that the futures belong to. Defaults
+        to the current event loop at the time of the call.
+    """
+
+    def __init__(self, client, max_concurrency=10, executor=None, loop=None):
+        self._client = client
+        self._own_executor = executor is None
+        self._executor = executor or futures.ThreadPoolExecutor(
+            max_workers=max_concurrency)
+        self._loop = loop
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            loop = self._loop or asyncio.get_event_loop()
+            return loop.run_in_executor(
+                self._executor,
+                _with_caller(test_utils.get_test_caller(),
+                             functools.partial(attr, *args, **kwargs)))
+        return call
+
+    def close(self):
+        """Shut down the thread pool, if it was created by this wrapper"""
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _with_caller(caller_name, func):
+    # Requests run in a worker thread are logged with the test which made
+    # the call, rather than with whatever the stack of the worker shows.
+    def run():
+        test_utils.set_test_caller(caller_name)
+        try:
+            return func()
+        finally:
+            test_utils.set_test_caller(None)
+    return run
+
+
+def run_concurrently(calls, max_concurrency=10):
+    """Run API calls concurrently from synchronous code
+
+    :param calls: An iterable of callables taking no arguments, for instance
+        `functools.partial(servers_client.show_server, server_id)`.
+    :param max_concurrency: Maximum number of calls in flight at any time.
+    :return: The list of the results, in the same order as `calls`.
+    :raise: The exception raised by the first failed call, in the order of
+        `calls`, after all of them have completed.
+    """
+    caller_name = test_utils.get_test_caller()
+    with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = [executor.submit(_with_caller(caller_name, call))
+                   for call in calls]
+        futures.wait(pending)
+    return [future.result() for future in pending]
@@ -13,14 +13,28 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import os
+import threading
+import time
+
 import six
 import urllib3
 
+# Shared keep-alive pools, keyed by process and connection settings
+_SHARED_HTTP = {}
+_SHARED_HTTP_LOCK = threading.Lock()
+
 
 class ClosingHttp(urllib3.poolmanager.PoolManager):
+
+    # Value of the connection header forced on every request. Subclasses
+    # which want to reuse connections set this to None.
+    connection_header = 'close'
+
     def __init__(self, disable_ssl_certificate_validation=False,
-                 ca_certs=None, timeout=None):
-        kwargs = {}
+                 ca_certs=None, timeout=None, **pool_kwargs):
+        kwargs = dict(pool_kwargs)
 
         if disable_ssl_certificate_validation:
             urllib3.disable_warnings()
@@ -49,13 +63,170 @@ class ClosingHttp(urllib3.poolmanager.PoolManager):
                 self.version = info.version
                 self['content-location'] = url
 
-        original_headers = kwargs.get('headers', {})
-        new_headers = dict(original_headers, connection='close')
-        new_kwargs = dict(kwargs, headers=new_headers)
+        stream = kwargs.pop('stream', False)
+        new_kwargs = kwargs
+        if self.connection_header:
+            original_headers = kwargs.get('headers', {})
+            new_headers = dict(original_headers,
+                               connection=self.connection_header)
+            new_kwargs = dict(kwargs, headers=new_headers)
 
         # Follow up to 5 redirections. Don't raise an exception if
         # it's exceeded but return the HTTP 3XX response instead.
         retry = urllib3.util.Retry(raise_on_redirect=False, redirect=5)
         r = super(ClosingHttp, self).request(method, url, retries=retry,
+                                             preload_content=not stream,
                                              *args, **new_kwargs)
+        if stream:
+            return Response(r), StreamingBody(r)
         return Response(r), r.data
+
+
+class StreamingBody(object):
+    """File-like access to a response body which is read on demand
+
+    The body is read from the connection as the caller consumes it, either
+    through `read` or by iterating over it in chunks of `chunk_size` bytes,
+    so that large downloads never have to be held in memory. Checksums of
+    the data read so far are updated incrementally, for each algorithm in
+    `checksums`; further algorithms can be added with `add_checksum` before
+    the body is read.
+
+    The connection is released once the body has been fully read, or when
+    the body is closed.
+    """
+
+    DEFAULT_CHECKSUMS = ('md5',)
+
+    def __init__(self, response, chunk_size=65536, checksums=None):
+        self._response = response
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._checksums = {}
+        self._closed = False
+        self._exhausted = False
+        if checksums is None:
+            checksums = self.DEFAULT_CHECKSUMS
+        for algorithm in checksums:
+            self.add_checksum(algorithm)
+
+    def add_checksum(self, algorithm):
+        """Compute the checksum of the body with an extra algorithm
+
+        :param algorithm: Name of an algorithm supported by hashlib
+        :raise ValueError: if part of the body has already been read
+        """
+        if self.bytes_read:
+            raise ValueError('Cannot add a checksum once the body has been '
+                             'read')
+        self._checksums.setdefault(algorithm, hashlib.new(algorithm))
+
+    def hexdigest(self, algorithm='md5'):
+        """Return the checksum of the data read so far
+
+        :raise KeyError: if the checksum is not computed for the algorithm
+        """
+        return self._checksums[algorithm].hexdigest()
+
+    def read(self, amt=None):
+        """Read up to `amt` bytes, or the rest of the body if not set"""
+        if self._closed:
+            return b''
+        data = self._response.read(amt)
+        if data:
+            self.bytes_read += len(data)
+            for checksum in self._checksums.values():
+                checksum.update(data)
+        if not data or amt is None:
+            self._exhausted = True
+            self.close()
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        """Release the connection, discarding any unread data"""
+        if not self._closed:
+            self._closed = True
+            if not self._exhausted:
+                # Unread data left on the connection would be returned to
+                # the next request using it, so close it rather than reuse it
+                self._response.close()
+            self._response.release_conn()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return '<StreamingBody: %d bytes read>' % self.bytes_read
+
+
+class KeepAliveHttp(ClosingHttp):
+    """Pool manager which keeps connections open between requests
+
+    urllib3 keeps one connection pool per endpoint (scheme, host and port),
+    each holding up to `maxsize` open connections. Pools which have not been
+    used for more than `idle_timeout` seconds are closed and rebuilt on the
+    next request, so that connections already dropped by the server side are
+    not handed out.
+    """
+
+    connection_header = None
+
+    def __init__(self, disable_ssl_certificate_validation=False,
+                 ca_certs=None, timeout=None, maxsize=10, idle_timeout=60,
+                 num_pools=50):
+        dscv = disable_ssl_certificate_validation
+        super(KeepAliveHttp, self).__init__(
+            disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+            timeout=timeout, num_pools=num_pools, maxsize=maxsize)
+        self.idle_timeout = idle_timeout
+        self._last_used = {}
+
+    def connection_from_pool_key(self, pool_key, *args, **kwargs):
+        # The other arguments, like request_context in the newer releases
+        # of urllib3, are passed through as is
+        now = time.time()
+        with self.pools.lock:
+            last_used = self._last_used.get(pool_key)
+            if (self.idle_timeout and last_used is not None and
+                    now - last_used > self.idle_timeout and
+                    pool_key in self.pools):
+                # Dropping the pool from the container closes all its
+                # connections; a fresh one is built below.
+                del self.pools[pool_key]
+            self._last_used[pool_key] = now
+            return super(KeepAliveHttp, self).connection_from_pool_key(
+                pool_key, *args, **kwargs)
+
+
+def get_shared_http(disable_ssl_certificate_validation=False, ca_certs=None,
+                    timeout=None, maxsize=10, idle_timeout=60):
+    """Return the process-wide keep-alive pool manager for a set of settings
+
+    All callers asking for the same connection settings get the same
+    `KeepAliveHttp` instance, so that connections to each endpoint are
+    reused across service clients. Pools are never shared between processes,
+    since sockets inherited over a fork cannot be safely reused.
+    """
+    key = (os.getpid(), bool(disable_ssl_certificate_validation), ca_certs,
+           timeout, maxsize, idle_timeout)
+    with _SHARED_HTTP_LOCK:
+        if key not in _SHARED_HTTP:
+            dscv = disable_ssl_certificate_validation
+            _SHARED_HTTP[key] = KeepAliveHttp(
+                disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+                timeout=timeout, maxsize=maxsize, idle_timeout=idle_timeout)
+        return _SHARED_HTTP[key]
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
+
 import jsonschema
 from oslo_utils import timeutils
 
@@ -37,3 +40,39 @@ def _validate_datetime_format(instance):
         return False
     else:
         return True
+
+
+# Compiled validators, keyed by the id of their schema, least recently used
+# first. The schema itself is stored along with the validator, which keeps it
+# alive, so that its id cannot be reused by a different schema while the entry
+# exists. The cache is bounded, since some schemas are built dynamically, e.g.
+# deep copies of the static ones.
+_VALIDATORS = collections.OrderedDict()
+_VALIDATORS_LOCK = threading.Lock()
+_MAX_VALIDATORS = 512
+
+
+def get_validator(schema):
+    """Return a validator for a schema, building it only once per process
+
+    Response schemas are static dicts, so the schema check and the validator
+    are done once per schema object rather than once per validated response.
+    Only the validators of the `_MAX_VALIDATORS` most recently used schemas
+    are kept.
+
+    :param schema: The JSON schema, as a dict
+    :raise jsonschema.SchemaError: if the schema is invalid
+    :return: A JSONSCHEMA_VALIDATOR instance which uses FORMAT_CHECKER
+    """
+    with _VALIDATORS_LOCK:
+        cached = _VALIDATORS.pop(id(schema), None)
+        if cached is not None and cached[0] is schema:
+            _VALIDATORS[id(schema)] = cached
+            return cached[1]
+    JSONSCHEMA_VALIDATOR.check_schema(schema)
+    validator = JSONSCHEMA_VALIDATOR(schema, format_checker=FORMAT_CHECKER)
+    with _VALIDATORS_LOCK:
+        _VALIDATORS[id(schema)] = (schema, validator)
+        while len(_VALIDATORS) > _MAX_VALIDATORS:
+            _VALIDATORS.popitem(last=False)
+    return validator
@@ -0,0 +1,125 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Polling strategies used when waiting for a resource to change status"""
+
+import email.utils
+import random
+import time
+
+
+class PollingStrategy(object):
+    """Base class for polling strategies
+
+    A polling strategy defines the time to wait between two consecutive
+    checks of the status of a resource. It holds no state, the same strategy
+    can be used by several waiters at the same time.
+    """
+
+    def intervals(self):
+        """Return an iterator over the times to wait between checks"""
+        raise NotImplementedError
+
+
+class FixedInterval(PollingStrategy):
+    """Wait the same time between all checks
+
+    :param interval: Time in seconds between two checks
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def intervals(self):
+        while True:
+            yield self.interval
+
+
+class ExponentialBackoff(PollingStrategy):
+    """Check often at first, then less and less often
+
+    The time between two checks starts at `initial_interval` and is
+    multiplied by `factor` after each check, up to `max_interval`. A random
+    jitter is applied to each interval, so that waiters started at the same
+    time do not keep checking at the same time.
+
+    :param initial_interval: Time in seconds before the first check
+    :param max_interval: Maximum time in seconds between two checks
+    :param factor: Growth factor of the interval after each check
+    :param jitter: Maximum relative variation applied to each interval,
+                   for instance 0.1 for plus or minus 10%
+    """
+
+    def __init__(self, initial_interval=0.2, max_interval=10, factor=2.0,
+                 jitter=0.1):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.jitter = jitter
+
+    def intervals(self):
+        interval = self.initial_interval
+        while True:
+            yield interval * (1 + random.uniform(-self.jitter, self.jitter))
+            interval = min(interval * self.factor, self.max_interval)
+
+
+def get_intervals(client):
+    """Return the polling intervals to use with a service client
+
+    The `polling_strategy` of the client is used if it has one, otherwise
+    the client is polled every `build_interval` seconds.
+    """
+    strategy = getattr(client, 'polling_strategy', None)
+    if not isinstance(strategy, PollingStrategy):
+        strategy = FixedInterval(client.build_interval)
+    return strategy.intervals()
+
+
+def retry_after(response):
+    """Time in seconds requested by the Retry-After header of a response
+
+    :param response: Response headers, a dict with lower case keys
+    :return: The delay in seconds, or None if the response has no valid
+             Retry-After header
+    """
+    if not isinstance(response, dict):
+        return None
+    value = response.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(email.utils.mktime_tz(date) - time.time(), 0)
+
+
+def sleep(intervals, body=None):
+    """Wait for the next polling interval
+
+    :param intervals: Iterator returned by `get_intervals`
+    :param body: Optional body returned by the last check. If the service
+                 asked to retry later than the next interval via the
+                 Retry-After header, that delay is honoured.
+    """
+    interval = next(intervals)
+    delay = retry_after(getattr(body, 'response', None))
+    if delay is not None:
+        interval = max(interval, delay)
+    time.sleep(interval)
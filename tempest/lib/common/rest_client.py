@@ -27,6 +27,7 @@ from six.moves import urllib
 
 from tempest.lib.common import http
 from tempest.lib.common import jsonschema_validator
+from tempest.lib.common import polling
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions
 
@@ -69,6 +70,16 @@ class RestClient(object):
                               of the request and response payload
     :param str http_timeout: Timeout in seconds to wait for the http request to
                              return
+    :param bool keep_alive: Set to true to send requests through the
+                            process-wide keep-alive connection pool instead
+                            of opening a new connection for every request
+    :param int pool_maxsize: Number of connections kept open per endpoint
+                             when keep_alive is set
+    :param int pool_idle_timeout: Time in seconds after which an unused
+                                  endpoint pool is closed when keep_alive is
+                                  set
+    :param polling_strategy: A `polling.PollingStrategy` used by wait loops
+                             instead of polling every build_interval seconds
     """
 
     # The version of the API this client implements
@@ -80,7 +91,9 @@ class RestClient(object):
                  endpoint_type='publicURL',
                  build_interval=1, build_timeout=60,
                  disable_ssl_certificate_validation=False, ca_certs=None,
-                 trace_requests='', name=None, http_timeout=None):
+                 trace_requests='', name=None, http_timeout=None,
+                 keep_alive=False, pool_maxsize=10, pool_idle_timeout=60,
+                 polling_strategy=None):
         self.auth_provider = auth_provider
         self.service = service
         self.region = region
@@ -88,6 +101,7 @@ class RestClient(object):
         self.endpoint_type = endpoint_type
         self.build_interval = build_interval
         self.build_timeout = build_timeout
+        self.polling_strategy = polling_strategy
         self.trace_requests = trace_requests
 
         self._skip_path = False
@@ -100,9 +114,15 @@ class RestClient(object):
                                        'retry-after', 'server',
                                        'vary', 'www-authenticate'))
         dscv = disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
-            timeout=http_timeout)
+        if keep_alive:
+            self.http_obj = http.get_shared_http(
+                disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+                timeout=http_timeout, maxsize=pool_maxsize,
+                idle_timeout=pool_idle_timeout)
+        else:
+            self.http_obj = http.ClosingHttp(
+                disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+                timeout=http_timeout)
 
     def get_headers(self, accept_type=None, send_type=None):
         """Return the default headers which will be used with outgoing requests
@@ -269,7 +289,7 @@ class RestClient(object):
         """
         return self.request('POST', url, extra_headers, headers, body, chunked)
 
-    def get(self, url, headers=None, extra_headers=False):
+    def get(self, url, headers=None, extra_headers=False, stream=False):
         """Send a HTTP GET request using keystone service catalog and auth
 
         :param str url: the relative url to send the post request to
@@ -278,10 +298,17 @@ class RestClient(object):
                                    returned by the get_headers() method are to
                                    be used but additional headers are needed in
                                    the request pass them in as a dict.
+        :param bool stream: return the body as a `http.StreamingBody` which is
+                            read on demand, instead of loading it in memory
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
         :rtype: tuple
         """
+        if stream:
+            # NOTE: only pass stream when set, for the benefit of subclasses
+            # overriding request without it
+            return self.request('GET', url, extra_headers, headers,
+                                stream=True)
         return self.request('GET', url, extra_headers, headers)
 
     def delete(self, url, headers=None, body=None, extra_headers=False):
@@ -398,8 +425,10 @@ class RestClient(object):
             return text
 
     def _log_request_start(self, method, req_url):
-        caller_name = test_utils.find_test_caller()
-        if self.trace_requests and re.search(self.trace_requests, caller_name):
+        if not self.trace_requests:
+            return
+        caller_name = test_utils.get_test_caller()
+        if re.search(self.trace_requests, caller_name):
             self.LOG.debug('Starting Request (%s): %s %s', caller_name,
                            method, req_url)
 
@@ -435,7 +464,7 @@ class RestClient(object):
         # we're going to just provide work around on who is actually
         # providing timings by gracefully adding no content if they don't.
         # Once we're down to 1 caller, clean this up.
-        caller_name = test_utils.find_test_caller()
+        caller_name = test_utils.get_test_caller()
         if secs:
             secs = " %.3fs" % secs
         self.LOG.info(
@@ -526,7 +555,8 @@ class RestClient(object):
         if method != 'HEAD' and not resp_body and resp.status >= 400:
             self.LOG.warning("status >= 400 response with empty body")
 
-    def _request(self, method, url, headers=None, body=None, chunked=False):
+    def _request(self, method, url, headers=None, body=None, chunked=False,
+                 stream=False):
         """A simple HTTP request interface."""
         # Authenticate the request with the auth provider
         req_url, req_headers, req_body = self.auth_provider.auth_request(
@@ -537,8 +567,13 @@ class RestClient(object):
         self._log_request_start(method, req_url)
         resp, resp_body = self.raw_request(
             req_url, method, headers=req_headers, body=req_body,
-            chunked=chunked
+            chunked=chunked, stream=stream
         )
+        if stream and (resp.status >= 400 or method.upper() == 'HEAD' or
+                       resp.status in (204, 205, 304)):
+            # NOTE: error responses and responses which should not have a
+            # body are small, and they are checked as usual.
+            resp_body = resp_body.read()
         end = time.time()
         self._log_request(method, req_url, resp, secs=(end - start),
                           req_headers=req_headers, req_body=req_body,
@@ -549,7 +584,8 @@ class RestClient(object):
 
         return resp, resp_body
 
-    def raw_request(self, url, method, headers=None, body=None, chunked=False):
+    def raw_request(self, url, method, headers=None, body=None, chunked=False,
+                    stream=False):
         """Send a raw HTTP request without the keystone catalog or auth
 
         This method sends a HTTP request in the same manner as the request()
@@ -563,17 +599,22 @@ class RestClient(object):
                             the headers
         :param str body: Body to send with the request
         :param bool chunked: sends the body with chunked encoding
+        :param bool stream: return the body as a `http.StreamingBody` which is
+                            read on demand, instead of loading it in memory
         :rtype: tuple
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
         """
         if headers is None:
             headers = self.get_headers()
+        kwargs = {}
+        if stream:
+            kwargs['stream'] = True
         return self.http_obj.request(url, method, headers=headers,
-                                     body=body, chunked=chunked)
+                                     body=body, chunked=chunked, **kwargs)
 
     def request(self, method, url, extra_headers=False, headers=None,
-                body=None, chunked=False):
+                body=None, chunked=False, stream=False):
         """Send a HTTP request with keystone auth and using the catalog
 
         This method will send an HTTP request using keystone auth in the
@@ -600,6 +641,10 @@ class RestClient(object):
                              explicitly requires no headers use an empty dict.
         :param str body: Body to send with the request
         :param bool chunked: sends the body with chunked encoding
+        :param bool stream: return the body of successful responses as a
+                            `http.StreamingBody` which is read on demand,
+                            instead of loading it in memory. The caller must
+                            read or close it to release the connection.
         :rtype: tuple
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
@@ -641,7 +686,8 @@ class RestClient(object):
                 headers = self.get_headers()
 
         resp, resp_body = self._request(method, url, headers=headers,
-                                        body=body, chunked=chunked)
+                                        body=body, chunked=chunked,
+                                        stream=stream)
 
         while (resp.status == 413 and
                'retry-after' in resp and
@@ -655,7 +701,8 @@ class RestClient(object):
             )
             time.sleep(delay)
             resp, resp_body = self._request(method, url,
-                                            headers=headers, body=body)
+                                            headers=headers, body=body,
+                                            stream=stream)
         self._error_checker(resp, resp_body)
         return resp, resp_body
 
@@ -857,6 +904,7 @@ class RestClient(object):
                                   resource still hasn't been deleted
         """
         start_time = int(time.time())
+        intervals = polling.get_intervals(self)
         while True:
             if self.is_resource_deleted(id):
                 return
@@ -869,7 +917,7 @@ class RestClient(object):
                 if caller:
                     message = '(%s) %s' % (caller, message)
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            polling.sleep(intervals)
 
     def is_resource_deleted(self, id):
         """Subclasses override with specific deletion detection."""
@@ -896,9 +944,8 @@ class RestClient(object):
             body_schema = schema.get('response_body')
             if body_schema:
                 try:
-                    jsonschema.validate(body, body_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    jsonschema_validator.get_validator(
+                        body_schema).validate(body)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response body is invalid (%s)" % ex)
                     raise exceptions.InvalidHTTPResponseBody(msg)
@@ -911,9 +958,8 @@ class RestClient(object):
             header_schema = schema.get('response_header')
             if header_schema:
                 try:
-                    jsonschema.validate(resp, header_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    jsonschema_validator.get_validator(
+                        header_schema).validate(resp)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response header is invalid (%s)" % ex)
                     raise exceptions.InvalidHTTPResponseHeader(msg)
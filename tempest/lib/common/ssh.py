@@ -16,6 +16,7 @@
 
 import select
 import socket
+import threading
 import time
 import warnings
 
@@ -37,13 +38,19 @@ class Client(object):
 
     def __init__(self, host, username, password=None, timeout=300, pkey=None,
                  channel_timeout=10, look_for_keys=False, key_filename=None,
-                 port=22, proxy_client=None):
+                 port=22, proxy_client=None, buf_size=32768,
+                 window_size=None):
         """SSH client.
 
         Many of parameters are just passed to the underlying implementation
         as it is.  See the paramiko documentation for more details.
         http://docs.paramiko.org/en/2.1/api/client.html#paramiko.client.SSHClient.connect
 
+        The client keeps its ssh connection open, and runs each command in a
+        new channel of it. The connection is opened again if it was lost.
+        It is closed with ``close()``, or when leaving the client used as a
+        context manager.
+
         :param host: Host to login.
         :param username: SSH username.
         :param password: SSH password, or a password to unlock private key.
@@ -60,6 +67,11 @@ class Client(object):
             for ssh-over-ssh.  The default is None, which means
             not to use ssh-over-ssh.
         :type proxy_client: ``tempest.lib.common.ssh.Client`` object
+        :param buf_size: Maximum number of bytes read from the channel at
+            once.  Default is 32768 bytes.
+        :param window_size: Size in bytes of the window of the channels,
+            which bounds the output the server can send before it is read.
+            The default is None, which means the paramiko default.
         """
         self.host = host
         self.username = username
@@ -73,9 +85,26 @@ class Client(object):
         self.key_filename = key_filename
         self.timeout = int(timeout)
         self.channel_timeout = float(channel_timeout)
-        self.buf_size = 1024
+        self.buf_size = int(buf_size)
+        self.window_size = window_size
         self.proxy_client = proxy_client
         self._proxy_conn = None
+        self._ssh = None
+        self._ssh_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the ssh connection of the client, if it is open"""
+        with self._ssh_lock:
+            if self._ssh is not None:
+                self._ssh.close()
+                self._ssh = None
+            self._proxy_conn = None
 
     def _get_ssh_connection(self, sleep=1.5, backoff=1):
         """Returns an ssh connection to the specified host."""
@@ -127,6 +156,45 @@ class Client(object):
                             self.username, self.host, e, attempts, bsleep)
                 time.sleep(bsleep)
 
+    def _is_alive(self, ssh):
+        transport = ssh.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except (EOFError, socket.error, paramiko.SSHException):
+            return False
+        return True
+
+    def _get_connection(self):
+        """Returns the ssh connection of the client, connecting if needed"""
+        with self._ssh_lock:
+            if self._ssh is not None and not self._is_alive(self._ssh):
+                LOG.info("ssh connection to %s@%s was lost, reconnecting",
+                         self.username, self.host)
+                self._ssh.close()
+                self._ssh = None
+            if self._ssh is None:
+                self._ssh = self._get_ssh_connection()
+            return self._ssh
+
+    def _open_session(self):
+        ssh = self._get_connection()
+        try:
+            return ssh.get_transport().open_session(
+                window_size=self.window_size, timeout=self.channel_timeout)
+        except (EOFError, socket.error, paramiko.SSHException) as e:
+            # The connection was lost since the liveness check
+            LOG.warning("Failed to open a channel on the ssh connection to "
+                        "%s@%s (%s), reconnecting",
+                        self.username, self.host, e)
+            with self._ssh_lock:
+                if self._ssh is ssh:
+                    self._ssh = None
+            ssh.close()
+            return self._get_connection().get_transport().open_session(
+                window_size=self.window_size, timeout=self.channel_timeout)
+
     def _is_timed_out(self, start_time):
         return (time.time() - self.timeout) > start_time
 
@@ -134,81 +202,121 @@ class Client(object):
     def _can_system_poll():
         return hasattr(select, 'poll')
 
-    def exec_command(self, cmd, encoding="utf-8"):
+    def _read_output(self, channel, cmd):
+        """Yields the output of a command as it is read from its channel
+
+        :returns: A generator of (name, data) tuples, where name is 'stdout'
+                  or 'stderr', and data the bytes read.
+        """
+        # Just read from the channels
+        if not self._can_system_poll():
+            out_file = channel.makefile('rb', self.buf_size)
+            err_file = channel.makefile_stderr('rb', self.buf_size)
+            yield 'stdout', out_file.read()
+            yield 'stderr', err_file.read()
+            return
+        # If the executing host is linux-based, poll the channel
+        poll = select.poll()
+        poll.register(channel, select.POLLIN)
+        start_time = time.time()
+        while True:
+            ready = poll.poll(self.channel_timeout)
+            if not any(ready):
+                if not self._is_timed_out(start_time):
+                    continue
+                raise exceptions.TimeoutException(
+                    "Command: '{0}' executed on host '{1}'.".format(
+                        cmd, self.host))
+            if not ready[0]:  # If there is nothing to read.
+                continue
+            out_chunk = err_chunk = None
+            if channel.recv_ready():
+                out_chunk = channel.recv(self.buf_size)
+                if out_chunk:
+                    yield 'stdout', out_chunk
+            if channel.recv_stderr_ready():
+                err_chunk = channel.recv_stderr(self.buf_size)
+                if err_chunk:
+                    yield 'stderr', err_chunk
+            if not err_chunk and not out_chunk:
+                break
+
+    @staticmethod
+    def _start_command(channel, cmd):
+        channel.fileno()  # Register event pipe
+        channel.exec_command(cmd)
+        channel.shutdown_write()
+
+    def exec_command(self, cmd, encoding="utf-8", stdout=None, stderr=None):
         """Execute the specified command on the server
 
-        Note that this method is reading whole command outputs to memory, thus
-        shouldn't be used for large outputs.
+        The outputs of the command are read to memory, unless `stdout` or
+        `stderr` is given, so large outputs should be written to files.
 
         :param str cmd: Command to run at remote server.
         :param str encoding: Encoding for result from paramiko.
                              Result will not be decoded if None.
-        :returns: data read from standard output of the command.
+        :param stdout: A binary file object or a bytearray the standard
+                       output of the command is written to, as it is read.
+        :param stderr: A binary file object or a bytearray the standard
+                       error of the command is written to, as it is read.
+        :returns: data read from standard output of the command, or None
+                  when it is written to `stdout`.
         :raises: SSHExecCommandFailed if command returns nonzero
-                 status. The exception contains command status stderr content.
+                 status. The exception contains command status stderr content,
+                 unless it was written to `stderr`.
         :raises: TimeoutException if cmd doesn't end when timeout expires.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        with transport.open_session() as channel:
-            channel.fileno()  # Register event pipe
-            channel.exec_command(cmd)
-            channel.shutdown_write()
-
-            # If the executing host is linux-based, poll the channel
-            if self._can_system_poll():
-                out_data_chunks = []
-                err_data_chunks = []
-                poll = select.poll()
-                poll.register(channel, select.POLLIN)
-                start_time = time.time()
-
-                while True:
-                    ready = poll.poll(self.channel_timeout)
-                    if not any(ready):
-                        if not self._is_timed_out(start_time):
-                            continue
-                        raise exceptions.TimeoutException(
-                            "Command: '{0}' executed on host '{1}'.".format(
-                                cmd, self.host))
-                    if not ready[0]:  # If there is nothing to read.
-                        continue
-                    out_chunk = err_chunk = None
-                    if channel.recv_ready():
-                        out_chunk = channel.recv(self.buf_size)
-                        out_data_chunks += out_chunk,
-                    if channel.recv_stderr_ready():
-                        err_chunk = channel.recv_stderr(self.buf_size)
-                        err_data_chunks += err_chunk,
-                    if not err_chunk and not out_chunk:
-                        break
-                out_data = b''.join(out_data_chunks)
-                err_data = b''.join(err_data_chunks)
-            # Just read from the channels
-            else:
-                out_file = channel.makefile('rb', self.buf_size)
-                err_file = channel.makefile_stderr('rb', self.buf_size)
-                out_data = out_file.read()
-                err_data = err_file.read()
-            if encoding:
+        out_data = bytearray() if stdout is None else stdout
+        err_data = bytearray() if stderr is None else stderr
+        writers = {'stdout': getattr(out_data, 'write', None) or
+                   out_data.extend,
+                   'stderr': getattr(err_data, 'write', None) or
+                   err_data.extend}
+        with self._open_session() as channel:
+            self._start_command(channel, cmd)
+            for name, data in self._read_output(channel, cmd):
+                writers[name](data)
+            exit_status = channel.recv_exit_status()
+
+        out_data = bytes(out_data) if stdout is None else None
+        err_data = bytes(err_data) if stderr is None else b''
+        if encoding:
+            if stdout is None:
                 out_data = out_data.decode(encoding)
-                err_data = err_data.decode(encoding)
+            err_data = err_data.decode(encoding)
+        if 0 != exit_status:
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status,
+                stderr=err_data, stdout=out_data or '')
+        return out_data
 
-            exit_status = channel.recv_exit_status()
+    def exec_command_iter(self, cmd):
+        """Execute the specified command on the server, streaming its output
 
-            if 0 != exit_status:
-                raise exceptions.SSHExecCommandFailed(
-                    command=cmd, exit_status=exit_status,
-                    stderr=err_data, stdout=out_data)
-            return out_data
+        :param str cmd: Command to run at remote server.
+        :returns: A generator of (name, data) tuples, where name is 'stdout'
+                  or 'stderr', and data the bytes read from that output.
+        :raises: SSHExecCommandFailed once the whole output was read, if the
+                 command returns nonzero status. The exception doesn't
+                 contain the outputs of the command.
+        :raises: TimeoutException if cmd doesn't end when timeout expires.
+        """
+        with self._open_session() as channel:
+            self._start_command(channel, cmd)
+            for chunk in self._read_output(channel, cmd):
+                yield chunk
+            exit_status = channel.recv_exit_status()
+        if 0 != exit_status:
+            raise exceptions.SSHExecCommandFailed(
+                command=cmd, exit_status=exit_status, stderr='', stdout='')
 
     def test_connection_auth(self):
         """Raises an exception when we can not connect to server via ssh."""
-        connection = self._get_ssh_connection()
-        connection.close()
+        self._get_connection()
 
     def _get_proxy_channel(self):
-        conn = self.proxy_client._get_ssh_connection()
+        conn = self.proxy_client._get_connection()
         # Keep a reference to avoid g/c
         # https://github.com/paramiko/paramiko/issues/440
         self._proxy_conn = conn
@@ -115,3 +115,31 @@ class RemoteClient(object):
             cmd = 'sudo {cmd} -I {nic}'.format(cmd=cmd, nic=nic)
         cmd += ' -c{0} -w{0} -s{1} {2}'.format(count, size, host)
         return self.exec_command(cmd)
+
+    def ping_hosts(self, hosts, count=None, size=None, nic=None):
+        """Ping several hosts at once
+
+        The hosts are pinged concurrently in the background, with a single
+        command.
+
+        :param hosts: A list of IP addresses
+        :returns: The set of the hosts which answered
+        """
+        if count is None:
+            count = self.ping_count
+        if size is None:
+            size = self.ping_size
+
+        pings = []
+        for host in hosts:
+            addr = netaddr.IPAddress(host)
+            cmd = 'ping6' if addr.version == 6 else 'ping'
+            if nic:
+                cmd = 'sudo {cmd} -I {nic}'.format(cmd=cmd, nic=nic)
+            pings.append(
+                '{0} -c{1} -w{1} -s{2} {3} >/dev/null 2>&1 && echo {3} &'
+                .format(cmd, count, size, host))
+        if not pings:
+            return set()
+        output = self.exec_command(' '.join(pings) + ' wait')
+        return set(output.split()) & set(hosts)
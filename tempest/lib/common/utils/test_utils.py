@@ -14,6 +14,7 @@
 #    under the License.
 import inspect
 import re
+import threading
 import time
 
 from oslo_log import log as logging
@@ -22,6 +23,9 @@ from tempest.lib import exceptions
 
 LOG = logging.getLogger(__name__)
 
+# Name of the test currently running in each thread, see set_test_caller
+_current_test = threading.local()
+
 
 def find_test_caller():
     """Find the caller class and test name.
@@ -78,6 +82,31 @@ def find_test_caller():
     return caller_name
 
 
+def set_test_caller(caller_name):
+    """Record the caller name of the test running in the current thread.
+
+    Test base classes set this when entering setUpClass, setUp and
+    tearDownClass, so that frequent callers such as the rest client logging
+    can use get_test_caller instead of walking the call stack.
+
+    :param caller_name: The name to report, in the same "Class:method" format
+        used by find_test_caller, or None to clear it.
+    """
+    _current_test.caller_name = caller_name
+
+
+def get_test_caller():
+    """Find the caller class and test name, cheaply if possible.
+
+    Returns the name recorded with set_test_caller for the current thread,
+    and falls back to find_test_caller when none was recorded.
+    """
+    caller_name = getattr(_current_test, 'caller_name', None)
+    if caller_name is None:
+        caller_name = find_test_caller()
+    return caller_name
+
+
 def call_and_ignore_notfound_exc(func, *args, **kwargs):
     """Call the given function and pass if a `NotFound` exception is raised."""
     try:
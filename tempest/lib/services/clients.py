@@ -268,7 +268,9 @@ class ServiceClients(object):
     @removals.removed_kwarg('client_parameters')
     def __init__(self, credentials, identity_uri, region=None, scope='project',
                  disable_ssl_certificate_validation=True, ca_certs=None,
-                 trace_requests='', client_parameters=None):
+                 trace_requests='', client_parameters=None, keep_alive=False,
+                 pool_maxsize=10, pool_idle_timeout=60, token_cache=None,
+                 polling_strategy=None):
         """Service Clients provider
 
         Instantiate a `ServiceClients` object, from a set of credentials and an
@@ -276,7 +278,8 @@ class ServiceClients(object):
         object. Optionally auth scope can be provided.
 
         A few parameters can be given a value which is applied as default
-        for all service clients: region, dscv, ca_certs, trace_requests.
+        for all service clients: region, dscv, ca_certs, trace_requests,
+        keep_alive, pool_maxsize and pool_idle_timeout.
 
         Parameters dscv, ca_certs and trace_requests all apply to the auth
         provider as well as any service clients provided by this manager.
@@ -323,6 +326,19 @@ class ServiceClients(object):
                                                   service clients.
         :param ca_certs: Applies to auth and to all service clients.
         :param trace_requests: Applies to auth and to all service clients.
+        :param keep_alive: When True all service clients share the
+            process-wide keep-alive connection pool, instead of opening a new
+            connection for each request.
+        :param pool_maxsize: Number of connections kept open per endpoint
+            when keep_alive is True.
+        :param pool_idle_timeout: Time in seconds after which an unused
+            endpoint pool is closed when keep_alive is True.
+        :param token_cache: An optional `auth.TokenCache`, used by the auth
+            provider to share tokens with other auth providers using the
+            same credentials and scope.
+        :param polling_strategy: An optional `polling.PollingStrategy`,
+            used by all service clients when waiting for resources instead
+            of polling every build_interval seconds.
         :param client_parameters: Dictionary with parameters for service
             clients. Keys of the dictionary are the service client service
             name, as declared in `service_clients.available_modules()` except
@@ -352,11 +368,22 @@ class ServiceClients(object):
         self.dscv = disable_ssl_certificate_validation
         self.ca_certs = ca_certs
         self.trace_requests = trace_requests
+        # NOTE: keep-alive and polling parameters are only passed to service
+        # clients when set, so clients which do not know about them keep
+        # working
+        self.optional_params = {}
+        if keep_alive:
+            self.optional_params = dict(keep_alive=True,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_idle_timeout=pool_idle_timeout)
+        if polling_strategy is not None:
+            self.optional_params['polling_strategy'] = polling_strategy
         # Creates an auth provider for the credentials
         self.auth_provider = auth_provider_class(
             self.credentials, self.identity_uri, scope=scope,
             disable_ssl_certificate_validation=self.dscv,
-            ca_certs=self.ca_certs, trace_requests=self.trace_requests)
+            ca_certs=self.ca_certs, trace_requests=self.trace_requests,
+            token_cache=token_cache)
         # Setup some defaults for client parameters of registered services
         client_parameters = client_parameters or {}
         self.parameters = {}
@@ -432,6 +459,7 @@ class ServiceClients(object):
                       disable_ssl_certificate_validation=self.dscv,
                       ca_certs=self.ca_certs,
                       trace_requests=self.trace_requests)
+        params.update(self.optional_params)
         params.update(kwargs)
         # Instantiate the client factory
         _factory = ClientsFactory(module_path=module_path,
@@ -455,7 +483,7 @@ class ServiceClients(object):
         Region by default is the region passed as an __init__ parameter.
         Checks that no parameter for an unknown service is provided.
         """
-        _parameters = {}
+        _parameters = dict(self.optional_params)
         # Use region from __init__
         if self.region:
             _parameters['region'] = self.region
@@ -152,15 +152,20 @@ class ImagesClient(rest_client.RestClient):
         self.expected_success(204, resp.status)
         return rest_client.ResponseBody(resp, body)
 
-    def show_image_file(self, image_id):
+    def show_image_file(self, image_id, stream=False):
         """Download binary image data.
 
         For a full list of available parameters, please refer to the official
         API reference:
         http://developer.openstack.org/api-ref/image/v2/#download-binary-image-data
+
+        :param stream: When True, the data of the returned object is a
+            `tempest.lib.common.http.StreamingBody`, which reads the image
+            on demand and computes its md5 checksum as it is read, instead of
+            the whole image data.
         """
         url = 'images/%s/file' % image_id
-        resp, body = self.get(url)
+        resp, body = self.get(url, stream=stream)
         self.expected_success(200, resp.status)
         return rest_client.ResponseBodyData(resp, body)
 
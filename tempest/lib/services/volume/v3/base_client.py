@@ -33,10 +33,10 @@ class BaseClient(rest_client.RestClient):
         return headers
 
     def request(self, method, url, extra_headers=False, headers=None,
-                body=None, chunked=False):
+                body=None, chunked=False, stream=False):
 
         resp, resp_body = super(BaseClient, self).request(
-            method, url, extra_headers, headers, body, chunked)
+            method, url, extra_headers, headers, body, chunked, stream)
         if (VOLUME_MICROVERSION and
             VOLUME_MICROVERSION != api_version_utils.LATEST_MICROVERSION):
             api_version_utils.assert_version_header_matches_request(
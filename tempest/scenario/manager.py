@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import subprocess
 
 import netaddr
@@ -23,6 +24,7 @@ from oslo_utils import netutils
 
 from tempest.common import compute
 from tempest.common import image as common_image
+from tempest.common.utils import connectivity
 from tempest.common.utils.linux import remote_client
 from tempest.common.utils import net_utils
 from tempest.common import waiters
@@ -337,6 +339,8 @@ class ScenarioTest(tempest.test.BaseTestCase):
         linux_client = remote_client.RemoteClient(ip_address, username,
                                                   pkey=private_key,
                                                   password=password)
+        # The ssh connection of the client is kept open until the test ends
+        self.addCleanup(linux_client.ssh_client.close)
         try:
             linux_client.validate_authentication()
         except Exception as e:
@@ -352,6 +356,30 @@ class ScenarioTest(tempest.test.BaseTestCase):
 
         return linux_client
 
+    def get_remote_clients(self, private_keys, username=None):
+        """Get SSH clients to several servers, waiting for them concurrently
+
+        @param private_keys dict mapping the IP addresses of the servers
+                            to their SSH private key, or to None for the
+                            default key
+        @param username name of the Linux account on the remote servers
+        @return a dict mapping the IP addresses to RemoteClient objects
+        """
+        def get_client(ip_address):
+            return self.get_remote_client(ip_address, username,
+                                          private_keys[ip_address])
+
+        clients = {}
+        try:
+            for ip_address, client in connectivity.wait_for_ssh(
+                    private_keys, get_client, CONF.validation.ssh_timeout):
+                clients[ip_address] = client
+        except lib_exc.TimeoutException:
+            LOG.exception('Waiting for the SSH port of the servers failed')
+            self._log_console_output()
+            raise
+        return clients
+
     def _image_create(self, name, fmt, path,
                       disk_format=None, properties=None):
         if properties is None:
@@ -585,6 +613,48 @@ class ScenarioTest(tempest.test.BaseTestCase):
             # no need to check ssh for negative connectivity
             self.get_remote_client(ip_address, username, private_key)
 
+    def ping_ip_addresses(self, ip_addresses, should_succeed=True,
+                          ping_timeout=None, mtu=None):
+        """Ping several IP addresses concurrently
+
+        :returns: The list of the IP addresses which didn't have the
+            expected result before the timeout
+        """
+        timeout = ping_timeout or CONF.validation.ping_timeout
+        results = connectivity.check_connectivity(
+            [(None, x) for x in ip_addresses], timeout,
+            should_succeed=should_succeed, mtu=mtu)
+        return [x for x in ip_addresses
+                if results[(None, x)] != should_succeed]
+
+    def check_vms_connectivity(self, private_keys, username=None,
+                               should_connect=True, mtu=None):
+        """Check the connectivity of several servers at once
+
+        Like check_vm_connectivity, but all the servers are pinged
+        concurrently.
+
+        :param private_keys: dict mapping the IP addresses of the servers
+            to their ssh private key, or to None for the default key
+        :param username: servers' ssh username
+        :param should_connect: True/False indicates positive/negative test
+        :param mtu: network MTU to use for connectivity validation
+
+        :raises: AssertError if the result of the connectivity check does
+            not match the value of the should_connect param
+        """
+        failed = self.ping_ip_addresses(list(private_keys),
+                                        should_succeed=should_connect,
+                                        mtu=mtu)
+        if should_connect:
+            msg = "Timed out waiting for %s to become reachable"
+        else:
+            msg = "ip addresses %s are reachable"
+        self.assertEqual([], failed, msg=msg % ', '.join(failed))
+        if should_connect:
+            # no need to check ssh for negative connectivity
+            self.get_remote_clients(private_keys, username)
+
     def check_public_network_connectivity(self, ip_address, username,
                                           private_key, should_connect=True,
                                           msg=None, servers=None, mtu=None):
@@ -897,19 +967,33 @@ class NetworkScenarioTest(ScenarioTest):
                                            private_key,
                                            should_connect=True,
                                            servers_for_debug=None):
+        self._check_servers_tenant_network_connectivity(
+            [(server, private_key)], username, should_connect=should_connect,
+            servers_for_debug=servers_for_debug)
+
+    def _check_servers_tenant_network_connectivity(self, servers,
+                                                   username,
+                                                   should_connect=True,
+                                                   servers_for_debug=None):
+        """Check the connectivity of the servers on their tenant networks
+
+        :param servers: list of (server, private_key) tuples. All their
+            addresses are checked at once.
+        """
         if not CONF.network.project_networks_reachable:
             msg = 'Tenant networks not configured to be reachable.'
             LOG.info(msg)
             return
+        private_keys = collections.OrderedDict()
+        for server, private_key in servers:
+            for ip_addresses in server['addresses'].values():
+                for ip_address in ip_addresses:
+                    private_keys[ip_address['addr']] = private_key
         # The target login is assumed to have been configured for
         # key-based authentication by cloud-init.
         try:
-            for ip_addresses in server['addresses'].values():
-                for ip_address in ip_addresses:
-                    self.check_vm_connectivity(ip_address['addr'],
-                                               username,
-                                               private_key,
-                                               should_connect=should_connect)
+            self.check_vms_connectivity(private_keys, username,
+                                        should_connect=should_connect)
         except Exception as e:
             LOG.exception('Tenant network connectivity check failed')
             self._log_console_output(servers_for_debug)
@@ -941,6 +1025,34 @@ class NetworkScenarioTest(ScenarioTest):
                                           CONF.validation.ping_timeout,
                                           1)
 
+    def check_remote_connectivity_matrix(self, pairs, should_succeed=True,
+                                         nic=None):
+        """assert ping of several servers via ssh connections at once
+
+        All the destinations are pinged concurrently, rather than one after
+        the other as with check_remote_connectivity.
+
+        :param pairs: list of (source, dest) tuples, where source is a
+            RemoteClient: an ssh connection from which to ping, and dest an
+            IP to ping against
+        :param should_succeed: boolean should ping succeed or not
+        :param nic: specific network interface to ping from
+        :returns: dict mapping each pair to whether dest was reachable from
+            source
+        """
+        results = connectivity.check_connectivity(
+            pairs, CONF.validation.ping_timeout,
+            should_succeed=should_succeed, nic=nic)
+        failed = ['%s from %s' % (dest, source.ssh_client.host)
+                  for source, dest in pairs
+                  if results[(source, dest)] != should_succeed]
+        if should_succeed:
+            msg = "Timed out waiting for %s to become reachable"
+        else:
+            msg = "%s are reachable"
+        self.assertEqual([], failed, msg % ', '.join(failed))
+        return results
+
     def check_remote_connectivity(self, source, dest, should_succeed=True,
                                   nic=None):
         """assert ping server via source ssh connection
@@ -170,12 +170,12 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
 
     def _check_tenant_network_connectivity(self):
         ssh_login = CONF.validation.image_ssh_user
-        for server in self.servers:
-            # call the common method in the parent class
-            super(TestNetworkBasicOps, self).\
-                _check_tenant_network_connectivity(
-                    server, ssh_login, self._get_server_key(server),
-                    servers_for_debug=self.servers)
+        # check all the servers at once with the common method in the
+        # parent class
+        self._check_servers_tenant_network_connectivity(
+            [(server, self._get_server_key(server))
+             for server in self.servers],
+            ssh_login, servers_for_debug=self.servers)
 
     def check_public_network_connectivity(
             self, should_connect=True, msg=None,
@@ -348,9 +348,9 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
         ssh_source = self.get_remote_client(
             ip_address, private_key=private_key)
 
-        for remote_ip in address_list:
-            self.check_remote_connectivity(ssh_source, remote_ip,
-                                           should_connect)
+        self.check_remote_connectivity_matrix(
+            [(ssh_source, remote_ip) for remote_ip in address_list],
+            should_connect)
 
     @decorators.attr(type='smoke')
     @decorators.idempotent_id('f323b3ba-82f8-4db7-8ea6-6a895869ec49')
@@ -71,8 +71,15 @@ class ObjectClient(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return resp, body
 
-    def get_object(self, container, object_name, metadata=None):
-        """Retrieve object's data."""
+    def get_object(self, container, object_name, metadata=None,
+                   stream=False):
+        """Retrieve object's data.
+
+        When stream is True, the returned body is a `StreamingBody` from
+        `tempest.lib.common.http`, which reads the object on demand and
+        computes its md5 checksum, to be compared with the ETag, as it is
+        read.
+        """
 
         headers = {}
         if metadata:
@@ -80,7 +87,7 @@ class ObjectClient(rest_client.RestClient):
                 headers[str(key)] = metadata[key]
 
         url = "{0}/{1}".format(container, object_name)
-        resp, body = self.get(url, headers=headers)
+        resp, body = self.get(url, headers=headers, stream=stream)
         self.expected_success([200, 206], resp.status)
         return resp, body
 
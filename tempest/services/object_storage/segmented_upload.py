@@ -0,0 +1,153 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Upload large objects as segments, in parallel
+
+The data of the object is split in fixed size segments as it is read, and
+the segments are uploaded concurrently, before the manifest of the static
+large object. Only the segments being uploaded are held in memory, so the
+data can be a file or a generator larger than the memory.
+"""
+
+import hashlib
+from multiprocessing import pool
+import threading
+
+from oslo_serialization import jsonutils as json
+
+from tempest.lib import exceptions
+
+
+def iter_segments(data, segment_size):
+    """Split data in segments
+
+    :param data: bytes, a binary file object or an iterable of bytes
+    :param segment_size: Size of the segments in bytes
+    :returns: A generator of the segments. They are all `segment_size`
+              bytes long, apart from the last one.
+    """
+    if isinstance(data, bytes):
+        chunks = [data]
+    elif hasattr(data, 'read'):
+        chunks = iter(lambda: data.read(segment_size), b'')
+    else:
+        chunks = data
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        while len(buf) >= segment_size:
+            yield bytes(buf[:segment_size])
+            del buf[:segment_size]
+    if buf:
+        yield bytes(buf)
+
+
+class SegmentedUploader(object):
+    """Upload objects as static large objects
+
+    Up to `workers` segments are uploaded concurrently. The md5 checksum of
+    each segment is compared with its ETag as soon as it is uploaded, and
+    the ETag of the manifest with the checksum of the ETags of the
+    segments.
+
+    :param object_client: The ObjectClient to upload with
+    :param segment_size: Size of the segments in bytes
+    :param workers: Number of segments uploaded concurrently
+    """
+
+    def __init__(self, object_client, segment_size=1024 * 1024, workers=4):
+        self.object_client = object_client
+        self.segment_size = segment_size
+        self.workers = workers
+
+    def _upload_segment(self, container, name, segment, semaphore, failed):
+        try:
+            etag = hashlib.md5(segment).hexdigest()
+            resp, _ = self.object_client.create_object(container, name,
+                                                       segment)
+            if resp['etag'] != etag:
+                raise exceptions.InvalidHTTPResponseHeader(
+                    "ETag %s of segment %s/%s doesn't match its md5 %s" % (
+                        resp['etag'], container, name, etag))
+            return {'path': '/%s/%s' % (container, name),
+                    'etag': etag,
+                    'size_bytes': len(segment)}
+        except Exception:
+            failed.set()
+            raise
+        finally:
+            semaphore.release()
+
+    def upload(self, container, object_name, data, segment_container=None,
+               metadata=None):
+        """Upload an object as a static large object
+
+        The segments are named after the object, with the index of the
+        segment as suffix, like ``<object_name>/00000001``.
+
+        :param data: bytes, a binary file object or an iterable of bytes
+        :param segment_container: The container of the segments. The
+                                  default is the container of the object.
+        :param metadata: Headers of the manifest request
+        :returns: A tuple of the response of the manifest request, the
+                  manifest, and the md5 checksum of the data of the object
+        :raises: InvalidHTTPResponseHeader if an ETag doesn't match
+        :raises: ValueError if there is no data
+        """
+        if segment_container is None:
+            segment_container = container
+        checksum = hashlib.md5()
+        semaphore = threading.BoundedSemaphore(self.workers)
+        failed = threading.Event()
+        thread_pool = pool.ThreadPool(self.workers)
+        results = []
+        try:
+            segments = iter_segments(data, self.segment_size)
+            while True:
+                # Don't read a segment before one can be uploaded
+                semaphore.acquire()
+                if failed.is_set():
+                    # Stop at the first failed upload
+                    for result in results:
+                        result.get()
+                segment = next(segments, None)
+                if segment is None:
+                    semaphore.release()
+                    break
+                checksum.update(segment)
+                results.append(thread_pool.apply_async(
+                    self._upload_segment,
+                    (segment_container,
+                     '%s/%08d' % (object_name, len(results)),
+                     segment, semaphore, failed)))
+            manifest = [result.get() for result in results]
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        if not manifest:
+            raise ValueError('Cannot upload an object without data as '
+                             'segments')
+
+        resp, _ = self.object_client.create_object(
+            container, object_name, json.dumps(manifest),
+            params={'multipart-manifest': 'put'}, metadata=metadata)
+        etag = hashlib.md5(
+            ''.join(x['etag'] for x in manifest).encode('ascii')).hexdigest()
+        if resp['etag'].strip('"') != etag:
+            raise exceptions.InvalidHTTPResponseHeader(
+                "ETag %s of the manifest %s/%s doesn't match the md5 of the "
+                "ETags of its segments %s" % (resp['etag'], container,
+                                              object_name, etag))
+        return resp, manifest, checksum.hexdigest()
@@ -30,6 +30,7 @@ from tempest.common import fixed_network
 import tempest.common.validation_resources as vresources
 from tempest import config
 from tempest.lib.common import cred_client
+from tempest.lib.common.utils import test_utils
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 
@@ -222,6 +223,7 @@ class BaseTestCase(testtools.testcase.WithAttributes,
         if hasattr(super(BaseTestCase, cls), 'setUpClass'):
             super(BaseTestCase, cls).setUpClass()
         cls.setUpClassCalled = True
+        test_utils.set_test_caller('%s:setUpClass' % cls.__name__)
         # Stack of (name, callable) to be invoked in reverse order at teardown
         cls.teardowns = []
         # All the configuration checks that may generate a skip
@@ -248,6 +250,7 @@ class BaseTestCase(testtools.testcase.WithAttributes,
     @classmethod
     def tearDownClass(cls):
         at_exit_set.discard(cls)
+        test_utils.set_test_caller('%s:tearDownClass' % cls.__name__)
         # It should never be overridden by descendants
         if hasattr(super(BaseTestCase, cls), 'tearDownClass'):
             super(BaseTestCase, cls).tearDownClass()
@@ -275,6 +278,7 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                     LOG.exception("teardown of %s failed: %s", name, te)
                 if not etype:
                     etype, value, trace = sys_exec_info
+        test_utils.set_test_caller(None)
         # If exceptions were raised during teardown, and not before, re-raise
         # the first one
         if re_raise and etype is not None:
@@ -403,6 +407,11 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                                "setUpClass in the "
                                + self.__class__.__name__)
         at_exit_set.add(self.__class__)
+        # Attribute API calls made by the test, including its fixtures and
+        # cleanups, to the test method
+        test_utils.set_test_caller(
+            '%s:%s' % (self.__class__.__name__, self._testMethodName))
+        self.addCleanup(test_utils.set_test_caller, None)
         test_timeout = os.environ.get('OS_TEST_TIMEOUT', 0)
         try:
             test_timeout = int(test_timeout) * self.TIMEOUT_SCALING_FACTOR
@@ -0,0 +1,386 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Index of the tests of tempest and its plugins
+
+Listing the tests with unittest discovery imports every test module, which
+takes a long time. The index finds the same test ids by parsing the test
+modules instead, and caches what it found per file, so that only the files
+modified since the last listing are parsed again.
+
+Modules which build their tests at run time, with the load_tests protocol or
+test scenarios for instance, cannot be indexed. The index is not used at all
+when such a module is found.
+"""
+
+import ast
+import fnmatch
+import json
+import os
+import tempfile
+import warnings
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILE = '.tempest_discovery_index'
+TEST_DIRS = ['tempest/api', 'tempest/scenario']
+TEST_PATTERN = 'test*.py'
+TEST_METHOD_PREFIX = 'test'
+
+
+class DynamicModule(Exception):
+    """Raised when the tests of a module cannot be found statically"""
+
+
+def get_test_dirs():
+    """Directories of the tempest and plugin tests
+
+    :return: A list of (test_dir, top_level_dir) tuples, as passed to
+             unittest discovery
+    """
+    # Imported here since loading the plugins imports them
+    from tempest.test_discover import plugins
+
+    base_path = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
+    base_path = os.path.split(base_path)[0]
+    test_dirs = [(os.path.join(base_path, test_dir), base_path)
+                 for test_dir in TEST_DIRS]
+    plugin_load_tests = (
+        plugins.TempestTestPluginManager().get_plugin_load_tests_tuple())
+    for plugin in sorted(plugin_load_tests):
+        test_dir, top_path = plugin_load_tests[plugin]
+        test_dirs.append((test_dir, top_path))
+    return test_dirs
+
+
+def _dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = _dotted_name(node.value)
+        if value:
+            return '%s.%s' % (value, node.attr)
+    return None
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise DynamicModule()
+
+
+def _get_attrs(decorator_list):
+    # Mirrors the decorators which set testtools attrs, which are part of
+    # the test ids
+    attrs = set()
+    for decorator in decorator_list:
+        if not isinstance(decorator, ast.Call):
+            continue
+        name = (_dotted_name(decorator.func) or '').rpartition('.')[2]
+        if name not in ('attr', 'idempotent_id', 'services'):
+            continue
+        args = [_literal(arg) for arg in decorator.args]
+        kwargs = dict((kw.arg, _literal(kw.value))
+                      for kw in decorator.keywords)
+        if name == 'idempotent_id':
+            attrs.add('id-%s' % args[0])
+        elif name == 'services':
+            attrs.update(args)
+        elif 'type' in kwargs:
+            if isinstance(kwargs['type'], list):
+                attrs.update(kwargs['type'])
+            elif not isinstance(kwargs['type'], tuple):
+                attrs.add(kwargs['type'])
+        else:
+            attrs.update(args)
+    return sorted(attrs)
+
+
+def scan_module(source, module_name, is_package=False):
+    """Find the classes and test methods of a module without importing it
+
+    :param source: The source code of the module
+    :param module_name: The dotted name of the module
+    :param is_package: Whether the module is the __init__ of a package
+    :return: A dict with the classes defined in the module, with their bases
+             and test methods, and the names imported by the module
+    :raise DynamicModule: If the tests of the module are only known at run
+                          time
+    """
+    with warnings.catch_warnings():
+        # Invalid escape sequences in the tests are not our concern here
+        warnings.simplefilter('ignore')
+        tree = ast.parse(source)
+    package = module_name if is_package else module_name.rpartition('.')[0]
+    aliases = {}
+    classes = {}
+
+    def qualify(name):
+        head, _, tail = name.partition('.')
+        if head in classes:
+            head = '%s.%s' % (module_name, head)
+        else:
+            head = aliases.get(head, head)
+        return '%s.%s' % (head, tail) if tail else head
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    head = alias.name.partition('.')[0]
+                    aliases[head] = head
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ''
+            if node.level:
+                parent = package.rsplit('.', node.level - 1)[0]
+                base = '%s.%s' % (parent, base) if base else parent
+            for alias in node.names:
+                if alias.name == '*':
+                    raise DynamicModule()
+                aliases[alias.asname or alias.name] = '%s.%s' % (base,
+                                                                 alias.name)
+        elif isinstance(node, ast.FunctionDef):
+            if node.name == 'load_tests':
+                raise DynamicModule()
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id == 'load_tests':
+                    raise DynamicModule()
+                value = _dotted_name(node.value)
+                if value:
+                    aliases[target.id] = qualify(value)
+        elif isinstance(node, ast.ClassDef):
+            tests = {}
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    if item.name.startswith(TEST_METHOD_PREFIX):
+                        tests[item.name] = _get_attrs(item.decorator_list)
+                elif isinstance(item, ast.Assign):
+                    for target in item.targets:
+                        if not isinstance(target, ast.Name):
+                            continue
+                        if (target.id == 'scenarios' or
+                                target.id.startswith(TEST_METHOD_PREFIX)):
+                            raise DynamicModule()
+            bases = [_dotted_name(base) for base in node.bases]
+            if None in bases:
+                raise DynamicModule()
+            classes[node.name] = {'bases': [qualify(b) for b in bases],
+                                  'tests': tests}
+            aliases.pop(node.name, None)
+    return {'classes': classes, 'aliases': aliases}
+
+
+class _Resolver(object):
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.classes = {}
+        for module_name, module in modules.items():
+            for class_name, klass in module['classes'].items():
+                self.classes['%s.%s' % (module_name, class_name)] = klass
+        self._tests = {}
+
+    def resolve(self, name):
+        seen = set()
+        while name not in self.classes and name not in seen:
+            seen.add(name)
+            module_name, _, attr = name.rpartition('.')
+            module = self.modules.get(module_name)
+            if not module or attr not in module['aliases']:
+                break
+            name = module['aliases'][attr]
+        return name
+
+    def get_tests(self, name):
+        """Whether a class is a test case, and its test methods"""
+        name = self.resolve(name)
+        if name in self._tests:
+            return self._tests[name]
+        klass = self.classes.get(name)
+        if klass is None:
+            # Classes outside of the test directories are only known by name
+            if name.rpartition('.')[2].endswith('TestCase'):
+                result = (True, {})
+            elif name in ('object', 'six.object'):
+                result = (False, {})
+            else:
+                result = (None, {})
+            self._tests[name] = result
+            return result
+        # Guard against inheritance loops
+        self._tests[name] = (False, {})
+        is_test = False
+        tests = {}
+        # The leftmost bases come first in the method resolution order
+        for base in reversed(klass['bases']):
+            base_is_test, base_tests = self.get_tests(base)
+            if base_is_test is None:
+                is_test = None if is_test is False else is_test
+            elif base_is_test:
+                is_test = True
+            tests.update(base_tests)
+        tests.update(klass['tests'])
+        self._tests[name] = (is_test, tests)
+        return self._tests[name]
+
+
+def get_test_ids(modules, test_modules):
+    """Compute the test ids from the scanned modules
+
+    :param modules: A dict of the result of `scan_module` by module name,
+                    including the modules holding base classes
+    :param test_modules: The names of the modules the tests are loaded from
+    :return: The sorted list of the test ids
+    :raise DynamicModule: If a test class inherits from a class which is not
+                          indexed
+    """
+    resolver = _Resolver(modules)
+    test_ids = []
+    for module_name in test_modules:
+        for class_name in modules[module_name]['classes']:
+            name = '%s.%s' % (module_name, class_name)
+            is_test, tests = resolver.get_tests(name)
+            if not tests or is_test is False:
+                continue
+            if is_test is None:
+                LOG.debug('Cannot tell if %s is a test case', name)
+                raise DynamicModule()
+            for method, attrs in tests.items():
+                test_id = '%s.%s' % (name, method)
+                if attrs:
+                    test_id += '[%s]' % ','.join(attrs)
+                test_ids.append(test_id)
+    return sorted(test_ids)
+
+
+def _find_modules(test_dir, top_level):
+    # Walk the packages the way unittest discovery does, yielding the module
+    # name, the file path and whether tests are loaded from the module
+    for dirpath, dirnames, filenames in os.walk(test_dir):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if os.path.isfile(os.path.join(dirpath, d, '__init__.py')))
+        package = os.path.relpath(dirpath, top_level).replace(os.sep, '.')
+        for filename in sorted(filenames):
+            if not filename.endswith('.py'):
+                continue
+            if filename == '__init__.py':
+                yield package, os.path.join(dirpath, filename), False, True
+            else:
+                yield ('%s.%s' % (package, filename[:-3]),
+                       os.path.join(dirpath, filename),
+                       fnmatch.fnmatch(filename, TEST_PATTERN), False)
+
+
+class DiscoveryIndex(object):
+    """Test ids of the test directories, cached on disk
+
+    :param index_file: Path of the file the index is cached in, or None to
+                       not cache it
+    """
+
+    def __init__(self, index_file=DEFAULT_INDEX_FILE):
+        self.index_file = index_file
+        self._files = self._load()
+
+    def _load(self):
+        if not self.index_file:
+            return {}
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+        except (IOError, ValueError):
+            return {}
+        if (not isinstance(index, dict) or
+                index.get('version') != INDEX_VERSION):
+            return {}
+        return index.get('files', {})
+
+    def _save(self):
+        if not self.index_file:
+            return
+        index = {'version': INDEX_VERSION, 'files': self._files}
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.index_file)))
+            with os.fdopen(fd, 'w') as f:
+                json.dump(index, f)
+            os.rename(tmp_path, self.index_file)
+        except (IOError, OSError):
+            LOG.warning('Could not write the test index %s', self.index_file)
+
+    def _scan_file(self, path, module_name, is_package):
+        stat = os.stat(path)
+        cached = self._files.get(path)
+        if (cached and cached['module'] == module_name and
+                cached['mtime'] == stat.st_mtime and
+                cached['size'] == stat.st_size):
+            return cached['scan'], False
+        with open(path, 'r') as f:
+            source = f.read()
+        try:
+            scan = scan_module(source, module_name, is_package)
+        except (DynamicModule, SyntaxError):
+            # Not cached, a later change of the file may fix it
+            self._files.pop(path, None)
+            raise DynamicModule()
+        self._files[path] = {'module': module_name, 'mtime': stat.st_mtime,
+                             'size': stat.st_size, 'scan': scan}
+        return scan, True
+
+    def list_tests(self, test_dirs=None):
+        """List the test ids of the test directories
+
+        :param test_dirs: A list of (test_dir, top_level_dir) tuples, which
+                          defaults to the tempest and plugins test dirs
+        :return: The sorted list of test ids, or None if they cannot all be
+                 found without importing the tests
+        """
+        if test_dirs is None:
+            test_dirs = get_test_dirs()
+        modules = {}
+        test_modules = []
+        changed = False
+        seen = set()
+        try:
+            for test_dir, top_level in test_dirs:
+                for module_name, path, is_test, is_package in _find_modules(
+                        test_dir, top_level):
+                    seen.add(path)
+                    scan, scanned = self._scan_file(path, module_name,
+                                                    is_package)
+                    changed = changed or scanned
+                    modules[module_name] = scan
+                    if is_test:
+                        test_modules.append(module_name)
+            test_ids = get_test_ids(modules, test_modules)
+        except DynamicModule:
+            LOG.info('Some tests can only be listed by importing them')
+            test_ids = None
+        removed = set(self._files) - seen
+        for path in removed:
+            del self._files[path]
+        if changed or removed:
+            self._save()
+        return test_ids
@@ -13,16 +13,27 @@
 # under the License.
 
 import abc
+import importlib
+import json
+import os
+import sys
+import tempfile
 
 from oslo_log import log as logging
 import six
 import stevedore
+from stevedore import extension
 
 from tempest.lib.common.utils import misc
 from tempest.lib.services import clients
 
 LOG = logging.getLogger(__name__)
 
+PLUGIN_NAMESPACE = 'tempest.test_plugins'
+# Path of the optional file used to cache the plugin entry points between
+# tempest processes
+PLUGIN_CACHE_ENV = 'TEMPEST_PLUGIN_CACHE'
+
 
 @six.add_metaclass(abc.ABCMeta)
 class TempestPlugin(object):
@@ -180,10 +191,7 @@ class TempestTestPluginManager(object):
     plugins. It provides functions for getting set
     """
     def __init__(self):
-        self.ext_plugins = stevedore.ExtensionManager(
-            'tempest.test_plugins', invoke_on_load=True,
-            propagate_map_exceptions=True,
-            on_load_failure_callback=self.failure_hook)
+        self.ext_plugins = load_plugins(self.failure_hook)
 
     @staticmethod
     def failure_hook(_, ep, err):
@@ -223,3 +231,114 @@ class TempestTestPluginManager(object):
             except Exception:
                 LOG.exception('Plugin %s raised an exception trying to run '
                               'get_service_clients', plug.name)
+
+
+class _CachedEntryPoint(object):
+    """Entry point read from the plugin cache instead of a distribution"""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+        self.group = PLUGIN_NAMESPACE
+        self.module_name, _, attrs = value.partition(':')
+        self.attrs = tuple(attrs.split('.')) if attrs else ()
+
+    def load(self):
+        obj = importlib.import_module(self.module_name)
+        for attr in self.attrs:
+            obj = getattr(obj, attr)
+        return obj
+
+
+def _get_install_fingerprint():
+    # Installing, upgrading or removing a distribution changes the mtime of
+    # the directory or archive it is installed to. The current directory is
+    # left out, as tempest writes its log files there.
+    cwd = os.getcwd()
+    fingerprint = []
+    for path in sys.path:
+        path = os.path.abspath(path or os.curdir)
+        if path == cwd:
+            continue
+        try:
+            fingerprint.append([path, os.stat(path).st_mtime])
+        except OSError:
+            pass
+    return fingerprint
+
+
+def _read_plugin_cache(cache_file, fingerprint):
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get('fingerprint') != fingerprint:
+        return None
+    return cache.get('entry_points')
+
+
+def _write_plugin_cache(cache_file, fingerprint, ext_plugins):
+    cache = {
+        'fingerprint': fingerprint,
+        'entry_points': [[plug.name, plug.entry_point_target]
+                         for plug in ext_plugins]}
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(cache_file)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.rename(tmp_path, cache_file)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+    except (IOError, OSError):
+        LOG.warning('Could not write the plugin cache %s', cache_file)
+
+
+def _load_cached_plugins(entry_points, failure_hook):
+    extensions = []
+    for name, value in entry_points:
+        entry_point = _CachedEntryPoint(name, value)
+        try:
+            plugin = entry_point.load()
+            obj = plugin()
+        except Exception:
+            # The cache is out of date, the plugins are loaded again from
+            # the installed distributions
+            return None
+        extensions.append(extension.Extension(name, entry_point, plugin,
+                                              obj))
+    return stevedore.ExtensionManager.make_test_instance(
+        extensions, namespace=PLUGIN_NAMESPACE,
+        propagate_map_exceptions=True,
+        on_load_failure_callback=failure_hook)
+
+
+def load_plugins(failure_hook=None):
+    """Load the tempest plugins installed
+
+    Looking up the entry points of all installed distributions takes time.
+    If the TEMPEST_PLUGIN_CACHE environment variable is set to a file path,
+    the entry points found are cached in that file, and the cache is used by
+    later processes for as long as no distribution is installed or removed.
+
+    :param failure_hook: Called by stevedore when a plugin fails to load
+    :return: A stevedore `ExtensionManager` with the loaded plugins
+    """
+    cache_file = os.environ.get(PLUGIN_CACHE_ENV)
+    if cache_file:
+        fingerprint = _get_install_fingerprint()
+        entry_points = _read_plugin_cache(cache_file, fingerprint)
+        if entry_points is not None:
+            ext_plugins = _load_cached_plugins(entry_points, failure_hook)
+            if ext_plugins is not None:
+                return ext_plugins
+    ext_plugins = stevedore.ExtensionManager(
+        PLUGIN_NAMESPACE, invoke_on_load=True,
+        propagate_map_exceptions=True,
+        on_load_failure_callback=failure_hook)
+    if cache_file:
+        _write_plugin_cache(cache_file, fingerprint, ext_plugins)
+    return ext_plugins
@@ -12,10 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import os
 import sys
 
-from tempest.test_discover import plugins
+from tempest.test_discover import index
 
 if sys.version_info >= (2, 7):
     import unittest
@@ -24,28 +23,9 @@ else:
 
 
 def load_tests(loader, tests, pattern):
-    ext_plugins = plugins.TempestTestPluginManager()
-
     suite = unittest.TestSuite()
-    base_path = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
-    base_path = os.path.split(base_path)[0]
-    # Load local tempest tests
-    for test_dir in ['tempest/api', 'tempest/scenario']:
-        full_test_dir = os.path.join(base_path, test_dir)
-        if not pattern:
-            suite.addTests(loader.discover(full_test_dir,
-                                           top_level_dir=base_path))
-        else:
-            suite.addTests(loader.discover(full_test_dir, pattern=pattern,
-                           top_level_dir=base_path))
-
-    plugin_load_tests = ext_plugins.get_plugin_load_tests_tuple()
-    if not plugin_load_tests:
-        return suite
-
-    # Load any installed plugin tests
-    for plugin in plugin_load_tests:
-        test_dir, top_path = plugin_load_tests[plugin]
+    # Load local tempest tests and any installed plugin tests
+    for test_dir, top_path in index.get_test_dirs():
         if not pattern:
             suite.addTests(loader.discover(test_dir, top_level_dir=top_path))
         else:
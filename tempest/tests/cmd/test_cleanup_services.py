@@ -0,0 +1,130 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from tempest.cmd import cleanup_service
+from tempest import config
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class TestBaseService(base.TestCase):
+
+    def setUp(self):
+        super(TestBaseService, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+
+    def _service(self, **kwargs):
+        kwargs.setdefault('is_dry_run', False)
+        kwargs.setdefault('is_save_state', False)
+        return cleanup_service.BaseService(kwargs)
+
+    def test_delete_items_sequential(self):
+        svc = self._service()
+        deleted = []
+        svc._delete_items([{'id': '1'}, {'id': '2'}],
+                          lambda item: deleted.append(item['id']),
+                          "Delete exception.")
+        self.assertEqual(['1', '2'], deleted)
+
+    def test_delete_items_concurrent(self):
+        svc = self._service(workers=3)
+        barrier = threading.Semaphore(0)
+        deleted = []
+
+        def _delete(item):
+            # Blocks unless all the items are deleted concurrently
+            if item['id'] == '3':
+                barrier.release()
+                barrier.release()
+            else:
+                self.assertTrue(barrier.acquire(timeout=5))
+            deleted.append(item['id'])
+        svc._delete_items([{'id': '1'}, {'id': '2'}, {'id': '3'}], _delete,
+                          "Delete exception.")
+        self.assertEqual(['1', '2', '3'], sorted(deleted))
+
+    def test_delete_items_logs_errors(self):
+        svc = self._service(workers=2)
+        log = self.patch('tempest.cmd.cleanup_service.LOG')
+        deleted = []
+
+        def _delete(item):
+            if item['id'] == '1':
+                raise Exception()
+            deleted.append(item['id'])
+        svc._delete_items([{'id': '1'}, {'id': '2'}], _delete,
+                          "Delete Thing exception.")
+        self.assertEqual(['2'], deleted)
+        log.exception.assert_called_once_with("Delete Thing exception.")
+
+    def test_delete_items_wait_for_deletion(self):
+        svc = self._service(workers=2)
+        svc.wait_for_deletion = True
+        svc.list = mock.Mock(side_effect=[[{'id': '1'}, {'id': '3'}],
+                                          [{'id': '3'}]])
+        self.patch('time.sleep')
+        svc._delete_items([{'id': '1'}, {'id': '2'}], lambda item: None,
+                          "Delete exception.")
+        self.assertEqual(2, svc.list.call_count)
+
+    def test_delete_items_no_wait_with_one_worker(self):
+        svc = self._service()
+        svc.wait_for_deletion = True
+        svc.list = mock.Mock()
+        svc._delete_items([{'id': '1'}], lambda item: None,
+                          "Delete exception.")
+        svc.list.assert_not_called()
+
+
+class TestRunServices(base.TestCase):
+
+    def _services(self, order):
+        services = []
+        for service_class in (cleanup_service.VolumeService,
+                              cleanup_service.ServerService,
+                              cleanup_service.SnapshotService):
+            svc = service_class(mock.Mock(), is_dry_run=False,
+                                is_save_state=False)
+            svc.run = mock.Mock(side_effect=(
+                lambda name=service_class.__name__: order.append(name)))
+            services.append(svc)
+        return services
+
+    def test_run_services_sequential(self):
+        order = []
+        cleanup_service.run_services(self._services(order))
+        self.assertEqual(['VolumeService', 'ServerService',
+                          'SnapshotService'], order)
+
+    def test_run_services_dependencies(self):
+        order = []
+        cleanup_service.run_services(self._services(order), workers=4)
+        self.assertEqual('VolumeService', order[-1])
+        self.assertEqual(3, len(order))
+
+    def test_run_services_error(self):
+        order = []
+        services = self._services(order)
+        services[1].run.side_effect = ValueError()
+        self.assertRaises(ValueError, cleanup_service.run_services,
+                          services, workers=4)
+        # Dependent services still run
+        self.assertIn('VolumeService', order)
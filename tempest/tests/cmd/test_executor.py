@@ -0,0 +1,134 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import io
+import os
+import unittest
+
+import fixtures
+import subunit
+import testtools
+
+from tempest.cmd import executor
+from tempest.tests import base
+
+
+def _make_tests(fail_class_fixture=False):
+    # Defined here so that they aren't discovered with the unit tests
+    class Passing(unittest.TestCase):
+
+        def test_a(self):
+            self.assertNotEqual(os.getppid(), 1)
+
+        def test_b(self):
+            pass
+
+    class Failing(unittest.TestCase):
+
+        @classmethod
+        def setUpClass(cls):
+            if fail_class_fixture:
+                raise ValueError('setUpClass failed')
+
+        def test_c(self):
+            self.fail('test_c failed')
+
+    tests = collections.OrderedDict()
+    for case in (Passing, Failing):
+        for test in unittest.TestLoader().loadTestsFromTestCase(case):
+            tests[test.id()] = test
+    return tests
+
+
+def _read_stream(stream):
+    # Returns the status and worker tags of each test by test name, or the
+    # class fixture name
+    tests = {}
+
+    def on_test(test):
+        name = test['id'].split(' ')[0].rpartition('.')[2]
+        tests[name] = (test['status'], sorted(test['tags']))
+
+    stream.seek(0)
+    result = testtools.StreamToDict(on_test)
+    result.startTestRun()
+    subunit.ByteStreamToStreamResult(stream).run(result)
+    result.stopTestRun()
+    return tests
+
+
+class TestExecutor(base.TestCase):
+
+    def test_load_tests_test_ids(self):
+        test_id = ('tempest.tests.cmd.test_scheduler.TestScheduler.'
+                   'test_schedule')
+        tests = executor.load_tests([test_id])
+        self.assertEqual([test_id], list(tests))
+
+    def test_run_tests(self):
+        tests = _make_tests()
+        failing, passing = sorted(set(x.rpartition('.')[0] for x in tests))
+        output = io.BytesIO()
+        self.assertFalse(executor.run_tests(tests, 2, [output],
+                                            {passing: 10, failing: 1}))
+        # The longest class is assigned to the first worker
+        self.assertEqual({'test_a': ('success', ['worker-0']),
+                          'test_b': ('success', ['worker-0']),
+                          'test_c': ('fail', ['worker-1'])},
+                         _read_stream(output))
+
+    def test_run_tests_passing(self):
+        tests = _make_tests()
+        tests = collections.OrderedDict(
+            (x, y) for x, y in tests.items() if 'Passing' in x)
+        output = io.BytesIO()
+        self.assertTrue(executor.run_tests(tests, 4, [output]))
+        self.assertEqual(['test_a', 'test_b'],
+                         sorted(_read_stream(output)))
+
+    def test_run_tests_class_fixture_failure(self):
+        tests = _make_tests(fail_class_fixture=True)
+        output = io.BytesIO()
+        self.assertFalse(executor.run_tests(tests, 1, [output]))
+        self.assertEqual({'test_a': ('success', ['worker-0']),
+                          'test_b': ('success', ['worker-0']),
+                          'setUpClass': ('fail', ['worker-0'])},
+                         _read_stream(output))
+
+    def test_run_tests_output_failure(self):
+        class BrokenOutput(io.BytesIO):
+
+            def write(self, data):
+                raise IOError('broken output')
+
+        tests = _make_tests()
+        tests = collections.OrderedDict(
+            (x, y) for x, y in tests.items() if 'Passing' in x)
+        self.useFixture(fixtures.MockPatch('sys.stderr'))
+        self.assertFalse(executor.run_tests(tests, 1, [BrokenOutput()]))
+
+    def test_read_worker_failure(self):
+        stream = io.BytesIO()
+        subunit.StreamResultToBytes(stream).status(test_id='test_a',
+                                                   test_status='success')
+        stream.seek(0)
+        result = testtools.StreamResult()
+        result.status = lambda **kwargs: 1 / 0
+        errors = []
+        executor._read_worker(stream, result, errors)
+        self.assertTrue(stream.closed)
+        self.assertEqual(1, len(errors))
+        self.assertIn('ZeroDivisionError', errors[0])
@@ -0,0 +1,102 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+
+import fixtures
+import subunit
+import testtools
+from testrepository.repository import file as file_repository
+
+from tempest.cmd import rerun
+from tempest.tests import base
+
+
+def _insert_run(repo, results):
+    # results is a list of (test_id, status)
+    inserter = repo.get_inserter()
+    inserter.startTestRun()
+    for test_id, status in results:
+        inserter.status(test_id=test_id, test_status='inprogress')
+        inserter.status(test_id=test_id, test_status=status)
+    inserter.stopTestRun()
+
+
+def _read_results(stream):
+    results = {}
+    result = testtools.StreamToDict(
+        lambda test: results.__setitem__(test['id'], test['status']))
+    result.startTestRun()
+    subunit.ByteStreamToStreamResult(stream).run(result)
+    result.stopTestRun()
+    return results
+
+
+class TestRerun(base.TestCase):
+
+    def setUp(self):
+        super(TestRerun, self).setUp()
+        self.path = self.useFixture(fixtures.TempDir()).path
+
+    def _make_repository(self, runs):
+        repo = file_repository.RepositoryFactory().initialise(self.path)
+        for results in runs:
+            _insert_run(repo, results)
+        return repo
+
+    def test_get_latest_id(self):
+        self.assertIsNone(rerun.get_latest_id(self.path))
+        repo = self._make_repository([])
+        self.assertIsNone(rerun.get_latest_id(self.path))
+        _insert_run(repo, [('mod.A.test_a', 'success')])
+        _insert_run(repo, [('mod.A.test_a', 'success')])
+        self.assertEqual(1, rerun.get_latest_id(self.path))
+
+    def test_get_failing_ids(self):
+        self._make_repository([[('mod.A.test_a', 'success'),
+                                ('mod.A.test_b', 'fail'),
+                                ('setUpClass (mod.B)', 'fail'),
+                                ('mod.C.test_c', 'skip')]])
+        with rerun.get_run_stream(0, self.path) as stream:
+            self.assertEqual(set(['mod.A.test_b', 'setUpClass (mod.B)']),
+                             rerun.get_failing_ids(stream))
+
+    def test_split_failing(self):
+        test_ids = ['mod.A.test_a', 'mod.A.test_b', 'mod.B.test_a[id-1]',
+                    'mod.B.test_b[id-2]', 'mod.C.test_a']
+        failing = set(['mod.A.test_b', 'setUpClass (mod.B)', 'mod.D.test_a'])
+        self.assertEqual(
+            (['mod.A.test_b', 'mod.B.test_a[id-1]', 'mod.B.test_b[id-2]'],
+             ['mod.A.test_a', 'mod.C.test_a']),
+            rerun.split_failing(test_ids, failing))
+
+    def test_merge_runs(self):
+        self._make_repository([
+            [('mod.A.test_a', 'success'),
+             ('mod.A.test_b', 'fail'),
+             ('setUpClass (mod.B)', 'fail'),
+             ('mod.C.test_a', 'fail')],
+            [('mod.A.test_b', 'success')],
+            [('mod.B.test_a', 'success'),
+             ('mod.B.test_b', 'fail')]])
+        output = io.BytesIO()
+        rerun.merge_runs(output, 0, [1, 2], self.path)
+        output.seek(0)
+        self.assertEqual({'mod.A.test_a': 'success',
+                          'mod.A.test_b': 'success',
+                          'mod.B.test_a': 'success',
+                          'mod.B.test_b': 'fail',
+                          'mod.C.test_a': 'fail'},
+                         _read_results(output))
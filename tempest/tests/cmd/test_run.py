@@ -13,6 +13,7 @@
 # under the License.
 
 import argparse
+import io
 import os
 import shutil
 import subprocess
@@ -22,6 +23,7 @@ import fixtures
 import mock
 
 from tempest.cmd import run
+from tempest.cmd import selection
 from tempest.tests import base
 
 DEVNULL = open(os.devnull, 'wb')
@@ -68,6 +70,86 @@ class TestTempestRun(base.TestCase):
         self.assertEqual('i_am_a_fun_little_regex',
                          self.run_cmd._build_regex(args))
 
+    def test__list_tests(self):
+        self.useFixture(fixtures.MockPatch(
+            'tempest.test_discover.index.DiscoveryIndex.list_tests',
+            return_value=['tempest.api.test_a.A.test_a[smoke]',
+                          'tempest.api.test_b.B.test_b',
+                          'tempest.scenario.test_c.C.test_c[smoke]']))
+        self.assertEqual(['tempest.api.test_a.A.test_a[smoke]',
+                          'tempest.scenario.test_c.C.test_c[smoke]'],
+                         self.run_cmd._list_tests(
+                             selection.TestSelector('smoke')))
+
+    def test__list_tests_dynamic(self):
+        self.useFixture(fixtures.MockPatch(
+            'tempest.test_discover.index.DiscoveryIndex.list_tests',
+            return_value=None))
+        self.assertIsNone(self.run_cmd._list_tests(
+            selection.TestSelector('smoke')))
+
+    def test__uses_tempest_discovery(self):
+        self.useFixture(fixtures.EnvironmentVariable('OS_TEST_PATH'))
+        directory = self.useFixture(fixtures.TempDir()).path
+        self.addCleanup(os.chdir, os.path.abspath(os.curdir))
+        os.chdir(directory)
+        self.assertFalse(self.run_cmd._uses_tempest_discovery())
+        with open('.testr.conf', 'w') as f:
+            f.write('[DEFAULT]\ntest_command=python -m subunit.run '
+                    'discover -t ./ ${OS_TEST_PATH:-./tempest/test_discover}'
+                    ' $LISTOPT $IDOPTION\n')
+        self.assertTrue(self.run_cmd._uses_tempest_discovery())
+        self.useFixture(fixtures.EnvironmentVariable('OS_TEST_PATH',
+                                                     './tests'))
+        self.assertFalse(self.run_cmd._uses_tempest_discovery())
+
+    def test__run_load_list(self):
+        load_lists = []
+
+        def fake_run_argv(argv, stdin, stdout, stderr):
+            with open(argv[3]) as f:
+                load_lists.append(f.read().split())
+            self.assertEqual(['tempest', 'run', '--load-list'], argv[:3])
+            return 0
+
+        self.useFixture(fixtures.MockPatch('tempest.cmd.run.run_argv',
+                                           side_effect=fake_run_argv))
+        self.assertEqual(0, self.run_cmd._run('smoke', ['--subunit'],
+                                              ['test_a', 'test_b']))
+        self.assertEqual([['test_a', 'test_b']], load_lists)
+
+    def test__run_forked_loads_stream(self):
+        loaded = []
+
+        def fake_run_tests(tests, concurrency, outputs, durations):
+            self.assertEqual(3, concurrency)
+            for output in outputs:
+                output.write(b'stream')
+            return False
+
+        def fake_run_argv(argv, stdin, stdout, stderr):
+            with open(argv[2], 'rb') as f:
+                loaded.append(argv[:2] + [f.read()])
+            return 0
+
+        self.useFixture(fixtures.MockPatch(
+            'tempest.cmd.executor.load_tests', return_value={}))
+        self.useFixture(fixtures.MockPatch(
+            'tempest.cmd.executor.run_tests', side_effect=fake_run_tests))
+        self.useFixture(fixtures.MockPatch('tempest.cmd.run.run_argv',
+                                           side_effect=fake_run_argv))
+        self.useFixture(fixtures.MockPatch('tempest.cmd.run.CONF'))
+        self.useFixture(fixtures.MockPatch('sys.stdout', io.BytesIO()))
+        args = mock.Mock(spec=argparse.Namespace)
+        setattr(args, 'subunit', True)
+        setattr(args, 'parallel', True)
+        setattr(args, 'concurrency', '3')
+        setattr(args, 'smoke', True)
+        setattr(args, 'whitelist_file', None)
+        setattr(args, 'blacklist_file', None)
+        self.assertEqual(1, self.run_cmd._run_forked('smoke', args))
+        self.assertEqual([['tempest', 'load', b'stream']], loaded)
+
 
 class TestRunReturnCode(base.TestCase):
     def setUp(self):
@@ -139,6 +221,7 @@ class TestTakeAction(base.TestCase):
         tempest_run = run.TempestRun(app=mock.Mock(), app_args=mock.Mock())
         parsed_args = mock.Mock()
         parsed_args.config_file = []
+        parsed_args.schedule_from = None
 
         # Override $HOME so that empty workspace gets created in temp dir.
         self.useFixture(fixtures.TempHomeDir())
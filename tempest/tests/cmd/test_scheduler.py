@@ -0,0 +1,99 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import io
+
+import fixtures
+import subunit
+
+from tempest.cmd import scheduler
+from tempest.tests import base
+
+
+def _make_stream(tests):
+    # tests is a list of (test_id, worker, start, stop) with times in
+    # seconds
+    epoch = datetime.datetime(2017, 1, 1, tzinfo=subunit.iso8601.UTC)
+    stream = io.BytesIO()
+    output = subunit.StreamResultToBytes(stream)
+    for test_id, worker, start, stop in tests:
+        tags = set(['worker-%s' % worker])
+        output.status(test_id=test_id, test_status='exists', test_tags=tags,
+                      timestamp=epoch)
+        output.status(test_id=test_id, test_status='inprogress',
+                      test_tags=tags,
+                      timestamp=epoch + datetime.timedelta(seconds=start))
+        output.status(test_id=test_id, test_status='success', test_tags=tags,
+                      timestamp=epoch + datetime.timedelta(seconds=stop))
+    output.status(file_name='stdout', file_bytes=b'not subunit',
+                  mime_type='text/plain; charset=utf8')
+    stream.seek(0)
+    return stream
+
+
+class TestScheduler(base.TestCase):
+
+    def test_get_class_id(self):
+        self.assertEqual('tempest.api.test_a.TestA', scheduler.get_class_id(
+            'tempest.api.test_a.TestA.test_a[id-1234,smoke]'))
+        self.assertEqual('tempest.api.test_a.TestA', scheduler.get_class_id(
+            'setUpClass (tempest.api.test_a.TestA)'))
+
+    def test_read_class_durations(self):
+        stream = _make_stream([
+            ('mod.A.test_1', 0, 1, 3),
+            ('mod.A.test_2', 0, 3, 4),
+            # The class fixtures of B ran between 4 and 10
+            ('mod.B.test_1', 0, 10, 11),
+            ('mod.C.test_1', 1, 2, 4)])
+        self.assertEqual({'mod.A': 3, 'mod.B': 7, 'mod.C': 2},
+                         scheduler.read_class_durations(stream))
+
+    def test_get_class_durations_most_recent(self):
+        streams = [_make_stream([('mod.A.test_1', 0, 0, 2)]),
+                   _make_stream([('mod.A.test_1', 0, 0, 5),
+                                 ('mod.B.test_1', 0, 5, 6)])]
+        self.assertEqual({'mod.A': 2, 'mod.B': 1},
+                         scheduler.get_class_durations(streams))
+
+    def test_get_repository_streams_no_repository(self):
+        path = self.useFixture(fixtures.TempDir()).path
+        self.assertEqual([], list(scheduler.get_repository_streams(path)))
+
+    def test_schedule(self):
+        test_ids = ['mod.A.test_1', 'mod.A.test_2', 'mod.B.test_1',
+                    'mod.C.test_1', 'mod.D.test_1']
+        durations = {'mod.A': 10, 'mod.B': 6, 'mod.C': 5, 'mod.D': 4}
+        self.assertEqual(
+            [['mod.A.test_1', 'mod.A.test_2'],
+             ['mod.B.test_1'],
+             ['mod.C.test_1', 'mod.D.test_1']],
+            scheduler.schedule(test_ids, 3, durations))
+
+    def test_schedule_unknown_classes(self):
+        test_ids = ['mod.A.test_1', 'mod.B.test_1', 'mod.C.test_1',
+                    'mod.D.test_1']
+        durations = {'mod.A': 9, 'mod.B': 1}
+        # Unknown classes are assumed to take 5s
+        self.assertEqual(
+            [['mod.A.test_1', 'mod.B.test_1'],
+             ['mod.C.test_1', 'mod.D.test_1']],
+            scheduler.schedule(test_ids, 2, durations))
+
+    def test_schedule_more_workers_than_classes(self):
+        self.assertEqual([['mod.A.test_1', 'mod.A.test_2'], []],
+                         scheduler.schedule(['mod.A.test_1', 'mod.A.test_2'],
+                                            2, {}))
@@ -0,0 +1,123 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import re
+
+import fixtures
+from os_testr import regex_builder
+
+from tempest.cmd import selection
+from tempest.tests import base
+
+TEST_IDS = [
+    'tempest.api.compute.servers.test_servers.ServersTest.test_a[id-1,smoke]',
+    'tempest.api.compute.servers.test_servers.ServersTest.test_b[id-2]',
+    'tempest.api.compute.test_quotas.QuotasTest.test_quotas_v3[id-3]',
+    'tempest.api.image.v2.test_images.ImagesTest.test_image[id-4,smoke]',
+    'tempest.scenario.test_server_basic_ops.TestServerBasicOps.test_ops'
+    '[compute,id-5,network,smoke]',
+    'plugin_tests.api.test_compute.ComputeTest.test_servers[id-6]',
+]
+
+ENTRIES = [
+    'tempest.api.compute.servers',
+    '^tempest.scenario',
+    'tempest\\.api\\.image\\.v2.*',
+    'test_quotas',
+    'Servers.*test_b',
+    'test_\\w+_v3',
+    'smoke',
+]
+
+
+class TestParseLiteral(base.TestCase):
+
+    def test_literal(self):
+        self.assertEqual((False, 'tempest.api.compute'),
+                         selection.parse_literal('tempest.api.compute'))
+
+    def test_anchored(self):
+        self.assertEqual((True, 'tempest.api'),
+                         selection.parse_literal('^tempest.api'))
+
+    def test_escaped_and_match_any_suffix(self):
+        self.assertEqual((False, 'tempest.api.image[id-4'),
+                         selection.parse_literal(
+                             'tempest\\.api\\.image\\[id-4.*'))
+
+    def test_regex(self):
+        for entry in ('Servers.*test_b', 'test_\\w+', 'test_(a|b)', 'a$',
+                      'tempest\\.*', '.*'):
+            self.assertIsNone(selection.parse_literal(entry), entry)
+
+
+class TestTestSelector(base.TestCase):
+
+    def _write_list(self, entries):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'list.txt')
+        with open(path, 'w') as f:
+            for entry in entries:
+                f.write('%s  # comment\n' % entry)
+            f.write('# only a comment\n\n')
+        return path
+
+    def _assertSameAsRegex(self, regex='', whitelist=(), blacklist=()):
+        whitelist_file = blacklist_file = None
+        if whitelist:
+            whitelist_file = self._write_list(whitelist)
+        if blacklist:
+            blacklist_file = self._write_list(blacklist)
+        pattern = re.compile(regex_builder.construct_regex(
+            blacklist_file, whitelist_file, regex, False))
+        selector = selection.TestSelector(
+            regex,
+            whitelist and selection.read_list_file(whitelist_file) or (),
+            blacklist and selection.read_list_file(blacklist_file) or ())
+        expected = [x for x in TEST_IDS if pattern.search(x)]
+        self.assertEqual(expected, selector.select(TEST_IDS))
+        return expected
+
+    def test_no_selection(self):
+        self.assertEqual(TEST_IDS, self._assertSameAsRegex())
+
+    def test_regex(self):
+        self.assertEqual(3, len(self._assertSameAsRegex(regex='smoke')))
+        self._assertSameAsRegex(regex='compute.*test_[ab]')
+
+    def test_whitelist(self):
+        for entry in ENTRIES:
+            self._assertSameAsRegex(whitelist=[entry])
+        self._assertSameAsRegex(whitelist=ENTRIES[:4])
+        self._assertSameAsRegex(regex='plugin', whitelist=ENTRIES[:2])
+
+    def test_blacklist(self):
+        for entry in ENTRIES:
+            self._assertSameAsRegex(blacklist=[entry])
+        self._assertSameAsRegex(blacklist=ENTRIES[:4])
+        self._assertSameAsRegex(regex='compute', blacklist=ENTRIES[:2])
+
+    def test_search_overlapping_entries(self):
+        # The automaton has to fall back from a partial match of the longer
+        # entry to the shorter one
+        selector = selection.TestSelector(whitelist=['abcd', 'bce'])
+        self.assertEqual(['xabcex'], selector.select(['xabcex', 'xabcx']))
+
+    def test_blacklist_entry_in_longer_entry(self):
+        # 'api' is in 'tempest.api.compute', but isn't a prefix of the ids
+        self.assertEqual(
+            TEST_IDS[3:],
+            self._assertSameAsRegex(blacklist=['tempest.api.compute', 'api']))
@@ -187,6 +187,19 @@ class TestDynamicCredentialProvider(base.TestCase):
         self.assertEqual(primary_creds.tenant_id, '1234')
         self.assertEqual(primary_creds.user_id, '1234')
 
+    @mock.patch('tempest.lib.common.rest_client.RestClient')
+    def test_primary_creds_from_pool(self, MockRestClient):
+        creds_pool = mock.Mock()
+        creds_pool.acquire.return_value = mock.Mock(name='pooled')
+        provider = dynamic_creds.DynamicCredentialProvider(
+            credentials_pool=creds_pool, **self.fixed_params)
+        primary = provider.get_primary_creds()
+        self.assertIs(creds_pool.acquire.return_value, primary)
+        self.assertIs(primary, provider.get_primary_creds())
+        creds_pool.acquire.assert_called_once_with()
+        provider.clear_creds()
+        creds_pool.release.assert_called_once_with(primary)
+
     @mock.patch('tempest.lib.common.rest_client.RestClient')
     def test_admin_creds(self, MockRestClient):
         creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
@@ -663,3 +676,54 @@ class TestDynamicCredentialProviderV3(TestDynamicCredentialProvider):
                 "Member role already exists, ignoring conflict.")
         creds.creds_client.assign_user_role.assert_called_once_with(
             mock.ANY, mock.ANY, 'Member')
+
+
+class TestDynamicCredentialPool(base.TestCase):
+
+    def setUp(self):
+        super(TestDynamicCredentialPool, self).setUp()
+        self.provider = mock.Mock(neutron_available=False, _creds={})
+        self.created = []
+
+        def _create_creds():
+            creds = mock.Mock(name='creds-%d' % len(self.created))
+            self.created.append(creds)
+            return creds
+        self.provider._create_creds.side_effect = _create_creds
+
+    def _get_pool(self, size, recycle=False):
+        creds_pool = dynamic_creds.DynamicCredentialPool(
+            self.provider, size, recycle=recycle)
+        self.addCleanup(creds_pool.close)
+        return creds_pool
+
+    def test_acquire_refills(self):
+        creds_pool = self._get_pool(2)
+        first = creds_pool.acquire()
+        second = creds_pool.acquire()
+        third = creds_pool.acquire()
+        self.assertEqual(3, len(set([first, second, third])))
+        for creds in (first, second, third):
+            self.assertIn(creds, self.created)
+
+    def test_acquire_creation_failure(self):
+        self.provider._create_creds.side_effect = lib_exc.Conflict
+        creds_pool = self._get_pool(1)
+        self.assertIsNone(creds_pool.acquire())
+
+    def test_release_recycle(self):
+        creds_pool = self._get_pool(1, recycle=True)
+        creds = creds_pool.acquire()
+        creds_pool.release(creds)
+        self.assertIs(creds, creds_pool.acquire())
+        self.assertEqual(1, self.provider._create_creds.call_count)
+
+    def test_close_deletes_credentials(self):
+        creds_pool = dynamic_creds.DynamicCredentialPool(self.provider, 2)
+        creds = creds_pool.acquire()
+        creds_pool.release(creds)
+        creds_pool.close()
+        self.provider.clear_creds.assert_called_once_with()
+        self.assertEqual(set(self.created),
+                         set(self.provider._creds.values()))
+        self.assertIsNone(creds_pool.acquire())
@@ -13,8 +13,10 @@
 #    under the License.
 
 import hashlib
+from multiprocessing import pool
 import os
 import shutil
+import tempfile
 
 import mock
 import six
@@ -90,6 +92,8 @@ class TestPreProvisionedCredentials(base.TestCase):
             'tempest.common.preprov_creds.read_accounts_yaml',
             return_value=self.test_accounts))
         self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
+        self.useFixture(mockpatch.PatchObject(preprov_creds, '_NETWORKS',
+                                              new={}))
 
     def tearDown(self):
         super(TestPreProvisionedCredentials, self).tearDown()
@@ -136,90 +140,84 @@ class TestPreProvisionedCredentials(base.TestCase):
             self.assertIn(hash, hash_dict['creds'].keys())
             self.assertIn(hash_dict['creds'][hash], self.test_accounts)
 
+    def _get_lock_dir_provider(self, exists=True):
+        lock_dir = os.path.join(tempfile.mkdtemp(), 'test_accounts')
+        self.addCleanup(shutil.rmtree, os.path.dirname(lock_dir))
+        if exists:
+            os.mkdir(lock_dir)
+        params = dict(self.fixed_params, accounts_lock_dir=lock_dir)
+        return preprov_creds.PreProvisionedCredentialProvider(**params)
+
     def test_create_hash_file_previous_file(self):
+        test_account_class = self._get_lock_dir_provider()
         # Emulate the lock existing on the filesystem
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            test_account_class = (
-                preprov_creds.PreProvisionedCredentialProvider(
-                    **self.fixed_params))
-            res = test_account_class._create_hash_file('12345')
+        open(os.path.join(test_account_class.accounts_dir, '12345'),
+             'w').close()
+        res = test_account_class._create_hash_file('12345')
         self.assertFalse(res, "_create_hash_file should return False if the "
                          "pseudo-lock file already exists")
 
     def test_create_hash_file_no_previous_file(self):
-        # Emulate the lock not existing on the filesystem
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=False))
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            test_account_class = (
-                preprov_creds.PreProvisionedCredentialProvider(
-                    **self.fixed_params))
-            res = test_account_class._create_hash_file('12345')
+        test_account_class = self._get_lock_dir_provider()
+        res = test_account_class._create_hash_file('12345')
         self.assertTrue(res, "_create_hash_file should return True if the "
                         "pseudo-lock doesn't already exist")
+        lock_path = os.path.join(test_account_class.accounts_dir, '12345')
+        with open(lock_path) as lock_file:
+            self.assertEqual(self.fixed_params['name'], lock_file.read())
 
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_no_previous_accounts(self, lock_mock):
-        # Emulate no pre-existing lock
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=False))
-        hash_list = self._get_hash_list(self.test_accounts)
-        mkdir_mock = self.useFixture(mockpatch.Patch('os.mkdir'))
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=False))
-        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
-            **self.fixed_params)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True) as open_mock:
-            test_account_class._get_free_hash(hash_list)
-            lock_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                     hash_list[0])
-            open_mock.assert_called_once_with(lock_path, 'w')
-        mkdir_path = os.path.join(self.fixed_params['accounts_lock_dir'])
-        mkdir_mock.mock.assert_called_once_with(mkdir_path)
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_no_free_accounts(self, lock_mock):
-        hash_list = self._get_hash_list(self.test_accounts)
-        # Emulate pre-existing lock dir
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=True))
-        # Emulate all lcoks in list are in use
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
-        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
-            **self.fixed_params)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            self.assertRaises(lib_exc.InvalidCredentials,
-                              test_account_class._get_free_hash, hash_list)
+    def test_create_hash_file_no_lock_dir(self):
+        # Emulate the lock dir removed by another process
+        test_account_class = self._get_lock_dir_provider(exists=False)
+        self.assertTrue(test_account_class._create_hash_file('12345'))
+        self.assertTrue(os.path.isdir(test_account_class.accounts_dir))
 
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_some_in_use_accounts(self, lock_mock):
+    def test_get_free_hash_no_previous_accounts(self):
         # Emulate no pre-existing lock
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=True))
+        test_account_class = self._get_lock_dir_provider(exists=False)
         hash_list = self._get_hash_list(self.test_accounts)
-        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
-            **self.fixed_params)
+        self.assertEqual(hash_list[0],
+                         test_account_class._get_free_hash(hash_list))
+        self.assertEqual([hash_list[0]],
+                         os.listdir(test_account_class.accounts_dir))
 
-        def _fake_is_file(path):
-            # Fake isfile() to return that the path exists unless a specific
-            # hash is in the path
-            if hash_list[3] in path:
-                return False
-            return True
-
-        self.patchobject(os.path, 'isfile', _fake_is_file)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True) as open_mock:
-            test_account_class._get_free_hash(hash_list)
-            lock_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                     hash_list[3])
-            open_mock.assert_has_calls([mock.call(lock_path, 'w')])
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_remove_hash_last_account(self, lock_mock):
+    def test_get_free_hash_no_free_accounts(self):
+        test_account_class = self._get_lock_dir_provider()
+        hash_list = self._get_hash_list(self.test_accounts)
+        # Emulate all locks in list are in use
+        for _hash in hash_list:
+            with open(os.path.join(test_account_class.accounts_dir, _hash),
+                      'w') as lock_file:
+                lock_file.write('other class')
+        exc = self.assertRaises(lib_exc.InvalidCredentials,
+                                test_account_class._get_free_hash, hash_list)
+        self.assertIn('other class', str(exc))
+
+    def test_get_free_hash_some_in_use_accounts(self):
+        test_account_class = self._get_lock_dir_provider()
+        hash_list = self._get_hash_list(self.test_accounts)
+        # Emulate all locks in use but one
+        for _hash in hash_list:
+            if _hash != hash_list[3]:
+                open(os.path.join(test_account_class.accounts_dir, _hash),
+                     'w').close()
+        self.assertEqual(hash_list[3],
+                         test_account_class._get_free_hash(hash_list))
+        self.assertEqual(sorted(hash_list),
+                         sorted(os.listdir(test_account_class.accounts_dir)))
+
+    def test_get_free_hash_concurrent(self):
+        test_account_class = self._get_lock_dir_provider()
+        hash_list = self._get_hash_list(self.test_accounts)
+        workers = pool.ThreadPool(len(hash_list))
+        self.addCleanup(workers.terminate)
+        allocated = workers.map(
+            lambda _: test_account_class._get_free_hash(hash_list),
+            hash_list)
+        self.assertEqual(sorted(hash_list), sorted(allocated))
+
+    def test_remove_hash_last_account(self):
         hash_list = self._get_hash_list(self.test_accounts)
-        # Pretend the pseudo-lock is there
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
         # Pretend the lock dir is empty
         self.useFixture(mockpatch.Patch('os.listdir', return_value=[]))
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
@@ -233,11 +231,8 @@ class TestPreProvisionedCredentials(base.TestCase):
         remove_mock.mock.assert_called_once_with(hash_path)
         rmdir_mock.mock.assert_called_once_with(lock_path)
 
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_remove_hash_not_last_account(self, lock_mock):
+    def test_remove_hash_not_last_account(self):
         hash_list = self._get_hash_list(self.test_accounts)
-        # Pretend the pseudo-lock is there
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
         # Pretend the lock dir is empty
         self.useFixture(mockpatch.Patch('os.listdir', return_value=[
             hash_list[1], hash_list[4]]))
@@ -315,6 +310,20 @@ class TestPreProvisionedCredentials(base.TestCase):
         for i in admin_hashes:
             self.assertNotIn(i, args)
 
+    def test_get_match_hash_list_indexed(self):
+        test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
+            **self.fixed_params)
+        hash_list = self._get_hash_list(self.test_accounts)
+        hashes = test_accounts_class._get_match_hash_list(['role2', 'role4'])
+        # The accounts with both roles, in the order of the accounts file
+        self.assertEqual((hash_list[8], hash_list[9]), hashes)
+        self.assertIs(hashes, test_accounts_class._get_match_hash_list(
+            ['role4', 'role2']))
+        self.assertEqual(
+            tuple(hash_list[10:]),
+            test_accounts_class._get_match_hash_list(
+                [cfg.CONF.identity.admin_role]))
+
     def test_networks_returned_with_creds(self):
         test_accounts = [
             {'username': 'test_user13', 'tenant_name': 'test_tenant13',
@@ -341,6 +350,39 @@ class TestPreProvisionedCredentials(base.TestCase):
         self.assertEqual('fake-id', network['id'])
         self.assertEqual('network-2', network['name'])
 
+    def test_networks_looked_up_once(self):
+        test_accounts = [
+            {'username': 'test_user14', 'tenant_name': 'test_tenant14',
+             'password': 'p', 'roles': ['role-7'],
+             'resources': {'network': 'network-2'}}]
+        self.useFixture(mockpatch.Patch(
+            'tempest.common.preprov_creds.read_accounts_yaml',
+            return_value=test_accounts))
+        test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
+            **self.fixed_params)
+        with mock.patch('tempest.lib.services.compute.networks_client.'
+                        'NetworksClient.list_networks',
+                        return_value={'networks': [{'name': 'network-2',
+                                                    'id': 'fake-id',
+                                                    'label': 'network-2'}]}
+                        ) as list_networks:
+            creds = test_accounts_class.get_creds_by_roles(['role-7'])
+            test_accounts_class.clear_creds()
+            creds2 = test_accounts_class.get_creds_by_roles(
+                ['role-7'], force_new=True)
+        list_networks.assert_called_once_with()
+        self.assertEqual('fake-id', creds.network['id'])
+        self.assertEqual(creds.network, creds2.network)
+
+    def test_no_network_lookup_without_network(self):
+        test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
+            **self.fixed_params)
+        with mock.patch('tempest.lib.services.compute.networks_client.'
+                        'NetworksClient.list_networks') as list_networks:
+            creds = test_accounts_class.get_primary_creds()
+        list_networks.assert_not_called()
+        self.assertEqual({}, creds.network)
+
     def test_get_primary_creds(self):
         test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
             **self.fixed_params)
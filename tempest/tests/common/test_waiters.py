@@ -18,6 +18,8 @@ import mock
 
 from tempest.common import waiters
 from tempest import exceptions
+from tempest.lib.common import polling
+from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services.volume.v2 import volumes_client
 from tempest.tests import base
@@ -71,3 +73,157 @@ class TestImageWaiters(base.TestCase):
         mock_show.assert_has_calls([mock.call(volume_id),
                                     mock.call(volume_id)])
         mock_sleep.assert_called_once_with(1)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_for_volume_status_polling_strategy(self, mock_sleep):
+        client = mock.Mock(spec=volumes_client.VolumesClient,
+                           build_interval=1, build_timeout=60)
+        client.polling_strategy = polling.ExponentialBackoff(
+            initial_interval=0.5, max_interval=10, jitter=0)
+        volume1 = {'volume': {'status': 'creating'}}
+        # The service asks to wait longer than the next interval
+        volume2 = rest_client.ResponseBody({'retry-after': '3'},
+                                           {'volume': {'status': 'creating'}})
+        volume3 = {'volume': {'status': 'available'}}
+        client.show_volume = mock.Mock(side_effect=(volume1, volume2,
+                                                    volume3))
+        waiters.wait_for_volume_resource_status(client, 'fake_id',
+                                                'available')
+        self.assertEqual([mock.call(0.5), mock.call(3)],
+                         mock_sleep.mock_calls)
+
+
+class TestBatchWaiters(base.TestCase):
+
+    def setUp(self):
+        super(TestBatchWaiters, self).setUp()
+        self.sleep = self.patch('time.sleep')
+        self.client = mock.Mock(build_interval=1, build_timeout=60,
+                                polling_strategy=None)
+
+    @staticmethod
+    def _servers(*statuses):
+        return {'servers': [{'id': server_id, 'status': status,
+                             'OS-EXT-STS:task_state': None}
+                            for server_id, status in statuses]}
+
+    def test_wait_for_servers_status(self):
+        self.client.list_servers.side_effect = [
+            self._servers(('1', 'BUILD'), ('2', 'BUILD'), ('3', 'ACTIVE')),
+            self._servers(('1', 'ACTIVE'), ('2', 'BUILD'), ('3', 'ACTIVE')),
+            self._servers(('1', 'ACTIVE'), ('2', 'ACTIVE'), ('3', 'ACTIVE'))]
+        waiters.wait_for_servers_status(self.client, ['1', '2'], 'ACTIVE',
+                                        name='fake')
+        self.assertEqual(3, self.client.list_servers.call_count)
+        self.client.list_servers.assert_called_with(detail=True,
+                                                    name='fake')
+
+    def test_wait_for_servers_status_task_state(self):
+        in_progress = self._servers(('1', 'ACTIVE'))
+        in_progress['servers'][0]['OS-EXT-STS:task_state'] = 'spawning'
+        self.client.list_servers.side_effect = [
+            in_progress, self._servers(('1', 'ACTIVE'))]
+        waiters.wait_for_servers_status(self.client, ['1'], 'ACTIVE')
+        self.assertEqual(2, self.client.list_servers.call_count)
+
+    def test_wait_for_servers_status_error(self):
+        self.client.list_servers.side_effect = [
+            self._servers(('1', 'BUILD'), ('2', 'ERROR'))]
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_status,
+                          self.client, ['1', '2'], 'ACTIVE')
+
+    def test_wait_for_servers_status_not_found(self):
+        self.client.list_servers.return_value = self._servers(('1', 'BUILD'))
+        self.client.show_server.side_effect = lib_exc.NotFound
+        self.assertRaises(lib_exc.NotFound,
+                          waiters.wait_for_servers_status,
+                          self.client, ['1', '2'], 'ACTIVE')
+        self.client.show_server.assert_called_once_with('2')
+
+    def test_wait_for_servers_status_not_listed(self):
+        # A server missing from a page of the listing is checked on its own
+        self.client.list_servers.side_effect = [
+            self._servers(('1', 'ACTIVE')), self._servers(('1', 'ACTIVE'))]
+        self.client.show_server.side_effect = [
+            {'server': self._servers(('2', 'BUILD'))['servers'][0]},
+            {'server': self._servers(('2', 'ACTIVE'))['servers'][0]}]
+        waiters.wait_for_servers_status(self.client, ['1', '2'], 'ACTIVE')
+        self.assertEqual(2, self.client.list_servers.call_count)
+        self.assertEqual(2, self.client.show_server.call_count)
+
+    def test_wait_for_servers_status_timeout(self):
+        time_mock = self.patch('time.time')
+        time_mock.side_effect = utils.generate_timeout_series(60)
+        self.client.list_servers.return_value = self._servers(('1', 'BUILD'))
+        self.assertRaises(lib_exc.TimeoutException,
+                          waiters.wait_for_servers_status,
+                          self.client, ['1'], 'ACTIVE')
+
+    def test_wait_for_servers_termination(self):
+        self.client.list_servers.side_effect = [
+            self._servers(('1', 'ACTIVE'), ('2', 'ACTIVE'), ('3', 'ACTIVE')),
+            self._servers(('2', 'ACTIVE'), ('3', 'ACTIVE')),
+            self._servers(('3', 'ACTIVE'))]
+        self.client.show_server.side_effect = lib_exc.NotFound
+        waiters.wait_for_servers_termination(self.client, ['1', '2'])
+        self.assertEqual(3, self.client.list_servers.call_count)
+
+    def test_wait_for_servers_termination_not_listed(self):
+        # A server missing from a page of the listing is checked on its own
+        server = self._servers(('2', 'ACTIVE'))['servers'][0]
+        self.client.show_server.side_effect = [
+            lib_exc.NotFound, {'server': server}, lib_exc.NotFound]
+        self.client.list_servers.side_effect = [
+            self._servers(), self._servers(), self._servers()]
+        waiters.wait_for_servers_termination(self.client, ['1', '2'])
+        self.assertEqual(2, self.client.list_servers.call_count)
+        self.assertEqual(3, self.client.show_server.call_count)
+
+    def test_wait_for_servers_termination_error(self):
+        self.client.list_servers.side_effect = [
+            self._servers(('1', 'ERROR'), ('2', 'ACTIVE')),
+            self._servers(('1', 'ERROR'))]
+        self.client.show_server.side_effect = lib_exc.NotFound
+        exc = self.assertRaises(lib_exc.DeleteErrorException,
+                                waiters.wait_for_servers_termination,
+                                self.client, ['1', '2'])
+        self.assertIn('Resource 1 failed', str(exc))
+        # The other servers are still waited for
+        self.assertEqual(2, self.client.list_servers.call_count)
+
+    def test_wait_for_volumes_status(self):
+        self.client.list_volumes.side_effect = [
+            {'volumes': [{'id': '1', 'status': 'creating'},
+                         {'id': '2', 'status': 'available'}]},
+            {'volumes': [{'id': '1', 'status': 'available'},
+                         {'id': '2', 'status': 'available'}]}]
+        waiters.wait_for_volumes_status(self.client, ['1', '2'], 'available')
+        self.assertEqual(2, self.client.list_volumes.call_count)
+        self.client.list_volumes.assert_called_with(detail=True, params=None)
+        self.sleep.assert_called_once_with(1)
+
+    def test_wait_for_volumes_status_error(self):
+        self.client.list_volumes.return_value = {
+            'volumes': [{'id': '1', 'status': 'error'}]}
+        self.assertRaises(exceptions.VolumeResourceBuildErrorException,
+                          waiters.wait_for_volumes_status,
+                          self.client, ['1'], 'available')
+
+    def test_wait_for_volumes_status_not_listed(self):
+        # A volume missing from a page of the listing is checked on its own
+        self.client.list_volumes.return_value = {
+            'volumes': [{'id': '1', 'status': 'available'}]}
+        self.client.show_volume.side_effect = [
+            {'volume': {'id': '2', 'status': 'creating'}},
+            {'volume': {'id': '2', 'status': 'available'}}]
+        waiters.wait_for_volumes_status(self.client, ['1', '2'], 'available')
+        self.assertEqual(2, self.client.list_volumes.call_count)
+        self.assertEqual(2, self.client.show_volume.call_count)
+
+    def test_wait_for_volumes_status_not_found(self):
+        self.client.list_volumes.return_value = {'volumes': []}
+        self.client.show_volume.side_effect = lib_exc.NotFound
+        self.assertRaises(lib_exc.NotFound,
+                          waiters.wait_for_volumes_status,
+                          self.client, ['1'], 'available')
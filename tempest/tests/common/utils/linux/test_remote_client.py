@@ -130,6 +130,19 @@ rtt min/avg/max/mdev = 0.048/0.048/0.048/0.000 ms"""
                          ping_response)
         self._assert_exec_called_with('ping -c2 -w2 -s70 127.0.0.1')
 
+    def test_ping_hosts(self):
+        self.ssh_mock.mock.exec_command.return_value = "10.0.0.2\n::1\n"
+        self.assertEqual(
+            set(['10.0.0.2', '::1']),
+            self.conn.ping_hosts(['10.0.0.1', '10.0.0.2', '::1'], nic='eth0'))
+        self._assert_exec_called_with(
+            'sudo ping -I eth0 -c1 -w1 -s56 10.0.0.1 >/dev/null 2>&1 && '
+            'echo 10.0.0.1 & '
+            'sudo ping -I eth0 -c1 -w1 -s56 10.0.0.2 >/dev/null 2>&1 && '
+            'echo 10.0.0.2 & '
+            'sudo ping6 -I eth0 -c1 -w1 -s56 ::1 >/dev/null 2>&1 && '
+            'echo ::1 & wait')
+
     def test_get_mac_address(self):
         macs = """0a:0b:0c:0d:0e:0f
 a0:b0:c0:d0:e0:f0"""
@@ -0,0 +1,157 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+
+import mock
+
+from tempest.common.utils import connectivity
+from tempest.lib import exceptions as lib_exc
+from tempest.tests import base
+
+
+class TestGetPingCommand(base.TestCase):
+
+    def test_no_mtu(self):
+        self.assertEqual(['ping', '-c1', '-w1', '10.0.0.1'],
+                         connectivity.get_ping_command('10.0.0.1'))
+
+    def test_mtu(self):
+        self.assertEqual(
+            ['ping', '-c1', '-w1', '-M', 'do', '-s', '1406', 'fd00::1'],
+            connectivity.get_ping_command('fd00::1', mtu=1450))
+
+
+class TestCheckConnectivity(base.TestCase):
+
+    def setUp(self):
+        super(TestCheckConnectivity, self).setUp()
+        self.popen = self.patch('subprocess.Popen')
+        self.sleep = self.patch('time.sleep')
+        self.reachable = set()
+
+        def popen(cmd, **kwargs):
+            proc = mock.Mock()
+            proc.returncode = 0 if cmd[-1] in self.reachable else 1
+            return proc
+        self.popen.side_effect = popen
+
+    def _remote_client(self, reachable):
+        client = mock.Mock()
+        client.ping_hosts.side_effect = lambda hosts, nic: (
+            set(hosts) & reachable)
+        return client
+
+    def test_ping_local(self):
+        self.reachable.update(['10.0.0.1', '10.0.0.3'])
+        self.assertEqual(
+            set(['10.0.0.1', '10.0.0.3']),
+            connectivity.ping_local(['10.0.0.1', '10.0.0.2', '10.0.0.3']))
+        self.assertEqual(3, self.popen.call_count)
+
+    def test_matrix(self):
+        self.reachable.add('10.0.0.1')
+        source = self._remote_client(set(['10.0.0.1', '10.0.0.2']))
+        pairs = [(None, '10.0.0.1'), (None, '10.0.0.2'),
+                 (source, '10.0.0.1'), (source, '10.0.0.2')]
+        self.assertEqual({(None, '10.0.0.1'): True,
+                          (None, '10.0.0.2'): False,
+                          (source, '10.0.0.1'): True,
+                          (source, '10.0.0.2'): True},
+                         connectivity.check_connectivity(pairs, 0))
+        source.ping_hosts.assert_called_once_with(['10.0.0.1', '10.0.0.2'],
+                                                  nic=None)
+
+    def test_retry_pending_pairs(self):
+        source = self._remote_client(set())
+        answers = [set(), set(['10.0.0.1']), set(['10.0.0.1', '10.0.0.2'])]
+        source.ping_hosts.side_effect = lambda hosts, nic: (
+            set(hosts) & answers.pop(0))
+        results = connectivity.check_connectivity(
+            [(source, '10.0.0.1'), (source, '10.0.0.2')], 60, nic='eth0')
+        self.assertTrue(all(results.values()))
+        self.assertEqual(
+            [mock.call(['10.0.0.1', '10.0.0.2'], nic='eth0'),
+             mock.call(['10.0.0.1', '10.0.0.2'], nic='eth0'),
+             mock.call(['10.0.0.2'], nic='eth0')],
+            source.ping_hosts.mock_calls)
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_should_not_succeed(self):
+        self.reachable.add('10.0.0.1')
+        source = self._remote_client(set())
+        source.ping_hosts.side_effect = lib_exc.SSHExecCommandFailed
+        with mock.patch.object(connectivity, 'LOG'):
+            results = connectivity.check_connectivity(
+                [(None, '10.0.0.1'), (None, '10.0.0.2'),
+                 (source, '10.0.0.1')], 0, should_succeed=False)
+        self.assertEqual({(None, '10.0.0.1'): True,
+                          (None, '10.0.0.2'): False,
+                          (source, '10.0.0.1'): False}, results)
+
+    def test_no_pairs(self):
+        self.assertEqual({}, connectivity.check_connectivity([], 0))
+
+
+class TestIsPortOpen(base.TestCase):
+
+    def test_is_port_open(self):
+        create_connection = self.patch('socket.create_connection')
+        self.assertTrue(connectivity.is_port_open('10.0.0.1', 22))
+        create_connection.assert_called_once_with(('10.0.0.1', 22), 1)
+        create_connection.return_value.close.assert_called_once_with()
+        create_connection.side_effect = socket.error
+        self.assertFalse(connectivity.is_port_open('10.0.0.1', 22))
+
+
+class TestWaitForSsh(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForSsh, self).setUp()
+        self.sleep = self.patch('time.sleep')
+        self.is_port_open = self.patch(
+            'tempest.common.utils.connectivity.is_port_open')
+
+    def test_wait_for_port(self):
+        self.is_port_open.side_effect = [False, False, True]
+        connectivity.wait_for_port('10.0.0.1', 22, 60)
+        self.assertEqual(3, self.is_port_open.call_count)
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_wait_for_port_timeout(self):
+        self.is_port_open.return_value = False
+        self.assertRaises(lib_exc.TimeoutException,
+                          connectivity.wait_for_port, '10.0.0.1', 22, 0)
+
+    def test_wait_for_ssh(self):
+        self.is_port_open.side_effect = lambda host, port, timeout: (
+            host != '10.0.0.2' or self.sleep.called)
+        get_client = mock.Mock(side_effect=lambda ip: 'client-' + ip)
+        clients = list(connectivity.wait_for_ssh(
+            ['10.0.0.1', '10.0.0.2'], get_client, 60, port=2222))
+        self.assertEqual([('10.0.0.1', 'client-10.0.0.1'),
+                          ('10.0.0.2', 'client-10.0.0.2')],
+                         sorted(clients))
+        self.assertIn(mock.call('10.0.0.2', 2222, timeout=1),
+                      self.is_port_open.mock_calls)
+
+    def test_wait_for_ssh_port_not_open(self):
+        self.is_port_open.side_effect = lambda host, port, timeout: (
+            host != '10.0.0.2')
+        get_client = mock.Mock()
+        self.assertRaises(lib_exc.TimeoutException, list,
+                          connectivity.wait_for_ssh(
+                              ['10.0.0.1', '10.0.0.2'], get_client, 0))
+        get_client.assert_called_once_with('10.0.0.1')
+
+    def test_no_servers(self):
+        self.assertEqual([], list(connectivity.wait_for_ssh([], None, 60)))
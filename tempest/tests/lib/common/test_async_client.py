@@ -0,0 +1,134 @@
+# Copyright 2017 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+import threading
+import time
+
+import six
+import testtools
+
+from tempest.lib.common.utils import test_utils
+from tempest.lib import exceptions
+from tempest.tests import base
+
+if six.PY3:
+    import asyncio
+
+    from tempest.lib.common import async_client
+
+
+class FakeServersClient(object):
+
+    resource_type = 'server'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.callers = []
+        # Calls wait for each other on the barrier, if there is one, so
+        # that the tests don't depend on the calls overlapping in time
+        self.barrier = None
+
+    def show_server(self, server_id):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.callers.append(test_utils.get_test_caller())
+        if self.barrier is not None:
+            self.barrier.wait(timeout=10)
+        else:
+            time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        if server_id == 'missing':
+            raise exceptions.NotFound()
+        return {'server': {'id': server_id}}
+
+    def _private(self):
+        pass
+
+
+@testtools.skipIf(six.PY2, 'asyncio is only available on Python 3')
+class TestAsyncServiceClient(base.TestCase):
+
+    def setUp(self):
+        super(TestAsyncServiceClient, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.client = FakeServersClient()
+
+    def _get_async_client(self, **kwargs):
+        _client = async_client.AsyncServiceClient(self.client, loop=self.loop,
+                                                  **kwargs)
+        self.addCleanup(_client.close)
+        return _client
+
+    def test_gather(self):
+        # The calls only return by pairs, which fails unless they overlap
+        self.client.barrier = threading.Barrier(2)
+        servers = self._get_async_client()
+        ids = [str(i) for i in range(20)]
+        bodies = self.loop.run_until_complete(asyncio.gather(
+            *[servers.show_server(i) for i in ids]))
+        self.assertEqual(ids, [body['server']['id'] for body in bodies])
+        self.assertGreater(self.client.max_in_flight, 1)
+
+    def test_max_concurrency(self):
+        servers = self._get_async_client(max_concurrency=3)
+        self.loop.run_until_complete(asyncio.gather(
+            *[servers.show_server(str(i)) for i in range(20)]))
+        self.assertLessEqual(self.client.max_in_flight, 3)
+
+    def test_exception(self):
+        servers = self._get_async_client()
+        self.assertRaises(exceptions.NotFound, self.loop.run_until_complete,
+                          servers.show_server('missing'))
+
+    def test_attributes(self):
+        servers = self._get_async_client()
+        self.assertEqual('server', servers.resource_type)
+        self.assertEqual(self.client._private, servers._private)
+
+    def test_test_caller(self):
+        servers = self._get_async_client()
+        self.loop.run_until_complete(servers.show_server('1'))
+        self.assertEqual(['TestAsyncServiceClient:test_test_caller'],
+                         self.client.callers)
+
+
+@testtools.skipIf(six.PY2, 'asyncio is only available on Python 3')
+class TestRunConcurrently(base.TestCase):
+
+    def setUp(self):
+        super(TestRunConcurrently, self).setUp()
+        self.client = FakeServersClient()
+
+    def test_run_concurrently(self):
+        self.client.barrier = threading.Barrier(2)
+        ids = [str(i) for i in range(10)]
+        bodies = async_client.run_concurrently(
+            [functools.partial(self.client.show_server, i) for i in ids],
+            max_concurrency=2)
+        self.assertEqual(ids, [body['server']['id'] for body in bodies])
+        self.assertEqual(2, self.client.max_in_flight)
+
+    def test_run_concurrently_exception(self):
+        calls = [functools.partial(self.client.show_server, i)
+                 for i in ['1', 'missing', '2']]
+        self.assertRaises(exceptions.NotFound,
+                          async_client.run_concurrently, calls)
+        # All the calls are completed before raising
+        self.assertEqual(3, len(self.client.callers))
@@ -0,0 +1,209 @@
+# Copyright 2017 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import io
+
+import mock
+import urllib3
+
+from tempest.lib.common import http
+from tempest.lib.common import rest_client
+from tempest.tests import base
+from tempest.tests.lib import fake_auth_provider
+
+
+class FakeUrllib3Response(object):
+
+    status = 200
+    reason = 'OK'
+    version = 11
+    data = b'fake_body'
+
+    def getheaders(self):
+        return {'Content-Type': 'application/json'}
+
+
+class TestClosingHttp(base.TestCase):
+
+    def setUp(self):
+        super(TestClosingHttp, self).setUp()
+        self.request = self.patchobject(urllib3.poolmanager.PoolManager,
+                                        'request')
+        self.request.return_value = FakeUrllib3Response()
+
+    def test_request_closes_connection(self):
+        resp, body = http.ClosingHttp().request(
+            'http://fake_url', 'GET', headers={'X-Fake': 'fake'})
+        headers = self.request.call_args[1]['headers']
+        self.assertEqual('close', headers['connection'])
+        self.assertEqual('fake', headers['X-Fake'])
+        self.assertEqual('200', resp['status'])
+        self.assertEqual(b'fake_body', body)
+
+    def test_request_stream(self):
+        resp, body = http.ClosingHttp().request('http://fake_url', 'GET',
+                                                stream=True)
+        self.assertFalse(self.request.call_args[1]['preload_content'])
+        self.assertNotIn('stream', self.request.call_args[1])
+        self.assertIsInstance(body, http.StreamingBody)
+        self.assertEqual('200', resp['status'])
+
+    def test_request_no_stream(self):
+        http.ClosingHttp().request('http://fake_url', 'GET')
+        self.assertTrue(self.request.call_args[1]['preload_content'])
+
+    def test_keep_alive_request_keeps_connection(self):
+        resp, body = http.KeepAliveHttp().request(
+            'http://fake_url', 'GET', headers={'X-Fake': 'fake'})
+        headers = self.request.call_args[1]['headers']
+        self.assertNotIn('connection', headers)
+        self.assertEqual('200', resp['status'])
+        self.assertEqual(b'fake_body', body)
+
+
+class TestStreamingBody(base.TestCase):
+
+    data = b'fake_data' * 1000
+
+    def _get_body(self, **kwargs):
+        self.response = mock.Mock()
+        self.response.read.side_effect = io.BytesIO(self.data).read
+        return http.StreamingBody(self.response, **kwargs)
+
+    def test_iter(self):
+        body = self._get_body(chunk_size=1000)
+        chunks = list(body)
+        self.assertEqual(9, len(chunks))
+        self.assertEqual(self.data, b''.join(chunks))
+        self.assertEqual(len(self.data), body.bytes_read)
+        self.assertEqual(hashlib.md5(self.data).hexdigest(),
+                         body.hexdigest())
+        self.assertTrue(body.closed)
+        self.response.release_conn.assert_called_once_with()
+        self.assertFalse(self.response.close.called)
+
+    def test_read(self):
+        body = self._get_body()
+        self.assertEqual(self.data[:10], body.read(10))
+        self.assertFalse(body.closed)
+        self.assertEqual(self.data[10:], body.read())
+        self.assertTrue(body.closed)
+        self.assertEqual(b'', body.read())
+        self.assertEqual(hashlib.md5(self.data).hexdigest(),
+                         body.hexdigest())
+
+    def test_add_checksum(self):
+        body = self._get_body(checksums=[])
+        body.add_checksum('sha256')
+        body.read()
+        self.assertEqual(hashlib.sha256(self.data).hexdigest(),
+                         body.hexdigest('sha256'))
+        self.assertRaises(KeyError, body.hexdigest, 'md5')
+
+    def test_add_checksum_after_read(self):
+        body = self._get_body()
+        body.read(1)
+        self.assertRaises(ValueError, body.add_checksum, 'sha256')
+
+    def test_close_partially_read(self):
+        with self._get_body() as body:
+            body.read(1)
+        self.assertTrue(body.closed)
+        self.response.close.assert_called_once_with()
+        self.response.release_conn.assert_called_once_with()
+
+    def test_str_does_not_read(self):
+        body = self._get_body()
+        self.assertIn('StreamingBody', str(body))
+        self.assertFalse(self.response.read.called)
+
+
+class TestKeepAliveHttp(base.TestCase):
+
+    def test_pool_maxsize(self):
+        pool_manager = http.KeepAliveHttp(maxsize=4)
+        pool = pool_manager.connection_from_url('http://fake_url:5000')
+        self.assertEqual(4, pool.pool.maxsize)
+
+    def test_pool_reused_per_endpoint(self):
+        pool_manager = http.KeepAliveHttp()
+        pool = pool_manager.connection_from_url('http://fake_url:5000/v3')
+        self.assertIs(pool, pool_manager.connection_from_url(
+            'http://fake_url:5000/v3/auth/tokens'))
+        self.assertIsNot(pool, pool_manager.connection_from_url(
+            'http://fake_url:8774/v2.1'))
+
+    @mock.patch('time.time')
+    def test_idle_pool_evicted(self, mock_time):
+        pool_manager = http.KeepAliveHttp(idle_timeout=10)
+        mock_time.return_value = 100
+        pool = pool_manager.connection_from_url('http://fake_url:5000')
+        mock_time.return_value = 105
+        self.assertIs(pool, pool_manager.connection_from_url(
+            'http://fake_url:5000'))
+        mock_time.return_value = 116
+        self.assertIsNot(pool, pool_manager.connection_from_url(
+            'http://fake_url:5000'))
+
+    @mock.patch('time.time')
+    def test_idle_eviction_disabled(self, mock_time):
+        pool_manager = http.KeepAliveHttp(idle_timeout=0)
+        mock_time.return_value = 100
+        pool = pool_manager.connection_from_url('http://fake_url:5000')
+        mock_time.return_value = 10000
+        self.assertIs(pool, pool_manager.connection_from_url(
+            'http://fake_url:5000'))
+
+    def test_pool_key_without_request_context(self):
+        # Older urllib3 releases don't pass a request_context
+        pool_manager = http.KeepAliveHttp()
+        with mock.patch.object(urllib3.PoolManager,
+                               'connection_from_pool_key') as mock_super:
+            pool_manager.connection_from_pool_key('fake_key')
+        mock_super.assert_called_once_with('fake_key')
+
+
+class TestSharedHttp(base.TestCase):
+
+    def test_same_settings_share_pool(self):
+        self.assertIs(http.get_shared_http(ca_certs='fake_ca', timeout=3),
+                      http.get_shared_http(ca_certs='fake_ca', timeout=3))
+
+    def test_different_settings_do_not_share_pool(self):
+        self.assertIsNot(http.get_shared_http(timeout=3),
+                         http.get_shared_http(timeout=4))
+
+    @mock.patch('os.getpid')
+    def test_pool_not_shared_across_processes(self, mock_getpid):
+        mock_getpid.return_value = 1
+        pool_manager = http.get_shared_http(timeout=5)
+        mock_getpid.return_value = 2
+        self.assertIsNot(pool_manager, http.get_shared_http(timeout=5))
+
+    def test_rest_clients_share_pool(self):
+        auth_provider = fake_auth_provider.FakeAuthProvider()
+        client1 = rest_client.RestClient(auth_provider, 'compute', 'region',
+                                         keep_alive=True)
+        client2 = rest_client.RestClient(auth_provider, 'network', 'region',
+                                         keep_alive=True)
+        self.assertIsInstance(client1.http_obj, http.KeepAliveHttp)
+        self.assertIs(client1.http_obj, client2.http_obj)
+
+    def test_rest_clients_do_not_share_pool_by_default(self):
+        auth_provider = fake_auth_provider.FakeAuthProvider()
+        client1 = rest_client.RestClient(auth_provider, 'compute', 'region')
+        client2 = rest_client.RestClient(auth_provider, 'network', 'region')
+        self.assertNotIsInstance(client1.http_obj, http.KeepAliveHttp)
+        self.assertIsNot(client1.http_obj, client2.http_obj)
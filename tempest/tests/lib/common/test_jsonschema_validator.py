@@ -12,7 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
+import jsonschema
+
 from tempest.lib.api_schema.response.compute.v2_1 import parameter_types
+from tempest.lib.common import jsonschema_validator
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -81,3 +86,59 @@ class TestJSONSchemaDateTimeFormat(base.TestCase):
         self.assertRaises(exceptions.InvalidHTTPResponseBody,
                           rest_client.RestClient.validate_response,
                           self.date_time_schema[0], resp, body)
+
+
+class TestJSONSchemaValidatorCache(base.TestCase):
+
+    schema = {
+        'type': 'object',
+        'properties': {
+            'foo': {'type': 'integer'}
+        },
+        'required': ['foo']
+    }
+
+    def test_get_validator(self):
+        validator = jsonschema_validator.get_validator(self.schema)
+        self.assertIsInstance(validator,
+                              jsonschema_validator.JSONSCHEMA_VALIDATOR)
+        self.assertIs(jsonschema_validator.FORMAT_CHECKER,
+                      validator.format_checker)
+        validator.validate({'foo': 1})
+        self.assertRaises(jsonschema.ValidationError,
+                          validator.validate, {'foo': 'bar'})
+
+    def test_get_validator_cached(self):
+        check_schema = self.patchobject(
+            jsonschema_validator.JSONSCHEMA_VALIDATOR, 'check_schema')
+        schema = {'type': 'object'}
+        validator = jsonschema_validator.get_validator(schema)
+        self.assertIs(validator, jsonschema_validator.get_validator(schema))
+        check_schema.assert_called_once_with(schema)
+
+    def test_get_validator_equal_schemas_not_shared(self):
+        schema1 = {'type': 'object'}
+        schema2 = {'type': 'object'}
+        self.assertIsNot(jsonschema_validator.get_validator(schema1),
+                         jsonschema_validator.get_validator(schema2))
+
+    def test_get_validator_invalid_schema(self):
+        self.assertRaises(jsonschema.SchemaError,
+                          jsonschema_validator.get_validator,
+                          {'type': 'fake_type'})
+
+    def test_get_validator_cache_bounded(self):
+        self.patchobject(jsonschema_validator, '_MAX_VALIDATORS', 2)
+        self.patchobject(jsonschema_validator, '_VALIDATORS',
+                         collections.OrderedDict())
+        schemas = [{'type': 'object'} for _ in range(3)]
+        validators = [jsonschema_validator.get_validator(schema)
+                      for schema in schemas[:2]]
+        # The first schema is the most recently used one after this
+        jsonschema_validator.get_validator(schemas[0])
+        jsonschema_validator.get_validator(schemas[2])
+        self.assertEqual(2, len(jsonschema_validator._VALIDATORS))
+        self.assertIs(validators[0],
+                      jsonschema_validator.get_validator(schemas[0]))
+        self.assertIsNot(validators[1],
+                         jsonschema_validator.get_validator(schemas[1]))
@@ -0,0 +1,101 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+
+import mock
+
+from tempest.lib.common import polling
+from tempest.lib.common import rest_client
+from tempest.tests import base
+
+
+def _first(intervals, count):
+    return list(itertools.islice(intervals, count))
+
+
+class TestPollingStrategies(base.TestCase):
+
+    def test_fixed_interval(self):
+        self.assertEqual([2, 2, 2],
+                         _first(polling.FixedInterval(2).intervals(), 3))
+
+    def test_exponential_backoff(self):
+        strategy = polling.ExponentialBackoff(initial_interval=0.1,
+                                              max_interval=1, factor=3,
+                                              jitter=0)
+        self.assertEqual([0.1, 0.3, 0.9, 1, 1],
+                         [round(i, 6) for i in _first(strategy.intervals(),
+                                                      5)])
+
+    def test_exponential_backoff_jitter(self):
+        strategy = polling.ExponentialBackoff(initial_interval=1,
+                                              max_interval=1, jitter=0.1)
+        for interval in _first(strategy.intervals(), 20):
+            self.assertTrue(0.9 <= interval <= 1.1)
+
+    def test_get_intervals_default(self):
+        client = mock.Mock(spec=['build_interval'], build_interval=3)
+        self.assertEqual([3, 3], _first(polling.get_intervals(client), 2))
+
+    def test_get_intervals_client_strategy(self):
+        strategy = polling.FixedInterval(0.5)
+        client = mock.Mock(build_interval=3, polling_strategy=strategy)
+        self.assertEqual([0.5, 0.5],
+                         _first(polling.get_intervals(client), 2))
+
+
+class TestRetryAfter(base.TestCase):
+
+    def test_no_header(self):
+        self.assertIsNone(polling.retry_after({}))
+        self.assertIsNone(polling.retry_after(None))
+
+    def test_seconds(self):
+        self.assertEqual(5, polling.retry_after({'retry-after': '5'}))
+
+    def test_date(self):
+        self.patch('time.time', return_value=1000)
+        date = 'Thu, 01 Jan 1970 00:17:00 GMT'
+        self.assertEqual(20, polling.retry_after({'retry-after': date}))
+
+    def test_date_in_the_past(self):
+        date = 'Thu, 01 Jan 1970 00:00:00 GMT'
+        self.assertEqual(0, polling.retry_after({'retry-after': date}))
+
+    def test_invalid(self):
+        self.assertIsNone(polling.retry_after({'retry-after': 'soon'}))
+
+
+class TestSleep(base.TestCase):
+
+    def setUp(self):
+        super(TestSleep, self).setUp()
+        self.sleep = self.patch('time.sleep')
+        self.intervals = polling.FixedInterval(1).intervals()
+
+    def test_sleep(self):
+        polling.sleep(self.intervals)
+        self.sleep.assert_called_once_with(1)
+
+    def test_sleep_retry_after(self):
+        body = rest_client.ResponseBody({'retry-after': '4'}, {})
+        polling.sleep(self.intervals, body)
+        self.sleep.assert_called_once_with(4)
+
+    def test_sleep_retry_after_shorter(self):
+        body = rest_client.ResponseBody({'retry-after': '0'}, {})
+        polling.sleep(self.intervals, body)
+        self.sleep.assert_called_once_with(1)
@@ -12,6 +12,8 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import threading
+
 import mock
 
 from tempest.lib.common.utils import test_utils
@@ -59,6 +61,31 @@ class TestTestUtils(base.TestCase):
         self.assertEqual('TestTestUtils:tearDownClass',
                          tearDownClass(self.__class__))
 
+    def test_get_test_caller_set(self):
+        self.addCleanup(test_utils.set_test_caller, None)
+        test_utils.set_test_caller('FakeTest:test_fake')
+        with mock.patch.object(test_utils, 'find_test_caller') as find:
+            self.assertEqual('FakeTest:test_fake',
+                             test_utils.get_test_caller())
+            self.assertFalse(find.called)
+
+    def test_get_test_caller_not_set(self):
+        test_utils.set_test_caller(None)
+        self.assertEqual('TestTestUtils:test_get_test_caller_not_set',
+                         test_utils.get_test_caller())
+
+    def test_get_test_caller_other_thread(self):
+        self.addCleanup(test_utils.set_test_caller, None)
+        test_utils.set_test_caller('FakeTest:test_fake')
+        callers = []
+
+        def run():
+            callers.append(test_utils.get_test_caller())
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertNotEqual(['FakeTest:test_fake'], callers)
+
     def test_call_and_ignore_notfound_exc_when_notfound_raised(self):
         def raise_not_found():
             raise exceptions.NotFound()
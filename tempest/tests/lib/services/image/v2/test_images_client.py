@@ -12,8 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import fixtures
+import mock
+
 from tempest.lib.services.image.v2 import images_client
 from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
 from tempest.tests.lib.services import base
 
 
@@ -109,3 +113,25 @@ class TestImagesClient(base.BaseServiceTest):
 
     def test_show_image_with_bytes_body(self):
         self._test_show_image(bytes_body=True)
+
+    def test_show_image_file(self):
+        resp = fake_http.fake_http_response({}, status=200)
+        self.useFixture(fixtures.MockPatch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            return_value=(resp, b'fake_image_data')))
+        body = self.client.show_image_file(
+            'e485aab9-0907-4973-921c-bb6da8a8fcf8')
+        self.assertEqual(b'fake_image_data', body.data)
+        self.assertEqual(resp, body.response)
+
+    def test_show_image_file_stream(self):
+        resp = fake_http.fake_http_response({}, status=200)
+        stream_body = mock.Mock()
+        get = self.useFixture(fixtures.MockPatch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            return_value=(resp, stream_body))).mock
+        body = self.client.show_image_file(
+            'e485aab9-0907-4973-921c-bb6da8a8fcf8', stream=True)
+        self.assertIs(stream_body, body.data)
+        get.assert_called_once_with(
+            'images/e485aab9-0907-4973-921c-bb6da8a8fcf8/file', stream=True)
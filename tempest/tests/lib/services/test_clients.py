@@ -211,6 +211,13 @@ class TestServiceClients(base.TestCase):
         self.assertIsInstance(_manager.auth_provider,
                               auth.KeystoneV3AuthProvider)
 
+    def test___init___token_cache(self):
+        creds = fake_credentials.FakeKeystoneV3Credentials()
+        token_cache = auth.TokenCache()
+        _manager = clients.ServiceClients(creds, identity_uri='fake_uri',
+                                          token_cache=token_cache)
+        self.assertIs(token_cache, _manager.auth_provider.token_cache)
+
     def test___init___base_creds_uri(self):
         creds = fake_credentials.FakeCredentials()
         uri = 'fake_uri'
@@ -288,6 +295,37 @@ class TestServiceClients(base.TestCase):
             self.assertEqual(expected_params[_key],
                              _params[_key])
 
+    def test__setup_parameters_keep_alive(self):
+        creds = fake_credentials.FakeKeystoneV2Credentials()
+        _manager = clients.ServiceClients(creds, identity_uri='fake_uri',
+                                          keep_alive=True, pool_maxsize=3,
+                                          pool_idle_timeout=30)
+        _params = _manager._setup_parameters({})
+        self.assertTrue(_params['keep_alive'])
+        self.assertEqual(3, _params['pool_maxsize'])
+        self.assertEqual(30, _params['pool_idle_timeout'])
+
+    def test__setup_parameters_no_keep_alive(self):
+        _manager = self._get_manager()
+        _params = _manager._setup_parameters({})
+        self.assertNotIn('keep_alive', _params)
+
+    def test_register_service_client_module_keep_alive(self):
+        creds = fake_credentials.FakeKeystoneV2Credentials()
+        _manager = clients.ServiceClients(creds, identity_uri='fake_uri',
+                                          keep_alive=True)
+        factory_mock = self.useFixture(fixtures.MockPatch(
+            'tempest.lib.services.clients.ClientsFactory')).mock
+        _manager.register_service_client_module(
+            name='fake_module',
+            service_version='fake_service',
+            module_path='fake.path.to.module',
+            client_names=[])
+        actual_kwargs = factory_mock.call_args[1]
+        self.assertTrue(actual_kwargs['keep_alive'])
+        self.assertEqual(10, actual_kwargs['pool_maxsize'])
+        self.assertEqual(60, actual_kwargs['pool_idle_timeout'])
+
     def test_register_service_client_module(self):
         expected_params = {'fake_param1': 'fake_value1',
                            'fake_param2': 'fake_value2'}
@@ -15,7 +15,9 @@
 
 import copy
 import datetime
+import os
 
+import fixtures
 from oslotest import mockpatch
 import testtools
 
@@ -508,6 +510,87 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
         expected = 'http://fake_url/some_path/v2.0'
         self._test_base_url_helper(expected, filters, ('token', auth_data))
 
+    def test_base_url_cached_until_token_changes(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        expected = self._get_result_url_from_endpoint(
+            self._endpoints[0]['endpoints'][1])
+        # The fake tokens expire in the past
+        self.useFixture(mockpatch.PatchObject(self.auth_provider,
+                                              'is_expired',
+                                              return_value=False))
+        # Each catalog lookup ends with applying the filters to the URL
+        lookup = self.useFixture(mockpatch.PatchObject(
+            auth, 'apply_url_filters', wraps=auth.apply_url_filters)).mock
+        self._test_base_url_helper(expected, filters)
+        self._test_base_url_helper(expected, dict(filters))
+        self.assertEqual(1, lookup.call_count)
+        # A new token is looked up again
+        self.auth_provider.set_auth()
+        self._test_base_url_helper(expected, filters)
+        self.assertEqual(2, lookup.call_count)
+
+    def test_base_url_not_cached_for_other_auth_data(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        auth_data = (fake_identity.ALT_TOKEN, self._get_fake_alt_identity())
+        # Each catalog lookup ends with applying the filters to the URL
+        lookup = self.useFixture(mockpatch.PatchObject(
+            auth, 'apply_url_filters', wraps=auth.apply_url_filters)).mock
+        self.auth_provider.base_url(filters, auth_data)
+        self.auth_provider.base_url(filters, auth_data)
+        self.assertEqual(2, lookup.call_count)
+
+    def test_base_url_overridden_in_subclass(self):
+        class FakeProvider(self._auth_provider_class):
+            def base_url(self, filters, auth_data=None):
+                return 'http://fake_url/v1'
+
+        provider = FakeProvider(self.credentials, fake_identity.FAKE_AUTH_URL)
+        url, _, _ = provider.auth_request('GET', 'servers',
+                                          filters={'service': 'compute'})
+        self.assertEqual('http://fake_url/v1/servers', url)
+
+    def test_request_url_multiple_slashes(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        base_url = self.auth_provider.base_url(filters)
+        url, _, _ = self.auth_provider.auth_request(
+            'GET', '//servers//detail?marker=a//b', filters=filters)
+        self.assertEqual(base_url + '/servers/detail?marker=a//b', url)
+
+    def test_request_does_not_modify_headers(self):
+        filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        headers = {'Content-Type': 'application/json'}
+        _, new_headers, _ = self.auth_provider.auth_request(
+            'GET', self.target_url, headers=headers, filters=filters)
+        self.assertEqual({'Content-Type': 'application/json'}, headers)
+        self.assertIn('X-Auth-Token', new_headers)
+
+    def test_token_expiry_parsed_once(self):
+        expiry = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        auth_data = self._auth_data_with_expiry(
+            expiry.strftime(auth.ISO8601_INT_SECONDS))
+        self.assertFalse(self.auth_provider.is_expired(auth_data))
+        mock_datetime = self.patch('tempest.lib.auth.datetime')
+        mock_datetime.datetime.utcnow.return_value = datetime.datetime.utcnow()
+        mock_datetime.timedelta = datetime.timedelta
+        self.assertFalse(self.auth_provider.is_expired(auth_data))
+        mock_datetime.datetime.strptime.assert_not_called()
+
     def test_token_not_expired(self):
         expiry_data = datetime.datetime.utcnow() + datetime.timedelta(days=1)
         self._verify_expiry(expiry_data=expiry_data, should_be_expired=False)
@@ -913,3 +996,98 @@ class TestGetCredentials(base.TestCase):
                                          '.* v1 .*'):
             auth.get_credentials('http://localhost/identity/v3',
                                  identity_version='v1')
+
+
+class TestTokenCache(base.TestCase):
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        self.patchobject(v3_client.V3TokenClient, 'raw_request',
+                         fake_identity._fake_v3_response)
+        self.token_requests = 0
+        self.auth_url = fake_identity.FAKE_AUTH_URL
+        self.expires_at = (
+            datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        ).strftime(auth.ISO8601_INT_SECONDS)
+
+    def _auth_provider(self, token_cache, scope='project', **creds):
+        params = dict(username='fake_username', password='fake_password',
+                      user_domain_name='fake_domain_name',
+                      project_name='fake_tenant_name',
+                      project_domain_name='fake_domain_name')
+        params.update(creds)
+        credentials = auth.KeystoneV3Credentials(**params)
+        auth_provider = auth.KeystoneV3AuthProvider(
+            credentials, self.auth_url, scope=scope, token_cache=token_cache)
+        self.useFixture(mockpatch.PatchObject(
+            auth_provider, '_get_auth', side_effect=self._get_auth(
+                auth_provider)))
+        return auth_provider
+
+    def _get_auth(self, auth_provider):
+        get_auth = auth_provider._get_auth
+
+        def _get_auth():
+            self.token_requests += 1
+            token, auth_data = get_auth()
+            auth_data = copy.deepcopy(auth_data)
+            auth_data['expires_at'] = self.expires_at
+            return token, auth_data
+        return _get_auth
+
+    def test_token_shared_by_auth_providers(self):
+        token_cache = auth.TokenCache()
+        first = self._auth_provider(token_cache)
+        second = self._auth_provider(token_cache)
+        self.assertEqual(first.get_token(), second.get_token())
+        self.assertEqual(1, self.token_requests)
+
+    def test_token_not_shared_with_other_credentials(self):
+        token_cache = auth.TokenCache()
+        self._auth_provider(token_cache).get_token()
+        self._auth_provider(token_cache, password='other').get_token()
+        self.assertEqual(2, self.token_requests)
+
+    def test_token_not_shared_with_other_scope(self):
+        token_cache = auth.TokenCache()
+        self._auth_provider(token_cache).get_token()
+        self._auth_provider(token_cache, scope='unscoped').get_token()
+        self.assertEqual(2, self.token_requests)
+
+    def test_expired_token_not_reused(self):
+        token_cache = auth.TokenCache()
+        self.expires_at = (
+            datetime.datetime.utcnow() +
+            auth.KeystoneAuthProvider.token_expiry_threshold / 2
+        ).strftime(auth.ISO8601_INT_SECONDS)
+        self._auth_provider(token_cache).get_token()
+        self._auth_provider(token_cache).get_token()
+        self.assertEqual(2, self.token_requests)
+
+    def test_clear_auth_removes_token(self):
+        token_cache = auth.TokenCache()
+        first = self._auth_provider(token_cache)
+        first.get_token()
+        first.clear_auth()
+        self._auth_provider(token_cache).get_token()
+        self.assertEqual(2, self.token_requests)
+
+    def test_token_shared_on_disk(self):
+        directory = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'tokens')
+        first = self._auth_provider(auth.TokenCache(directory))
+        second = self._auth_provider(auth.TokenCache(directory))
+        self.assertEqual(first.get_auth(), second.get_auth())
+        self.assertEqual(1, self.token_requests)
+        self.assertEqual(1, len(os.listdir(directory)))
+
+    def test_corrupted_file_ignored(self):
+        directory = self.useFixture(fixtures.TempDir()).path
+        token_cache = auth.TokenCache(directory)
+        with open(os.path.join(directory, 'key.json'), 'w') as f:
+            f.write('{not json')
+        self.assertIsNone(token_cache.get('key'))
+
+    def test_get_shared_token_cache(self):
+        self.assertIs(auth.get_shared_token_cache(),
+                      auth.get_shared_token_cache())
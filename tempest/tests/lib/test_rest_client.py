@@ -16,10 +16,12 @@ import copy
 import json
 
 import jsonschema
+import mock
 from oslotest import mockpatch
 import six
 
 from tempest.lib.common import http
+from tempest.lib.common import polling
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -80,6 +82,38 @@ class TestRestClientHTTPMethods(BaseRestClientTestClass):
         self.assertEqual('COPY', return_dict['method'])
 
 
+class TestRestClientStream(BaseRestClientTestClass):
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestRestClientStream, self).setUp()
+        self.stream_body = mock.Mock()
+        self.stream_body.read.return_value = '{"itemNotFound": {}}'
+        self.raw_request = self.patchobject(self.rest_client, 'raw_request')
+
+    def _set_response(self, status):
+        resp = fake_http.fake_http_response(
+            {'content-type': 'application/json'}, status=status)
+        self.raw_request.return_value = resp, self.stream_body
+
+    def test_get_stream(self):
+        self._set_response(200)
+        resp, body = self.rest_client.get(self.url, stream=True)
+        self.assertIs(self.stream_body, body)
+        self.assertFalse(self.stream_body.read.called)
+        self.assertTrue(self.raw_request.call_args[1]['stream'])
+
+    def test_get_stream_error_body_read(self):
+        self._set_response(404)
+        self.assertRaises(exceptions.NotFound, self.rest_client.get,
+                          self.url, stream=True)
+        self.stream_body.read.assert_called_once_with()
+
+    def test_get_no_stream(self):
+        self._set_response(200)
+        self.rest_client.get(self.url)
+        self.assertFalse(self.raw_request.call_args[1]['stream'])
+
+
 class TestRestClientNotFoundHandling(BaseRestClientTestClass):
     def setUp(self):
         self.fake_http = fake_http.fake_httplib2(404)
@@ -508,6 +542,16 @@ class TestRestClientUtils(BaseRestClientTestClass):
         self.rest_client.wait_for_resource_deletion('1234')
         self.assertEqual(len(sleep_mock.mock_calls), 2)
 
+    def test_wait_for_resource_deletion_polling_strategy(self):
+        self.retry_pass = 3
+        self.rest_client.build_timeout = 500
+        self.rest_client.polling_strategy = polling.ExponentialBackoff(
+            initial_interval=0.5, max_interval=1, jitter=0)
+        sleep_mock = self.patch('time.sleep')
+        self.rest_client.wait_for_resource_deletion('1234')
+        self.assertEqual([mock.call(0.5), mock.call(1), mock.call(1)],
+                         sleep_mock.mock_calls)
+
     def test_wait_for_resource_deletion_not_deleted(self):
         self.patch('time.sleep')
         # Set timeout to be very quick to force exception faster
@@ -536,6 +580,21 @@ class TestRestClientUtils(BaseRestClientTestClass):
         actual_resp, actual_versions = self.rest_client.get_versions()
         self.assertEqual(['v1', 'v2'], list(actual_versions))
 
+    def test__log_request_start_no_trace_requests(self):
+        get_caller = self.patch(
+            'tempest.lib.common.utils.test_utils.get_test_caller')
+        self.rest_client._log_request_start('GET', self.url)
+        self.assertFalse(get_caller.called)
+
+    def test__log_request_start_trace_requests(self):
+        self.rest_client.trace_requests = 'FakeTest'
+        self.patch('tempest.lib.common.utils.test_utils.get_test_caller',
+                   return_value='FakeTest:test_fake')
+        log = self.patchobject(self.rest_client.LOG, 'debug')
+        self.rest_client._log_request_start('GET', self.url)
+        log.assert_called_once_with('Starting Request (%s): %s %s',
+                                    'FakeTest:test_fake', 'GET', self.url)
+
     def test__str__(self):
         def get_token():
             return "deadbeef"
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from io import BytesIO
 from io import StringIO
 import socket
 
@@ -206,9 +207,9 @@ class TestSshClient(base.TestCase):
             chan_mock, self.SELECT_POLLIN)
         poll_mock.poll.assert_called_once_with(10)
         chan_mock.recv_ready.assert_called_once_with()
-        chan_mock.recv.assert_called_once_with(1024)
+        chan_mock.recv.assert_called_once_with(32768)
         chan_mock.recv_stderr_ready.assert_called_once_with()
-        chan_mock.recv_stderr.assert_called_once_with(1024)
+        chan_mock.recv_stderr.assert_called_once_with(32768)
         chan_mock.recv_exit_status.assert_called_once_with()
 
     def _set_mocks_for_select(self, poll_data, ito_value=False):
@@ -298,8 +299,132 @@ class TestSshClient(base.TestCase):
         client = ssh.Client('localhost', 'root', timeout=2)
         client.exec_command("test")
 
-        chan_mock.makefile.assert_called_once_with('rb', 1024)
-        chan_mock.makefile_stderr.assert_called_once_with('rb', 1024)
+        chan_mock.makefile.assert_called_once_with('rb', 32768)
+        chan_mock.makefile_stderr.assert_called_once_with('rb', 32768)
         std_out_mock.read.assert_called_once_with()
         std_err_mock.read.assert_called_once_with()
         self.assertFalse(select_mock.called)
+
+    def test_open_session_window_size(self):
+        gsc_mock, connections = self._set_connection_mocks()
+        client = ssh.Client('localhost', 'root', timeout=2,
+                            window_size=4 * 1024 * 1024)
+        client._open_session()
+        connections[0].get_transport().open_session.assert_called_once_with(
+            window_size=4 * 1024 * 1024, timeout=10.0)
+
+    def _set_mocks_for_output(self, exit_status=0):
+        chan_mock, poll_mock, _ = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv_exit_status.return_value = exit_status
+        chan_mock.recv.side_effect = [b'out1', b'', b'out2', b'']
+        chan_mock.recv_stderr.side_effect = [b'', b'err1', b'', b'']
+        return chan_mock
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter(self):
+        chan_mock = self._set_mocks_for_output()
+        client = ssh.Client('localhost', 'root', timeout=2, buf_size=4)
+        self.assertEqual(
+            [('stdout', b'out1'), ('stderr', b'err1'), ('stdout', b'out2')],
+            list(client.exec_command_iter("test")))
+        chan_mock.exec_command.assert_called_once_with("test")
+        chan_mock.recv.assert_called_with(4)
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_iter_failed(self):
+        self._set_mocks_for_output(exit_status=1)
+        client = ssh.Client('localhost', 'root', timeout=2)
+        output = client.exec_command_iter("test")
+        self.assertEqual(('stdout', b'out1'), next(output))
+        self.assertRaises(exceptions.SSHExecCommandFailed, list, output)
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_to_bytearray(self):
+        self._set_mocks_for_output()
+        client = ssh.Client('localhost', 'root', timeout=2)
+        stdout = bytearray()
+        stderr = bytearray()
+        self.assertIsNone(client.exec_command("test", stdout=stdout,
+                                              stderr=stderr))
+        self.assertEqual(b'out1out2', stdout)
+        self.assertEqual(b'err1', stderr)
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_to_file(self):
+        self._set_mocks_for_output(exit_status=1)
+        client = ssh.Client('localhost', 'root', timeout=2)
+        stdout = BytesIO()
+        exc = self.assertRaises(exceptions.SSHExecCommandFailed,
+                                client.exec_command, "test", stdout=stdout)
+        self.assertEqual(b'out1out2', stdout.getvalue())
+        self.assertIn('err1', six.text_type(exc))
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_empty_output(self):
+        chan_mock, poll_mock, _ = self._set_mocks_for_select([1, 0, 0])
+        chan_mock.recv_exit_status.return_value = 0
+        chan_mock.recv.return_value = b''
+        chan_mock.recv_stderr.return_value = b''
+        client = ssh.Client('localhost', 'root', timeout=2)
+        out_data = client.exec_command("true")
+        self.assertEqual('', out_data)
+        self.assertIsInstance(out_data, six.text_type)
+
+    @mock.patch('select.POLLIN', SELECT_POLLIN, create=True)
+    def test_exec_command_no_encoding(self):
+        self._set_mocks_for_output()
+        client = ssh.Client('localhost', 'root', timeout=2)
+        self.assertEqual(b'out1out2', client.exec_command("test",
+                                                          encoding=None))
+
+    def _set_connection_mocks(self, count=2):
+        gsc_mock = self.patch('tempest.lib.common.ssh.Client.'
+                              '_get_ssh_connection')
+        connections = [mock.MagicMock() for _ in range(count)]
+        gsc_mock.side_effect = connections
+        return gsc_mock, connections
+
+    def test_open_session_reuses_connection(self):
+        gsc_mock, connections = self._set_connection_mocks()
+        client = ssh.Client('localhost', 'root', timeout=2)
+        client._open_session()
+        client._open_session()
+        self.assertEqual(1, gsc_mock.call_count)
+        transport = connections[0].get_transport()
+        self.assertEqual([mock.call(window_size=None, timeout=10.0)] * 2,
+                         transport.open_session.mock_calls)
+        # Only the reused connection is checked
+        transport.send_ignore.assert_called_once_with()
+
+    def test_open_session_reconnects_inactive_connection(self):
+        gsc_mock, connections = self._set_connection_mocks()
+        client = ssh.Client('localhost', 'root', timeout=2)
+        client._open_session()
+        connections[0].get_transport().is_active.return_value = False
+        client._open_session()
+        self.assertEqual(2, gsc_mock.call_count)
+        connections[0].close.assert_called_once_with()
+        connections[1].get_transport().open_session.assert_called_once_with(
+            window_size=None, timeout=10.0)
+
+    def test_open_session_reconnects_when_channel_fails(self):
+        gsc_mock, connections = self._set_connection_mocks()
+        connections[0].get_transport().open_session.side_effect = EOFError
+        client = ssh.Client('localhost', 'root', timeout=2)
+        with mock.patch.object(ssh, 'LOG'):
+            channel = client._open_session()
+        self.assertEqual(connections[1].get_transport().open_session(),
+                         channel)
+        connections[0].close.assert_called_once_with()
+        self.assertEqual(connections[1], client._get_connection())
+
+    def test_close(self):
+        gsc_mock, connections = self._set_connection_mocks()
+        with ssh.Client('localhost', 'root', timeout=2) as client:
+            client.test_connection_auth()
+            self.assertFalse(connections[0].close.called)
+        connections[0].close.assert_called_once_with()
+        client.test_connection_auth()
+        self.assertEqual(2, gsc_mock.call_count)
+        client.close()
+        connections[1].close.assert_called_once_with()
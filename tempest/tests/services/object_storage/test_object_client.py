@@ -106,3 +106,13 @@ class TestObjectClient(base.TestCase):
             # Verify that the getresponse method was called to receive
             # the final
             mock_poc.return_value.getresponse.assert_called_once_with()
+
+    @mock.patch('tempest.lib.common.rest_client.RestClient.get')
+    def test_get_object_stream(self, mock_get):
+        stream_body = mock.Mock()
+        mock_get.return_value = (mock.Mock(status=200), stream_body)
+        resp, body = self.object_client.get_object('container1', 'object1',
+                                                   stream=True)
+        self.assertIs(stream_body, body)
+        mock_get.assert_called_once_with('container1/object1', headers={},
+                                         stream=True)
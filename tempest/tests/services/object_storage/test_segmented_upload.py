@@ -0,0 +1,121 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import io
+import threading
+
+import mock
+from oslo_serialization import jsonutils as json
+
+from tempest.lib import exceptions
+from tempest.services.object_storage import segmented_upload
+from tempest.tests import base
+
+
+class TestIterSegments(base.TestCase):
+
+    def test_bytes(self):
+        self.assertEqual([b'abc', b'def', b'g'],
+                         list(segmented_upload.iter_segments(b'abcdefg', 3)))
+
+    def test_file(self):
+        self.assertEqual([b'abc', b'def'],
+                         list(segmented_upload.iter_segments(
+                             io.BytesIO(b'abcdef'), 3)))
+
+    def test_iterable(self):
+        self.assertEqual([b'abc', b'def', b'g'],
+                         list(segmented_upload.iter_segments(
+                             iter([b'a', b'bcdef', b'', b'g']), 3)))
+
+    def test_empty(self):
+        self.assertEqual([], list(segmented_upload.iter_segments(b'', 3)))
+
+
+class TestSegmentedUploader(base.TestCase):
+
+    def setUp(self):
+        super(TestSegmentedUploader, self).setUp()
+        self.objects = {}
+        self.lock = threading.Lock()
+        self.object_client = mock.Mock()
+        self.object_client.create_object.side_effect = self._create_object
+
+    def _create_object(self, container, object_name, data, params=None,
+                       metadata=None):
+        with self.lock:
+            self.objects[(container, object_name)] = data
+        if params:
+            manifest = json.loads(data)
+            etag = hashlib.md5(''.join(
+                x['etag'] for x in manifest).encode('ascii')).hexdigest()
+            return {'etag': '"%s"' % etag}, ''
+        return {'etag': hashlib.md5(data).hexdigest()}, ''
+
+    def test_upload(self):
+        data = [b'abcd', b'efghij', b'k']
+        uploader = segmented_upload.SegmentedUploader(
+            self.object_client, segment_size=4, workers=2)
+        resp, manifest, checksum = uploader.upload(
+            'container', 'obj', iter(data), segment_container='segments',
+            metadata={'X-Object-Meta-Test': 'value'})
+
+        self.assertEqual(hashlib.md5(b''.join(data)).hexdigest(), checksum)
+        self.assertEqual([
+            {'path': '/segments/obj/00000000',
+             'etag': hashlib.md5(b'abcd').hexdigest(), 'size_bytes': 4},
+            {'path': '/segments/obj/00000001',
+             'etag': hashlib.md5(b'efgh').hexdigest(), 'size_bytes': 4},
+            {'path': '/segments/obj/00000002',
+             'etag': hashlib.md5(b'ijk').hexdigest(), 'size_bytes': 3}],
+            manifest)
+        self.assertEqual(b'efgh',
+                         self.objects[('segments', 'obj/00000001')])
+        self.assertEqual(manifest,
+                         json.loads(self.objects[('container', 'obj')]))
+        self.object_client.create_object.assert_called_with(
+            'container', 'obj', mock.ANY,
+            params={'multipart-manifest': 'put'},
+            metadata={'X-Object-Meta-Test': 'value'})
+
+    def test_upload_bad_segment_etag(self):
+        self.object_client.create_object.side_effect = [
+            ({'etag': hashlib.md5(b'ab').hexdigest()}, ''),
+            ({'etag': 'bad'}, ''),
+        ]
+        uploader = segmented_upload.SegmentedUploader(
+            self.object_client, segment_size=2, workers=1)
+        self.assertRaises(exceptions.InvalidHTTPResponseHeader,
+                          uploader.upload, 'container', 'obj', b'abcdef')
+        # The upload stops at the first failed segment
+        self.assertEqual(2, self.object_client.create_object.call_count)
+
+    def test_upload_bad_manifest_etag(self):
+        def create_object(container, object_name, data, params=None,
+                          metadata=None):
+            if params:
+                return {'etag': '"bad"'}, ''
+            return self._create_object(container, object_name, data)
+        self.object_client.create_object.side_effect = create_object
+        uploader = segmented_upload.SegmentedUploader(self.object_client)
+        self.assertRaises(exceptions.InvalidHTTPResponseHeader,
+                          uploader.upload, 'container', 'obj', b'abc')
+
+    def test_upload_empty(self):
+        uploader = segmented_upload.SegmentedUploader(self.object_client)
+        self.assertRaises(ValueError, uploader.upload, 'container', 'obj',
+                          io.BytesIO())
+        self.assertFalse(self.object_client.create_object.called)
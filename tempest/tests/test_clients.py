@@ -0,0 +1,59 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslotest import mockpatch
+
+from tempest import clients
+from tempest import config
+from tempest.lib.services import compute
+from tempest.tests import base
+from tempest.tests import fake_config
+from tempest.tests.lib import fake_credentials
+
+
+class TestManager(base.TestCase):
+
+    def setUp(self):
+        super(TestManager, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        self.servers_client_init = self.useFixture(mockpatch.PatchObject(
+            compute.ServersClient, '__init__', return_value=None)).mock
+        self.manager = clients.Manager(
+            fake_credentials.FakeKeystoneV2Credentials())
+
+    def test_clients_built_on_first_access(self):
+        self.servers_client_init.assert_not_called()
+        servers_client = self.manager.servers_client
+        self.assertIsInstance(servers_client, compute.ServersClient)
+        self.assertEqual(1, self.servers_client_init.call_count)
+        self.assertEqual(
+            self.manager.auth_provider,
+            self.servers_client_init.call_args[1]['auth_provider'])
+        self.assertIs(servers_client, self.manager.servers_client)
+        self.assertEqual(1, self.servers_client_init.call_count)
+
+    def test_client_attribute_set(self):
+        fake_client = mock.Mock()
+        self.manager.servers_client = fake_client
+        self.assertIs(fake_client, self.manager.servers_client)
+        self.servers_client_init.assert_not_called()
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, self.manager,
+                          'fake_client')
+        self.assertFalse(hasattr(self.manager, 'fake_client'))
@@ -0,0 +1,179 @@
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import textwrap
+
+from oslotest import mockpatch
+
+from tempest.test_discover import index
+from tempest.tests import base
+
+BASE_MODULE = '''
+import testtools
+
+from tempest.lib import decorators
+
+
+class BaseTest(testtools.TestCase):
+
+    @decorators.idempotent_id('8a9f2e1c-5b3d-4c6e-9f7a-1b2c3d4e5f60')
+    def test_inherited(self):
+        pass
+
+
+class Mixin(object):
+
+    def test_mixin(self):
+        pass
+'''
+
+TEST_MODULE = '''
+from fake_tests import base
+from tempest.lib import decorators
+from tempest import test
+
+
+class FakeTest(base.BaseTest):
+
+    @decorators.attr(type=['negative', 'smoke'])
+    @test.services('compute')
+    def test_one(self):
+        pass
+
+    def helper(self):
+        pass
+
+
+class FakeMixinTest(base.Mixin, base.BaseTest):
+
+    @decorators.attr(type='slow')
+    def test_inherited(self):
+        pass
+
+
+class NotATest(base.Mixin):
+    pass
+'''
+
+
+class TestScanModule(base.TestCase):
+
+    def test_scan_module(self):
+        scan = index.scan_module(TEST_MODULE, 'fake_tests.test_fake')
+        self.assertEqual(['fake_tests.base.BaseTest'],
+                         scan['classes']['FakeTest']['bases'])
+        self.assertEqual({'test_one': ['compute', 'negative', 'smoke']},
+                         scan['classes']['FakeTest']['tests'])
+        self.assertEqual('fake_tests.base', scan['aliases']['base'])
+
+    def test_scan_module_relative_import(self):
+        scan = index.scan_module('from . import base\n',
+                                 'fake_tests.api.test_fake')
+        self.assertEqual('fake_tests.api.base', scan['aliases']['base'])
+
+    def test_scan_module_load_tests(self):
+        self.assertRaises(index.DynamicModule, index.scan_module,
+                          'def load_tests(loader, tests, pattern):\n'
+                          '    pass\n', 'fake_tests.test_fake')
+
+    def test_scan_module_scenarios(self):
+        self.assertRaises(index.DynamicModule, index.scan_module,
+                          'class FakeTest(object):\n'
+                          '    scenarios = []\n', 'fake_tests.test_fake')
+
+    def test_scan_module_dynamic_attr(self):
+        self.assertRaises(index.DynamicModule, index.scan_module,
+                          'class FakeTest(object):\n'
+                          '    @decorators.attr(type=TYPE)\n'
+                          '    def test_one(self):\n'
+                          '        pass\n', 'fake_tests.test_fake')
+
+    def test_get_test_ids(self):
+        modules = {
+            'fake_tests.base': index.scan_module(BASE_MODULE,
+                                                 'fake_tests.base'),
+            'fake_tests.test_fake': index.scan_module(
+                TEST_MODULE, 'fake_tests.test_fake')}
+        test_ids = index.get_test_ids(modules, ['fake_tests.test_fake'])
+        self.assertEqual([
+            'fake_tests.test_fake.FakeMixinTest.test_inherited[slow]',
+            'fake_tests.test_fake.FakeMixinTest.test_mixin',
+            'fake_tests.test_fake.FakeTest.test_inherited'
+            '[id-8a9f2e1c-5b3d-4c6e-9f7a-1b2c3d4e5f60]',
+            'fake_tests.test_fake.FakeTest.test_one'
+            '[compute,negative,smoke]'], test_ids)
+
+    def test_get_test_ids_unknown_base(self):
+        modules = {'fake_tests.test_fake': index.scan_module(
+            TEST_MODULE, 'fake_tests.test_fake')}
+        self.assertRaises(index.DynamicModule, index.get_test_ids,
+                          modules, ['fake_tests.test_fake'])
+
+
+class TestDiscoveryIndex(base.TestCase):
+
+    def setUp(self):
+        super(TestDiscoveryIndex, self).setUp()
+        self.top_level = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.top_level)
+        self.test_dir = os.path.join(self.top_level, 'fake_tests')
+        os.mkdir(self.test_dir)
+        self._write('__init__.py', '')
+        self._write('base.py', BASE_MODULE)
+        self._write('test_fake.py', TEST_MODULE)
+        self.index_file = os.path.join(self.top_level, 'index')
+        self.test_dirs = [(self.test_dir, self.top_level)]
+
+    def _write(self, filename, source):
+        path = os.path.join(self.test_dir, filename)
+        with open(path, 'w') as f:
+            f.write(textwrap.dedent(source))
+        # Make sure the change is seen even within the mtime resolution
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    def test_list_tests(self):
+        test_ids = index.DiscoveryIndex(self.index_file).list_tests(
+            self.test_dirs)
+        self.assertEqual(4, len(test_ids))
+        self.assertTrue(os.path.isfile(self.index_file))
+
+    def test_list_tests_cached(self):
+        index.DiscoveryIndex(self.index_file).list_tests(self.test_dirs)
+        scan_mock = self.useFixture(mockpatch.PatchObject(
+            index, 'scan_module', wraps=index.scan_module)).mock
+        self._write('test_fake.py', TEST_MODULE.replace('test_one',
+                                                        'test_two'))
+        test_ids = index.DiscoveryIndex(self.index_file).list_tests(
+            self.test_dirs)
+        # Only the modified module is parsed again
+        self.assertEqual(1, scan_mock.call_count)
+        self.assertIn('fake_tests.test_fake.FakeTest.test_two'
+                      '[compute,negative,smoke]', test_ids)
+
+    def test_list_tests_removed_module(self):
+        index.DiscoveryIndex(self.index_file).list_tests(self.test_dirs)
+        os.remove(os.path.join(self.test_dir, 'test_fake.py'))
+        discovery_index = index.DiscoveryIndex(self.index_file)
+        self.assertEqual([], discovery_index.list_tests(self.test_dirs))
+        self.assertEqual(2, len(discovery_index._load()))
+
+    def test_list_tests_dynamic_module(self):
+        self._write('test_dynamic.py', 'load_tests = None\n')
+        self.assertIsNone(index.DiscoveryIndex(self.index_file).list_tests(
+            self.test_dirs))
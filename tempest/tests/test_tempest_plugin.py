@@ -13,6 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import shutil
+import tempfile
+
+import fixtures
+import mock
+from stevedore import extension
+
 from tempest.lib.services import clients
 from tempest.test_discover import plugins
 from tempest.tests import base
@@ -77,3 +86,81 @@ class TestPluginDiscovery(base.TestCase):
         manager._register_service_clients()
         registered_clients = registry.get_service_clients()
         self.assertNotIn(fake_obj.name, registered_clients)
+
+
+class TestPluginCache(base.TestCase):
+
+    target = 'tempest.tests.fake_tempest_plugin:FakePlugin'
+
+    def setUp(self):
+        super(TestPluginCache, self).setUp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.cache_file = os.path.join(cache_dir, 'plugins.json')
+        self.useFixture(fixtures.EnvironmentVariable(
+            plugins.PLUGIN_CACHE_ENV, self.cache_file))
+        entry_point = plugins._CachedEntryPoint('fake01', self.target)
+        fake_plugins = plugins.stevedore.ExtensionManager.make_test_instance(
+            [extension.Extension('fake01', entry_point, fake_plugin.FakePlugin,
+                                 fake_plugin.FakePlugin())])
+        self.ext_manager = self.patchobject(
+            plugins.stevedore, 'ExtensionManager')
+        self.ext_manager.return_value = fake_plugins
+        self.ext_manager.make_test_instance.side_effect = (
+            extension.ExtensionManager.make_test_instance)
+
+    def _write_cache(self, entry_points, fingerprint=None):
+        if fingerprint is None:
+            fingerprint = plugins._get_install_fingerprint()
+        with open(self.cache_file, 'w') as f:
+            json.dump({'fingerprint': fingerprint,
+                       'entry_points': entry_points}, f)
+
+    def test_load_plugins_writes_cache(self):
+        ext_plugins = plugins.load_plugins()
+        self.assertEqual(['fake01'], ext_plugins.names())
+        with open(self.cache_file) as f:
+            cache = json.load(f)
+        self.assertEqual([['fake01', self.target]], cache['entry_points'])
+        self.assertEqual(plugins._get_install_fingerprint(),
+                         cache['fingerprint'])
+
+    def test_load_plugins_from_cache(self):
+        self._write_cache([['fake02', self.target]])
+        ext_plugins = plugins.load_plugins()
+        self.ext_manager.assert_not_called()
+        self.assertEqual(['fake02'], ext_plugins.names())
+        self.assertEqual(self.target,
+                         ext_plugins['fake02'].entry_point_target)
+        self.assertIsInstance(ext_plugins['fake02'].obj,
+                              fake_plugin.FakePlugin)
+
+    def test_load_plugins_stale_cache(self):
+        self._write_cache([['fake02', self.target]],
+                          fingerprint=[['/fake/site-packages', 0]])
+        ext_plugins = plugins.load_plugins()
+        self.ext_manager.assert_called_once_with(
+            plugins.PLUGIN_NAMESPACE, invoke_on_load=True,
+            propagate_map_exceptions=True, on_load_failure_callback=None)
+        self.assertEqual(['fake01'], ext_plugins.names())
+
+    def test_load_plugins_cache_plugin_removed(self):
+        self._write_cache([['fake02', 'fake_plugin_module:FakePlugin']])
+        ext_plugins = plugins.load_plugins()
+        self.assertEqual(1, self.ext_manager.call_count)
+        self.assertEqual(['fake01'], ext_plugins.names())
+
+    def test_load_plugins_without_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable(
+            plugins.PLUGIN_CACHE_ENV))
+        with mock.patch.object(plugins, '_write_plugin_cache') as write_mock:
+            plugins.load_plugins()
+        write_mock.assert_not_called()
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_load_plugins_cache_write_failure(self):
+        with mock.patch.object(plugins.os, 'rename', side_effect=OSError):
+            ext_plugins = plugins.load_plugins()
+        self.assertEqual(['fake01'], ext_plugins.names())
+        # The temporary file of the cache is removed
+        self.assertEqual([], os.listdir(os.path.dirname(self.cache_file)))
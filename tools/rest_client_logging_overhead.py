@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+# Copyright 2017 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Measure the per-request overhead of the RestClient request logging.
+
+Requests are sent through a RestClient backed by a fake HTTP object, from a
+call stack of configurable depth, to approximate a test running under
+testtools. The run is done twice: once with the caller name found by walking
+the stack (what happens when no test caller was recorded) and once with the
+caller recorded via test_utils.set_test_caller, as done by the Tempest base
+test class.
+"""
+
+import argparse
+import timeit
+
+from tempest.lib.common import http
+from tempest.lib.common import rest_client
+from tempest.lib.common.utils import test_utils
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
+
+
+def _nested(depth, func):
+    if depth <= 0:
+        return func()
+    return _nested(depth - 1, func)
+
+
+def _measure(client, requests, depth, repeat):
+    def run():
+        for _ in range(requests):
+            client.get('fake_url')
+    best = min(timeit.repeat(lambda: _nested(depth, run), number=1,
+                             repeat=repeat))
+    return best / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Number of requests per measurement')
+    parser.add_argument('--depth', type=int, default=40,
+                        help='Depth of the call stack the requests are '
+                             'sent from')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of measurements, the best is reported')
+    args = parser.parse_args()
+
+    http.ClosingHttp.request = fake_http.fake_httplib2().request
+    client = rest_client.RestClient(fake_auth_provider.FakeAuthProvider(),
+                                    None, None)
+    client._error_checker = lambda resp, body: None
+
+    test_utils.set_test_caller(None)
+    stack_walk = _measure(client, args.requests, args.depth, args.repeat)
+    test_utils.set_test_caller('FakeTest:test_fake')
+    recorded = _measure(client, args.requests, args.depth, args.repeat)
+    test_utils.set_test_caller(None)
+
+    print("Stack depth: %d" % args.depth)
+    print("Stack walk:      %8.2f us/request" % stack_walk)
+    print("Recorded caller: %8.2f us/request" % recorded)
+    print("Saved:           %8.2f us/request" % (stack_walk - recorded))
+
+
+if __name__ == '__main__':
+    main()